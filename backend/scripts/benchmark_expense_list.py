@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Compare ORM objects and plain rows for GET /expenses pages.
+
+Usage (from backend/):
+    python scripts/benchmark_expense_list.py --user-id 1 [--per-page 100] [--rounds 50]
+"""
+
+import os
+import sys
+import time
+
+import click
+
+# Make the src package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.app import create_app  # noqa: E402
+from src.config.database import db  # noqa: E402
+from src.services.expense_service import ExpenseService  # noqa: E402
+
+
+@click.command()
+@click.option('--user-id', type=int, required=True, help='User whose expenses are listed.')
+@click.option('--per-page', type=int, default=100, help='Expenses per page.')
+@click.option('--rounds', type=int, default=50, help='Pages built per mode.')
+def main(user_id, per_page, rounds):
+    """Compare ORM objects and plain rows for GET /expenses pages."""
+    app = create_app()
+    
+    with app.app_context():
+        pages = {}
+        for label, as_rows in (('orm', False), ('rows', True)):
+            started = time.perf_counter()
+            for _ in range(rounds):
+                pages[label] = ExpenseService.get_user_expenses(
+                    user_id, page=1, per_page=per_page, with_total=False, as_rows=as_rows
+                )
+                db.session.remove()
+            milliseconds = (time.perf_counter() - started) * 1000 / rounds
+            click.echo(f"{label}: {milliseconds:.3f} ms per page")
+        
+        if pages['orm'] != pages['rows']:
+            click.echo("Responses differ between modes")
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Compare the JSON providers on a page of expenses.
+
+Usage (from backend/):
+    python scripts/benchmark_json.py [--items 100] [--rounds 200]
+"""
+
+from datetime import datetime, timedelta
+import os
+import sys
+import time
+
+import click
+
+# Make the src package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.app import create_app  # noqa: E402
+from src.utils.json_provider import (  # noqa: E402
+    JSON_PROVIDERS,
+    OrjsonJSONProvider,
+    get_json_provider_class,
+    orjson
+)
+
+
+def benchmark_json_providers(app, items=100, rounds=200):
+    """
+    Time each available provider on a page of expenses.
+    
+    The payload has the shape of a GET /expenses response with ``items``
+    expenses as built by ``Expense.to_dict``.
+    
+    Args:
+        app: Flask application
+        items: Expenses on the page
+        rounds: Responses encoded per provider
+    
+    Returns:
+        dict: {provider name: milliseconds per response}
+    """
+    created_at = datetime(2024, 1, 1, 12, 30)
+    category = {
+        'id': 1,
+        'name': 'Food & Dining',
+        'description': 'Restaurants, groceries and coffee',
+        'color': '#FF6B6B',
+        'icon': '🍽️',
+        'is_active': True,
+        'created_at': created_at.isoformat(),
+        'updated_at': created_at.isoformat(),
+        'user_id': 1
+    }
+    page = {
+        'items': [
+            {
+                'id': index,
+                'amount': 12.5 + index,
+                'formatted_amount': f'${12.5 + index:.2f}',
+                'description': f'Expense {index} — lunch with the team',
+                'date': (created_at.date() - timedelta(days=index)).isoformat(),
+                'notes': 'Paid by card' if index % 2 else None,
+                'receipt_url': None,
+                'tags': ['work', 'food'] if index % 3 else [],
+                'is_recurring': index % 5 == 0,
+                'created_at': created_at.isoformat(),
+                'updated_at': created_at.isoformat(),
+                'category': category,
+                'user_id': 1
+            }
+            for index in range(items)
+        ],
+        'pagination': {
+            'current_page': 1,
+            'total_pages': 10,
+            'total_items': items * 10,
+            'per_page': items,
+            'has_next': True,
+            'has_prev': False,
+            'next_page': 2,
+            'prev_page': None
+        }
+    }
+    
+    results = {}
+    with app.app_context():
+        for name, provider_class in JSON_PROVIDERS.items():
+            if provider_class is OrjsonJSONProvider and orjson is None:
+                continue
+            
+            provider = provider_class(app)
+            provider.compact = True
+            
+            started = time.perf_counter()
+            for _ in range(rounds):
+                provider.response(page)
+            results[name] = (time.perf_counter() - started) * 1000 / rounds
+    
+    return results
+
+
+@click.command()
+@click.option('--items', type=int, default=100, help='Expenses per encoded page.')
+@click.option('--rounds', type=int, default=200, help='Responses encoded per provider.')
+def main(items, rounds):
+    """Compare JSON providers on a page of expenses."""
+    app = create_app()
+    
+    results = benchmark_json_providers(app, items, rounds)
+    for name, milliseconds in sorted(results.items(), key=lambda item: item[1]):
+        click.echo(f"{name}: {milliseconds:.3f} ms per response")
+    
+    click.echo(f"Configured provider: {get_json_provider_class(app.config.get('JSON_PROVIDER')).__name__}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Measure login throughput and expense read latency under a login storm.
+
+Usage (from backend/):
+    python scripts/benchmark_login.py --email demo@example.com --password password123 --user-id 1 \
+        [--logins 200] [--concurrency 16]
+"""
+
+from threading import Lock, Thread
+import os
+import sys
+import time
+
+import click
+from flask_jwt_extended import create_access_token
+
+# Make the src package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.app import create_app  # noqa: E402
+from src.utils.password_hashing import password_hasher  # noqa: E402
+
+
+def benchmark_login_storm(app, email, password, user_id, logins=200, concurrency=16, read_path='/api/v1/expenses'):
+    """
+    Measure login throughput and expense read latency during a login storm.
+    
+    ``concurrency`` threads log in ``logins`` times in total while one
+    thread keeps reading ``read_path`` as ``user_id``.
+    
+    Args:
+        app: Flask application
+        email: Email of an existing user
+        password: That user's password
+        user_id: User whose expenses are read
+        logins: Total login requests
+        concurrency: Threads sending logins
+        read_path: Endpoint read during the storm
+    
+    Returns:
+        dict: Login rate and status counts, read latency percentiles (ms)
+    """
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(user_id))}'}
+    
+    statuses = {}
+    read_latencies = []
+    remaining = [logins]
+    lock = Lock()
+    storm_over = [False]
+    
+    def log_in():
+        client = app.test_client()
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            
+            status = client.post('/api/v1/auth/login', json={'email': email, 'password': password}).status_code
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+    
+    def read():
+        client = app.test_client()
+        while not storm_over[0]:
+            started = time.perf_counter()
+            client.get(read_path, headers=headers)
+            read_latencies.append((time.perf_counter() - started) * 1000)
+    
+    reader = Thread(target=read)
+    threads = [Thread(target=log_in) for _ in range(concurrency)]
+    
+    started = time.perf_counter()
+    reader.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    storm_over[0] = True
+    reader.join()
+    
+    read_latencies.sort()
+    
+    def percentile(fraction):
+        if not read_latencies:
+            return None
+        return read_latencies[min(int(len(read_latencies) * fraction), len(read_latencies) - 1)]
+    
+    return {
+        'logins_per_second': logins / elapsed,
+        'login_statuses': statuses,
+        'reads': len(read_latencies),
+        'read_p50_ms': percentile(0.5),
+        'read_p95_ms': percentile(0.95),
+        'read_max_ms': read_latencies[-1] if read_latencies else None
+    }
+
+
+@click.command()
+@click.option('--email', required=True, help='Email of an existing user.')
+@click.option('--password', required=True, help="That user's password.")
+@click.option('--user-id', type=int, required=True, help='User whose expenses are read during the storm.')
+@click.option('--logins', type=int, default=200, help='Total login requests.')
+@click.option('--concurrency', type=int, default=16, help='Threads sending logins.')
+def main(email, password, user_id, logins, concurrency):
+    """Measure login throughput and expense read latency under a login storm."""
+    app = create_app()
+    
+    result = benchmark_login_storm(app, email, password, user_id, logins=logins, concurrency=concurrency)
+    
+    click.echo(f"Hashing workers: {password_hasher.workers or 'inline'}, max pending {password_hasher.max_pending}")
+    click.echo(f"Logins: {result['logins_per_second']:.1f}/s, statuses {result['login_statuses']}")
+    if result['reads']:
+        click.echo(
+            f"Expense reads: {result['reads']}, p50 {result['read_p50_ms']:.1f} ms, "
+            f"p95 {result['read_p95_ms']:.1f} ms, max {result['read_max_ms']:.1f} ms"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
 from src.services.auth_service import AuthService
 from src.utils.decorators import validate_json, log_api_calls, handle_db_errors
+from src.utils.password_hashing import PasswordHashingBusy
 from src.utils.validators import user_registration_schema, user_login_schema
 import logging
 
@@ -30,6 +31,7 @@ def register(validated_data):
         201: User created successfully
         400: Validation error
         409: User already exists
+        503: Too many concurrent password hashes, retry later
     """
     try:
         result = AuthService.register_user(
@@ -49,6 +51,9 @@ def register(validated_data):
         
     except ValueError as e:
         return jsonify({'error': str(e)}), 409
+    
+    except PasswordHashingBusy:
+        return jsonify({'error': 'Server busy, please retry'}), 503, {'Retry-After': '1'}
 
 
 @auth_bp.route('/login', methods=['POST'])
@@ -66,6 +71,7 @@ def login(validated_data):
     Returns:
         200: Login successful
         401: Invalid credentials
+        503: Too many concurrent password checks, retry later
     """
     try:
         result = AuthService.login_user(
@@ -82,6 +88,9 @@ def login(validated_data):
         
     except ValueError as e:
         return jsonify({'error': str(e)}), 401
+    
+    except PasswordHashingBusy:
+        return jsonify({'error': 'Server busy, please retry'}), 503, {'Retry-After': '1'}
 
 
 @auth_bp.route('/refresh', methods=['POST'])
@@ -128,13 +137,13 @@ def get_current_user():
     """
     try:
         current_user_id = get_jwt_identity()
-        user = AuthService.get_user_by_id(current_user_id)
+        user = AuthService.get_user_dict(current_user_id)
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
         return jsonify({
-            'user': user.to_dict()
+            'user': user
         }), 200
         
     except Exception as e:
@@ -1,6 +1,13 @@
 from flask import Blueprint, request, jsonify
 from src.services.category_service import CategoryService
-from src.utils.decorators import validate_json, auth_required, log_api_calls, handle_db_errors
+from src.utils.decorators import (
+    validate_json,
+    auth_required,
+    log_api_calls,
+    handle_db_errors,
+    conditional_get
+)
+from src.utils.helpers import parse_fields
 from src.utils.validators import category_schema
 import logging
 
@@ -44,7 +51,7 @@ def create_category(current_user_id, validated_data):
         
         return jsonify({
             'message': 'Category created successfully',
-            'category': category.to_dict(include_stats=True)
+            'category': category.to_dict(include_stats=True, stats=(0, 0))
         }), 201
         
     except ValueError as e:
@@ -54,6 +61,7 @@ def create_category(current_user_id, validated_data):
 @categories_bp.route('', methods=['GET'])
 @auth_required
 @log_api_calls
+@conditional_get
 def get_categories(current_user_id):
     """
     Get all categories for current user.
@@ -63,15 +71,25 @@ def get_categories(current_user_id):
         
     Query Parameters:
         include_stats: Include expense statistics (default: false)
+        fields: Comma-separated category fields to return (default: all);
+                requesting expense_count or total_amount implies include_stats
         
     Returns:
         200: List of categories
+        304: Not modified since the ETag in If-None-Match
+        400: Unknown fields
     """
     include_stats = request.args.get('include_stats', 'false').lower() == 'true'
     
+    try:
+        fields = parse_fields(request.args.get('fields'), CategoryService.FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     categories = CategoryService.get_user_categories(
         user_id=current_user_id,
-        include_stats=include_stats
+        include_stats=include_stats,
+        fields=fields
     )
     
     return jsonify({
@@ -83,6 +101,7 @@ def get_categories(current_user_id):
 @categories_bp.route('/<int:category_id>', methods=['GET'])
 @auth_required
 @log_api_calls
+@conditional_get
 def get_category(current_user_id, category_id):
     """
     Get category by ID.
@@ -93,17 +112,27 @@ def get_category(current_user_id, category_id):
     Parameters:
         category_id: Category ID
         
+    Query Parameters:
+        fields: Comma-separated category fields to return (default: all)
+        
     Returns:
         200: Category details
+        304: Not modified since the ETag in If-None-Match
+        400: Unknown fields
         404: Category not found
     """
-    category = CategoryService.get_category_by_id(category_id, current_user_id)
+    try:
+        fields = parse_fields(request.args.get('fields'), CategoryService.FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    category = CategoryService.get_category_dict(category_id, current_user_id, fields=fields)
     
     if not category:
         return jsonify({'error': 'Category not found'}), 404
     
     return jsonify({
-        'category': category.to_dict(include_stats=True)
+        'category': category
     }), 200
 
 
@@ -1,13 +1,27 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+from marshmallow import ValidationError
+from marshmallow.fields import Boolean
 from src.services.expense_service import ExpenseService
+from src.services.import_service import ImportService
 from src.utils.decorators import (
     validate_json, 
     validate_query_params, 
     auth_required, 
     log_api_calls, 
-    handle_db_errors
+    handle_db_errors,
+    conditional_get
 )
-from src.utils.validators import expense_schema, expense_query_schema
+from src.utils.helpers import parse_fields
+from src.utils.validators import (
+    expense_schema,
+    expense_query_schema,
+    expense_export_schema,
+    expense_summary_schema,
+    expense_selection_schema,
+    expense_bulk_update_schema
+)
+import csv
+import io
 import logging
 
 logger = logging.getLogger(__name__)
@@ -79,9 +93,213 @@ def create_expense(current_user_id, validated_data=None):
         return jsonify({'error': str(e)}), 404
 
 
+@expenses_bp.route('/batch', methods=['POST'])
+@auth_required
+@log_api_calls
+@handle_db_errors
+def create_expenses_batch(current_user_id):
+    """
+    Create many expenses in one request.
+    
+    Headers:
+        Authorization: Bearer <access_token>
+        
+    Body:
+        expenses: List of expense objects (same fields as POST /expenses),
+                  at most EXPENSE_BATCH_MAX_ITEMS
+        
+    Returns:
+        201: All expenses created
+        207: Some expenses created, see per-item results
+        400: Invalid body or no expense could be created
+    """
+    if not request.is_json:
+        return jsonify({'error': 'Content-Type must be application/json'}), 400
+    
+    data = request.get_json(silent=True) or {}
+    items = data.get('expenses')
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'expenses must be a non-empty list'}), 400
+    
+    max_items = current_app.config.get('EXPENSE_BATCH_MAX_ITEMS', 500)
+    if len(items) > max_items:
+        return jsonify({'error': f'At most {max_items} expenses can be created per batch'}), 400
+    
+    # Validate every item, collecting errors by index
+    results = {}
+    valid = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = {'_schema': ['Item must be an object']}
+            continue
+        try:
+            valid.append((index, expense_schema.load(item)))
+        except ValidationError as err:
+            results[index] = err.messages
+    
+    if valid:
+        results.update(ExpenseService.create_expenses(current_user_id, valid))
+    
+    response = []
+    created = 0
+    for index in range(len(items)):
+        result = results[index]
+        if isinstance(result, (dict, str)):
+            response.append({'index': index, 'status': 'failed', 'errors': result})
+        else:
+            created += 1
+            response.append({'index': index, 'status': 'created', 'expense': result.to_dict()})
+    
+    failed = len(items) - created
+    if not created:
+        status = 400
+    elif failed:
+        status = 207
+    else:
+        status = 201
+    
+    return jsonify({
+        'message': f'{created} of {len(items)} expenses created',
+        'created': created,
+        'failed': failed,
+        'results': response
+    }), status
+
+
+@expenses_bp.route('/batch', methods=['PATCH'])
+@auth_required
+@log_api_calls
+@handle_db_errors
+@validate_json(expense_bulk_update_schema)
+def update_expenses_batch(current_user_id, validated_data):
+    """
+    Update many expenses in one statement.
+    
+    Headers:
+        Authorization: Bearer <access_token>
+        
+    Body:
+        ids: List of expense IDs, or
+        filters: Filter set (category_id, start_date, end_date, search,
+                 search_mode, tags, tags_match)
+        changes: Fields to set (amount, description, date, category_id,
+                 notes, receipt_url, is_recurring)
+        
+    Returns:
+        200: Number of expenses updated
+        400: Validation error
+        404: Category not found
+    """
+    try:
+        updated = ExpenseService.bulk_update_expenses(
+            user_id=current_user_id,
+            changes=validated_data['changes'],
+            ids=validated_data.get('ids'),
+            filters=validated_data.get('filters')
+        )
+        
+        return jsonify({
+            'message': f'{updated} expenses updated',
+            'updated': updated
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+
+
+@expenses_bp.route('/batch', methods=['DELETE'])
+@auth_required
+@log_api_calls
+@handle_db_errors
+@validate_json(expense_selection_schema)
+def delete_expenses_batch(current_user_id, validated_data):
+    """
+    Delete many expenses in one statement.
+    
+    Headers:
+        Authorization: Bearer <access_token>
+        
+    Body:
+        ids: List of expense IDs, or
+        filters: Filter set (category_id, start_date, end_date, search,
+                 search_mode, tags, tags_match)
+        
+    Returns:
+        200: Number of expenses deleted
+        400: Validation error
+    """
+    deleted = ExpenseService.bulk_delete_expenses(
+        user_id=current_user_id,
+        ids=validated_data.get('ids'),
+        filters=validated_data.get('filters')
+    )
+    
+    return jsonify({
+        'message': f'{deleted} expenses deleted',
+        'deleted': deleted
+    }), 200
+
+
+@expenses_bp.route('/import', methods=['POST'])
+@auth_required
+@log_api_calls
+@handle_db_errors
+def import_expenses(current_user_id):
+    """
+    Import expenses from a CSV file.
+    
+    Headers:
+        Authorization: Bearer <access_token>
+        
+    Body:
+        multipart/form-data with a "file" field, or a raw text/csv body.
+        Columns: date, description, amount, category (name) or category_id,
+        and optionally notes, receipt_url, tags (comma-separated), is_recurring
+        
+    Returns:
+        201: All rows imported
+        207: Some rows rejected, see errors
+        400: Missing file or columns, or no row could be imported
+        500: A batch could not be written; "imported" counts the rows
+             committed before it and "failed" gives the first line that
+             was not imported
+    """
+    if 'file' in request.files:
+        stream = request.files['file'].stream
+    elif request.mimetype == 'text/csv':
+        stream = request.stream
+    else:
+        return jsonify({'error': 'Upload a CSV file in the "file" field or send a text/csv body'}), 400
+    
+    try:
+        report = ImportService.import_csv(
+            user_id=current_user_id,
+            stream=stream,
+            batch_size=current_app.config.get('IMPORT_BATCH_SIZE', 2000),
+            max_errors=current_app.config.get('IMPORT_MAX_REPORTED_ERRORS', 1000)
+        )
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if report.get('failed'):
+        status = 500
+    elif not report['imported']:
+        status = 400
+    elif report['rejected']:
+        status = 207
+    else:
+        status = 201
+    
+    return jsonify({
+        'message': f"{report['imported']} expenses imported, {report['rejected']} rejected",
+        **report
+    }), status
+
+
 @expenses_bp.route('', methods=['GET'])
 @auth_required
 @log_api_calls
+@conditional_get
 @validate_query_params(expense_query_schema)
 def get_expenses(current_user_id, query_params):
     """
@@ -96,23 +314,61 @@ def get_expenses(current_user_id, query_params):
         category_id: Filter by category ID
         start_date: Filter by start date (YYYY-MM-DD)
         end_date: Filter by end date (YYYY-MM-DD)
-        search: Search in description, notes, and category name
-        sort_by: Sort field (date, amount, description, created_at)
+        search: Search in description and notes
+        search_mode: Search mode (fulltext, substring; default: SEARCH_BACKEND)
+        sort_by: Sort field (date, amount, description, created_at, relevance)
         sort_order: Sort order (asc, desc)
+        with_total: Include total_items/total_pages (default: true)
+        pagination: Pagination mode (page, cursor; default: page)
+        cursor: Opaque cursor from a previous page's next_cursor (cursor mode)
+        fields: Comma-separated expense fields to return (default: all;
+                category_id is available on request)
+        compact: Give items a category_id and return each category once
+                 in a top-level categories map (default: false)
         
     Returns:
         200: Paginated list of expenses
+        304: Not modified since the ETag in If-None-Match
+        400: Invalid cursor or fields, or relevance sort in cursor mode
     """
     # Extract pagination parameters
     page = query_params.pop('page', 1)
     per_page = query_params.pop('per_page', 20)
+    with_total = query_params.pop('with_total', True)
+    pagination = query_params.pop('pagination', 'page')
+    cursor = query_params.pop('cursor', None)
+    compact = query_params.pop('compact', False)
+    
+    try:
+        fields = parse_fields(query_params.pop('sparse_fields', None), ExpenseService.FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Cursor mode: keyset pagination without OFFSET or COUNT
+    if pagination == 'cursor' or cursor:
+        try:
+            result = ExpenseService.get_user_expenses_by_cursor(
+                user_id=current_user_id,
+                filters=query_params,
+                cursor=cursor,
+                per_page=per_page,
+                fields=fields,
+                compact=compact
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify(result), 200
     
     # Get expenses with filters
     result = ExpenseService.get_user_expenses(
         user_id=current_user_id,
         filters=query_params,
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        with_total=with_total,
+        fields=fields,
+        compact=compact
     )
     
     return jsonify(result), 200
@@ -121,6 +377,7 @@ def get_expenses(current_user_id, query_params):
 @expenses_bp.route('/<int:expense_id>', methods=['GET'])
 @auth_required
 @log_api_calls
+@conditional_get
 def get_expense(current_user_id, expense_id):
     """
     Get expense by ID.
@@ -131,17 +388,27 @@ def get_expense(current_user_id, expense_id):
     Parameters:
         expense_id: Expense ID
         
+    Query Parameters:
+        fields: Comma-separated expense fields to return (default: all)
+        
     Returns:
         200: Expense details
+        304: Not modified since the ETag in If-None-Match
+        400: Unknown fields
         404: Expense not found
     """
-    expense = ExpenseService.get_expense_by_id(expense_id, current_user_id)
+    try:
+        fields = parse_fields(request.args.get('fields'), ExpenseService.FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    expense = ExpenseService.get_expense_dict(expense_id, current_user_id, fields=fields)
     
     if not expense:
         return jsonify({'error': 'Expense not found'}), 404
     
     return jsonify({
-        'expense': expense.to_dict()
+        'expense': expense
     }), 200
 
 
@@ -222,7 +489,8 @@ def delete_expense(current_user_id, expense_id):
 @expenses_bp.route('/summary', methods=['GET'])
 @auth_required
 @log_api_calls
-@validate_query_params(expense_query_schema)
+@conditional_get
+@validate_query_params(expense_summary_schema)
 def get_expense_summary(current_user_id, query_params):
     """
     Get expense summary statistics.
@@ -234,20 +502,31 @@ def get_expense_summary(current_user_id, query_params):
         category_id: Filter by category ID
         start_date: Filter by start date (YYYY-MM-DD)
         end_date: Filter by end date (YYYY-MM-DD)
-        search: Search in description, notes, and category name
+        search: Search in description and notes
+        search_mode: Search mode (fulltext, substring; default: SEARCH_BACKEND)
+        tags, tags_match: Same as GET /expenses
+        include_tags: Add per-tag counts and totals (default: false)
         
     Returns:
         200: Expense summary statistics
+        304: Not modified since the ETag in If-None-Match
     """
     # Remove pagination parameters for summary
     query_params.pop('page', None)
     query_params.pop('per_page', None)
     query_params.pop('sort_by', None)
     query_params.pop('sort_order', None)
+    query_params.pop('with_total', None)
+    query_params.pop('pagination', None)
+    query_params.pop('cursor', None)
+    query_params.pop('sparse_fields', None)
+    query_params.pop('compact', None)
+    include_tags = query_params.pop('include_tags', False)
     
     summary = ExpenseService.get_expense_summary(
         user_id=current_user_id,
-        filters=query_params if any(query_params.values()) else None
+        filters=query_params if any(query_params.values()) else None,
+        include_tags=include_tags
     )
     
     return jsonify({
@@ -255,9 +534,72 @@ def get_expense_summary(current_user_id, query_params):
     }), 200
 
 
+@expenses_bp.route('/export', methods=['GET'])
+@auth_required
+@log_api_calls
+@validate_query_params(expense_export_schema)
+def export_expenses(current_user_id, query_params):
+    """
+    Export expenses as a streamed CSV or NDJSON download.
+    
+    Headers:
+        Authorization: Bearer <access_token>
+        
+    Query Parameters:
+        format: Export format (csv, ndjson; default: csv)
+        category_id, start_date, end_date, search, search_mode, tags,
+        tags_match, sort_by, sort_order: Same as GET /expenses
+        
+    Returns:
+        200: Streamed file with one row per expense
+    """
+    export_format = query_params.pop('format', 'csv')
+    for param in ('page', 'per_page', 'with_total', 'pagination', 'cursor'):
+        query_params.pop(param, None)
+    
+    batches = ExpenseService.export_expenses(
+        user_id=current_user_id,
+        filters=query_params,
+        batch_size=current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+    )
+    
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=ExpenseService.EXPORT_FIELDS)
+        writer.writeheader()
+        
+        for batch in batches:
+            for row in batch:
+                row['tags'] = ', '.join(row['tags'])
+                writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        
+        yield buffer.getvalue()
+    
+    dumps = current_app.json.dumps
+    
+    def generate_ndjson():
+        for batch in batches:
+            yield ''.join(dumps(row, sort_keys=False) + '\n' for row in batch)
+    
+    if export_format == 'ndjson':
+        generator, mimetype = generate_ndjson(), 'application/x-ndjson'
+    else:
+        generator, mimetype = generate_csv(), 'text/csv'
+    
+    return Response(
+        stream_with_context(generator),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=expenses.{export_format}'}
+    )
+
+
 @expenses_bp.route('/categories/<int:category_id>', methods=['GET'])
 @auth_required
 @log_api_calls
+@conditional_get
 def get_category_expenses(current_user_id, category_id):
     """
     Get expenses for a specific category.
@@ -271,11 +613,29 @@ def get_category_expenses(current_user_id, category_id):
     Query Parameters:
         page: Page number (default: 1)
         per_page: Items per page (default: 20)
+        with_total: Include total_items/total_pages (default: true)
+        fields: Comma-separated expense fields to return (default: all)
+        compact: Give items a category_id and return the category once
+                 in a top-level categories map (default: false)
         
     Returns:
         200: Paginated list of expenses for category
+        304: Not modified since the ETag in If-None-Match
+        400: Unknown fields or invalid with_total/compact
         404: Category not found
     """
+    try:
+        fields = parse_fields(request.args.get('fields'), ExpenseService.FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Same truthy/falsy values as the list endpoint's query schema
+    try:
+        with_total = Boolean().deserialize(request.args.get('with_total', 'true'))
+        compact = Boolean().deserialize(request.args.get('compact', 'false'))
+    except ValidationError as e:
+        return jsonify({'error': 'Validation failed', 'messages': e.messages}), 400
+    
     try:
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 20))
@@ -284,7 +644,10 @@ def get_category_expenses(current_user_id, category_id):
             user_id=current_user_id,
             category_id=category_id,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            with_total=with_total,
+            fields=fields,
+            compact=compact
         )
         
         return jsonify(result), 200
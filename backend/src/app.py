@@ -1,9 +1,14 @@
-from flask import Flask, jsonify
+from flask import Flask, abort, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from src.config.settings import get_config
 from src.config.database import init_db
 from src.config.logging import setup_logging
+from src.utils.cache import init_caches, get_cache_stats
+from src.utils.single_flight import init_single_flight, get_single_flight_stats
+from src.utils.json_provider import init_json
+from src.utils.compression import init_compression
+from src.utils.password_hashing import init_password_hashing
 from src.api import api_v1_blueprint
 import os
 import logging
@@ -35,21 +40,37 @@ def create_app(config_name=None):
     setup_logging(app)
     logger.info(f"Starting application in {config_name} mode")
     
+    # JSON encoding (orjson when installed)
+    init_json(app)
+    
     # Initialize extensions
     init_extensions(app)
     
     # Initialize database
     init_db(app)
     
+    # Configure in-process caches and request coalescing
+    init_caches(app)
+    init_single_flight(app)
+    
+    # Password hashing runs on a bounded process pool
+    init_password_hashing(app)
+    
     # Register blueprints
     register_blueprints(app)
     
+    # Response compression (gzip, brotli when installed)
+    init_compression(app)
+    
     # Register error handlers
     register_error_handlers(app)
     
     # Health check endpoint
     register_health_check(app)
     
+    # CLI commands
+    register_commands(app)
+    
     logger.info("Application initialized successfully")
     return app
 
@@ -190,3 +211,81 @@ def register_health_check(app):
     def api_health_check():
         """API health check endpoint."""
         return health_check()
+    
+    @app.route('/health/caches', methods=['GET'])
+    def cache_stats():
+        """In-process cache and request coalescing statistics for this worker."""
+        # Internal diagnostics: hidden unless CACHE_STATS_ENDPOINT is set
+        if not app.config.get('CACHE_STATS_ENDPOINT', False):
+            abort(404)
+        
+        return jsonify({
+            'caches': get_cache_stats(),
+            'single_flight': get_single_flight_stats()
+        }), 200
+
+
+def register_commands(app):
+    """Register maintenance CLI commands."""
+    import click
+    from flask.cli import AppGroup
+    
+    rollups_cli = AppGroup('rollups', help='Maintain monthly expense rollups.')
+    
+    @rollups_cli.command('rebuild')
+    @click.option('--user-id', type=int, default=None, help='Only rebuild this user.')
+    def rebuild_rollups(user_id):
+        """Recompute expense rollups from scratch."""
+        from src.services.rollup_service import RollupService
+        
+        drift = RollupService.verify(user_id)
+        count = RollupService.rebuild(user_id)
+        click.echo(f"Rebuilt {count} rollup rows ({len(drift)} drifted before rebuild)")
+    
+    @rollups_cli.command('verify')
+    @click.option('--user-id', type=int, default=None, help='Only verify this user.')
+    def verify_rollups(user_id):
+        """Report rollups that no longer match the expenses table."""
+        from src.services.rollup_service import RollupService
+        
+        drift = RollupService.verify(user_id)
+        for entry in drift:
+            click.echo(
+                f"user {entry['user_id']} category {entry['category_id']} {entry['month']}: "
+                f"stored={entry['stored']} expected={entry['expected']}"
+            )
+        
+        if drift:
+            click.echo(f"{len(drift)} rollup rows drifted")
+            raise SystemExit(1)
+        
+        click.echo("Rollups are consistent")
+    
+    app.cli.add_command(rollups_cli)
+    
+    search_cli = AppGroup('search', help='Maintain the expense full-text search index.')
+    
+    @search_cli.command('init')
+    def init_search():
+        """Create missing full-text search objects and re-index expenses."""
+        from src.utils.search import rebuild_search_index
+        
+        if rebuild_search_index():
+            click.echo("Full-text search index is ready")
+        else:
+            click.echo("Full-text search is not available; searches use substring matching")
+    
+    app.cli.add_command(search_cli)
+    
+    tags_cli = AppGroup('tags', help='Maintain expense tags.')
+    
+    @tags_cli.command('migrate')
+    @click.option('--batch-size', type=int, default=1000, help='Expenses per transaction.')
+    def migrate_tags(batch_size):
+        """Move comma-separated expense tags into the tags tables."""
+        from src.services.tag_service import TagService
+        
+        count = TagService.migrate_legacy_tags(batch_size)
+        click.echo(f"Migrated tags for {count} expenses")
+    
+    app.cli.add_command(tags_cli)
@@ -12,6 +12,6 @@ def init_db(app):
     migrate.init_app(app, db)
     
     # Import models to ensure they're registered
-    from src.models import user, category, expense
+    from src.models import user, category, expense, expense_rollup, tag, data_version
     
     return db
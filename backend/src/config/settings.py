@@ -31,6 +31,68 @@ class Config:
     DEFAULT_PAGE_SIZE = 20
     MAX_PAGE_SIZE = 100
     
+    # Bulk operations
+    EXPENSE_BATCH_MAX_ITEMS = 500
+    EXPORT_BATCH_SIZE = 1000  # Rows fetched per server-side cursor round trip
+    IMPORT_BATCH_SIZE = 2000  # Rows written per transaction
+    IMPORT_MAX_REPORTED_ERRORS = 1000
+    
+    # Search: 'substring' (ILIKE, matches inside words) or 'fulltext'
+    # (tsvector/FTS5 index, matches whole words and prefixes). Opt in to
+    # 'fulltext' after 'flask search init' on existing databases.
+    SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'substring')
+    
+    # JSON encoding: 'auto' (orjson when installed), 'orjson' or 'stdlib'
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'auto')
+    
+    # Response compression: gzip, or brotli when installed and accepted
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))  # bytes, buffered responses
+    COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL', 6))  # gzip, 1-9
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 4))  # 0-11
+    
+    # Caching
+    CACHE_ENABLED = os.environ.get('CACHE_ENABLED', 'true').lower() == 'true'
+    CACHE_EXPENSE_COUNTS_SIZE = 4096
+    CACHE_EXPENSE_COUNTS_TTL = 300  # seconds
+    CACHE_CATEGORIES_SIZE = 1024
+    CACHE_CATEGORIES_TTL = 600  # seconds
+    CACHE_SUMMARIES_ENABLED = os.environ.get('CACHE_SUMMARIES_ENABLED', 'true').lower() == 'true'
+    CACHE_SUMMARIES_SIZE = 1024
+    CACHE_SUMMARIES_TTL = 300  # seconds
+    CACHE_USERS_SIZE = 4096
+    CACHE_USERS_TTL = 300  # seconds
+    CACHE_USERS_NEGATIVE_TTL = 30  # seconds, for missing or inactive users
+    
+    # Cache backend: 'local' (per process) or 'sqlite' (shared entries and
+    # invalidation events between workers on one machine)
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'local')
+    # Default: cache.sqlite3 in the app's instance folder. The file holds
+    # pickles, so it and its directory must only be writable by the app.
+    CACHE_SQLITE_PATH = os.environ.get('CACHE_SQLITE_PATH')
+    CACHE_SYNC_INTERVAL = float(os.environ.get('CACHE_SYNC_INTERVAL', 0))  # seconds between polls
+    CACHE_EVENT_RETENTION = 3600  # seconds
+    # GET /health/caches exposes per-worker cache statistics; off unless enabled
+    CACHE_STATS_ENDPOINT = os.environ.get('CACHE_STATS_ENDPOINT', 'false').lower() == 'true'
+    
+    # Password hash cost; outdated hashes are upgraded on the next login.
+    # Method is 'pbkdf2:<hash>' (cost from iterations) or 'scrypt:<n>:<r>:<p>'
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256')
+    PASSWORD_HASH_ITERATIONS = int(os.environ.get('PASSWORD_HASH_ITERATIONS', 600000))
+    
+    # Password hashing pool (0 workers hashes inline in the request thread).
+    # Every web worker process starts its own pool, so by default the CPUs
+    # are split between the WEB_CONCURRENCY web workers (as read by gunicorn).
+    PASSWORD_HASH_WORKERS = int(os.environ.get(
+        'PASSWORD_HASH_WORKERS',
+        min(4, max(1, (os.cpu_count() or 1) // int(os.environ.get('WEB_CONCURRENCY', 1))))
+    ))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 4 * PASSWORD_HASH_WORKERS))
+    PASSWORD_HASH_TIMEOUT = 10  # seconds a login may wait for the pool before 503
+    
+    # Share one computation between identical concurrent summary/count reads
+    SINGLE_FLIGHT_ENABLED = os.environ.get('SINGLE_FLIGHT_ENABLED', 'true').lower() == 'true'
+    
     # Logging
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -47,7 +109,10 @@ class TestingConfig(Config):
     DEBUG = True
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {}  # In-memory SQLite has no connection pool to size
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=5)
+    CACHE_SUMMARIES_ENABLED = False
+    PASSWORD_HASH_WORKERS = 0
 
 
 class ProductionConfig(Config):
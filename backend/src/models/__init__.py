@@ -2,5 +2,8 @@
 from .user import User
 from .category import Category
 from .expense import Expense
+from .expense_rollup import ExpenseRollup, ExpenseRollupState
+from .tag import Tag, expense_tags
+from .data_version import DataVersion
 
-__all__ = ['User', 'Category', 'Expense']
+__all__ = ['User', 'Category', 'Expense', 'ExpenseRollup', 'ExpenseRollupState', 'Tag', 'expense_tags', 'DataVersion']
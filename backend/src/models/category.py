@@ -37,33 +37,89 @@ class Category(db.Model):
     @property
     def expense_count(self):
         """Get count of expenses in this category."""
-        return len(self.expenses)
+        return self.get_stats()[0]
     
     @property
     def total_amount(self):
         """Get total amount of expenses in this category."""
-        return sum(expense.amount for expense in self.expenses)
-    
-    def to_dict(self, include_stats=False):
-        """Convert category to dictionary."""
-        result = {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'color': self.color,
-            'icon': self.icon,
-            'is_active': self.is_active,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        return self.get_stats()[1]
+    
+    def get_stats(self):
+        """Get (expense count, total amount) with one aggregate query."""
+        from src.models.expense import Expense
+        
+        count, total = db.session.query(
+            db.func.count(Expense.id),
+            db.func.coalesce(db.func.sum(Expense.amount), 0)
+        ).filter(Expense.category_id == self.id).one()
+        
+        return count, total
+    
+    def to_dict(self, include_stats=False, stats=None, fields=None):
+        """
+        Convert category to dictionary.
         
-        if include_stats:
-            result.update({
-                'expense_count': self.expense_count,
-                'total_amount': float(self.total_amount)
-            })
+        Args:
+            include_stats: Include expense count and total amount
+            stats: Precomputed (expense count, total amount), avoids a query
+            fields: Field names to include (default: all)
+        """
+        result = Category.serialize(self, fields)
+        
+        if include_stats and Category.wants_stats(fields):
+            expense_count, total_amount = stats if stats is not None else self.get_stats()
+            result.update(Category.serialize_stats(expense_count, total_amount, fields))
         
         return result
     
+    # Attributes read by serialize(), for selecting plain rows
+    SERIALIZED_FIELDS = ('id', 'name', 'description', 'color', 'icon', 'is_active', 'created_at', 'updated_at')
+    STATS_FIELDS = ('expense_count', 'total_amount')
+    
+    @classmethod
+    def row_columns(cls, fields=None):
+        """Get the columns to select for ``serialize`` on plain rows."""
+        names = set(fields or cls.SERIALIZED_FIELDS) | {'id'}
+        return [getattr(cls, name) for name in cls.SERIALIZED_FIELDS if name in names]
+    
+    @staticmethod
+    def wants_stats(fields=None):
+        """Check whether a field selection includes any expense stats."""
+        return fields is None or any(name in fields for name in Category.STATS_FIELDS)
+    
+    @staticmethod
+    def serialize(values, fields=None):
+        """
+        Build the base ``to_dict`` output.
+        
+        Args:
+            values: Category, or a row selected with ``row_columns()``
+            fields: Field names to include (default: all)
+        """
+        result = {}
+        for name in Category.SERIALIZED_FIELDS:
+            if fields is not None and name not in fields:
+                continue
+            
+            value = getattr(values, name)
+            if name in ('created_at', 'updated_at') and value is not None:
+                value = value.isoformat()
+            result[name] = value
+        
+        return result
+    
+    @staticmethod
+    def serialize_stats(expense_count, total_amount, fields=None):
+        """Build the expense stats part of the ``to_dict`` output."""
+        stats = {
+            'expense_count': expense_count,
+            'total_amount': float(total_amount)
+        }
+        
+        if fields is not None:
+            stats = {name: value for name, value in stats.items() if name in fields}
+        
+        return stats
+    
     def __repr__(self):
         return f'<Category {self.name}>'
@@ -0,0 +1,13 @@
+from src.config.database import db
+
+
+class DataVersion(db.Model):
+    """Per-user counter bumped by every write to the user's expenses or categories."""
+    
+    __tablename__ = 'user_data_versions'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    version = db.Column(db.BigInteger, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f'<DataVersion {self.user_id}: {self.version}>'
@@ -1,6 +1,7 @@
 from datetime import datetime, date as date_type
 from decimal import Decimal
 from src.config.database import db
+from src.utils.search import create_search_index
 
 
 class Expense(db.Model):
@@ -14,7 +15,7 @@ class Expense(db.Model):
     date = db.Column(db.Date, nullable=False)
     notes = db.Column(db.Text)  # Additional notes
     receipt_url = db.Column(db.String(500))  # URL to receipt image
-    tags = db.Column(db.String(200))  # Comma-separated tags
+    legacy_tags = db.Column('tags', db.String(200))  # Deprecated: comma-separated, see expense_tags
     is_recurring = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -23,10 +24,18 @@ class Expense(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False)
     
+    # Relationships
+    tags = db.relationship('Tag', secondary='expense_tags', lazy='selectin', order_by='Tag.name')
+    
     # Indexes for better query performance
     __table_args__ = (
-        db.Index('idx_user_date', 'user_id', 'date'),
         db.Index('idx_user_category', 'user_id', 'category_id'),
+        # Keyset pagination: (sort key, id) for each sortable field; the
+        # date one also serves date range filters
+        db.Index('idx_user_date_id', 'user_id', 'date', 'id'),
+        db.Index('idx_user_amount_id', 'user_id', 'amount', 'id'),
+        db.Index('idx_user_description_id', 'user_id', 'description', 'id'),
+        db.Index('idx_user_created_id', 'user_id', 'created_at', 'id'),
     )
     
     def __init__(self, amount, description, date, user_id, category_id, 
@@ -38,7 +47,7 @@ class Expense(db.Model):
         self.category_id = category_id
         self.notes = notes
         self.receipt_url = receipt_url
-        self.tags = tags
+        self.tags = list(tags or [])
         self.is_recurring = is_recurring
     
     @property
@@ -48,36 +57,124 @@ class Expense(db.Model):
     
     @property
     def tag_list(self):
-        """Get tags as a list."""
-        return [tag.strip() for tag in (self.tags or '').split(',')] if self.tags else []
-    
-    def set_tags(self, tag_list):
-        """Set tags from a list."""
-        self.tags = ', '.join(tag_list) if tag_list else None
-    
-    def to_dict(self, include_relations=True):
-        """Convert expense to dictionary."""
-        result = {
-            'id': self.id,
-            'amount': float(self.amount),
-            'formatted_amount': self.formatted_amount,
-            'description': self.description,
-            'date': self.date.isoformat(),
-            'notes': self.notes,
-            'receipt_url': self.receipt_url,
-            'tags': self.tag_list,
-            'is_recurring': self.is_recurring,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        """Get tag names as a list."""
+        return [tag.name for tag in self.tags]
+    
+    def set_tags(self, tags):
+        """Set tags from a list of Tag objects."""
+        self.tags = list(tags or [])
+    
+    def to_dict(self, include_relations=True, fields=None):
+        """
+        Convert expense to dictionary.
         
-        if include_relations:
-            result.update({
-                'category': self.category.to_dict() if self.category else None,
-                'user_id': self.user_id
-            })
+        Args:
+            include_relations: Include category and user ID
+            fields: Field names to include (default: all, see DEFAULT_FIELDS)
+        """
+        wanted = fields if fields is not None else Expense.DEFAULT_FIELDS
+        
+        category = None
+        if include_relations and 'category' in wanted and self.category:
+            category = self.category.to_dict()
+        
+        tags = self.tag_list if 'tags' in wanted else None
+        return Expense.serialize(self, tags, category, include_relations, fields)
+    
+    # Attributes read by serialize(), for selecting plain rows
+    SERIALIZED_FIELDS = (
+        'id', 'amount', 'description', 'date', 'notes', 'receipt_url', 'is_recurring',
+        'created_at', 'updated_at', 'user_id', 'category_id'
+    )
+    
+    # Fields of the serialized expense, in output order, and the columns each reads
+    FIELD_COLUMNS = {
+        'id': ('id',),
+        'amount': ('amount',),
+        'formatted_amount': ('amount',),
+        'description': ('description',),
+        'date': ('date',),
+        'notes': ('notes',),
+        'receipt_url': ('receipt_url',),
+        'tags': (),
+        'is_recurring': ('is_recurring',),
+        'created_at': ('created_at',),
+        'updated_at': ('updated_at',),
+        'category': ('category_id',),
+        'user_id': ('user_id',),
+        'category_id': ('category_id',),
+    }
+    
+    # Fields returned when none are requested; category_id is opt-in
+    DEFAULT_FIELDS = tuple(name for name in FIELD_COLUMNS if name != 'category_id')
+    RELATION_FIELDS = ('category', 'user_id')
+    
+    # Value of each column-backed field; tags and category are passed in
+    FIELD_VALUES = {
+        'id': lambda values: values.id,
+        'amount': lambda values: float(values.amount),
+        'formatted_amount': lambda values: f"${values.amount:.2f}",
+        'description': lambda values: values.description,
+        'date': lambda values: values.date.isoformat(),
+        'notes': lambda values: values.notes,
+        'receipt_url': lambda values: values.receipt_url,
+        'is_recurring': lambda values: values.is_recurring,
+        'created_at': lambda values: values.created_at.isoformat(),
+        'updated_at': lambda values: values.updated_at.isoformat() if values.updated_at else None,
+        'user_id': lambda values: values.user_id,
+        'category_id': lambda values: values.category_id,
+    }
+    
+    @classmethod
+    def row_columns(cls, fields=None, extra=()):
+        """
+        Get the columns to select for ``serialize`` on plain rows.
+        
+        Args:
+            fields: Field names that will be serialized (default: all)
+            extra: Additional column names to select (e.g. a sort key)
+        """
+        if fields is None:
+            return [getattr(cls, name) for name in cls.SERIALIZED_FIELDS]
+        
+        names = {'id', *extra}
+        for field in fields:
+            names.update(cls.FIELD_COLUMNS[field])
+        
+        return [getattr(cls, name) for name in cls.SERIALIZED_FIELDS if name in names]
+    
+    @staticmethod
+    def serialize(values, tags, category=None, include_relations=True, fields=None):
+        """
+        Build the ``to_dict`` output.
+        
+        Args:
+            values: Expense, or a row selected with ``row_columns()``
+            tags: List of tag names
+            category: Category dict (used with include_relations)
+            include_relations: Include category and user ID
+            fields: Field names to include (default: DEFAULT_FIELDS)
+        """
+        if fields is None:
+            fields = Expense.DEFAULT_FIELDS
+        
+        result = {}
+        for name in fields:
+            if name in Expense.RELATION_FIELDS and not include_relations:
+                continue
+            
+            if name == 'tags':
+                result[name] = tags
+            elif name == 'category':
+                result[name] = category
+            else:
+                result[name] = Expense.FIELD_VALUES[name](values)
         
         return result
     
     def __repr__(self):
         return f'<Expense {self.description}: ${self.amount}>'
+
+
+# Full-text search column/index (PostgreSQL) or FTS5 table (SQLite)
+db.event.listen(Expense.__table__, 'after_create', create_search_index)
@@ -0,0 +1,44 @@
+from datetime import date as date_type, datetime
+from decimal import Decimal
+from src.config.database import db
+
+
+class ExpenseRollup(db.Model):
+    """Per-user monthly expense totals by category, maintained on every write."""
+    
+    __tablename__ = 'expense_monthly_rollups'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.Date, nullable=False)  # First day of the month
+    expense_count = db.Column(db.Integer, default=0, nullable=False)
+    total_amount = db.Column(db.Numeric(14, 2), default=Decimal('0.00'), nullable=False)
+    
+    # Foreign keys
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False)
+    
+    # Constraints
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'category_id', 'month', name='unique_user_category_month'),
+        db.Index('idx_rollup_user_month', 'user_id', 'month'),
+    )
+    
+    @staticmethod
+    def month_of(value):
+        """Get the first day of the month for a date."""
+        return date_type(value.year, value.month, 1)
+    
+    def __repr__(self):
+        return f'<ExpenseRollup {self.user_id}/{self.category_id} {self.month}: ${self.total_amount}>'
+
+
+class ExpenseRollupState(db.Model):
+    """Marks users whose rollups were built from their expenses and can serve summaries."""
+    
+    __tablename__ = 'expense_rollup_states'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    built_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<ExpenseRollupState {self.user_id}: {self.built_at}>'
@@ -0,0 +1,43 @@
+from datetime import datetime
+from src.config.database import db
+
+
+# Association table between expenses and tags
+expense_tags = db.Table(
+    'expense_tags',
+    db.Column('expense_id', db.Integer, db.ForeignKey('expenses.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('idx_expense_tags_tag', 'tag_id', 'expense_id'),
+)
+
+
+class Tag(db.Model):
+    """Tag model for labelling expenses."""
+    
+    __tablename__ = 'tags'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Foreign key
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    
+    # Constraints
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'name', name='unique_user_tag'),
+    )
+    
+    def __init__(self, name, user_id):
+        self.name = name
+        self.user_id = user_id
+    
+    def to_dict(self):
+        """Convert tag to dictionary."""
+        return {
+            'id': self.id,
+            'name': self.name
+        }
+    
+    def __repr__(self):
+        return f'<Tag {self.name}>'
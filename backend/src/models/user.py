@@ -23,16 +23,20 @@ class User(db.Model):
     categories = db.relationship('Category', backref='user', lazy=True, cascade='all, delete-orphan')
     expenses = db.relationship('Expense', backref='user', lazy=True, cascade='all, delete-orphan')
     
-    def __init__(self, email, username, password, first_name, last_name):
+    def __init__(self, email, username, password, first_name, last_name, password_hash=None):
         self.email = email
         self.username = username
-        self.set_password(password)
+        if password_hash is not None:
+            self.password_hash = password_hash
+        else:
+            self.set_password(password)
         self.first_name = first_name
         self.last_name = last_name
     
     def set_password(self, password):
-        """Hash and set password."""
-        self.password_hash = generate_password_hash(password)
+        """Hash and set password with the configured hash method."""
+        from src.utils.password_hashing import password_hasher
+        self.password_hash = generate_password_hash(password, password_hasher.method)
     
     def check_password(self, password):
         """Check if provided password matches hash."""
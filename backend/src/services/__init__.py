@@ -2,5 +2,8 @@
 from .auth_service import AuthService
 from .category_service import CategoryService
 from .expense_service import ExpenseService
+from .tag_service import TagService
+from .import_service import ImportService
+from .version_service import VersionService
 
-__all__ = ['AuthService', 'CategoryService', 'ExpenseService']
+__all__ = ['AuthService', 'CategoryService', 'ExpenseService', 'TagService', 'ImportService', 'VersionService']
@@ -1,6 +1,13 @@
+from flask import current_app
 from flask_jwt_extended import create_access_token, create_refresh_token
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 from src.models.user import User
+from src.services.rollup_service import RollupService
 from src.config.database import db
+from src.utils.cache import user_cache, MISSING
+from src.utils.password_hashing import password_hasher
+import time
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,6 +33,7 @@ class AuthService:
             
         Raises:
             ValueError: If user already exists
+            PasswordHashingBusy: If the hashing pool is saturated
         """
         # Check if user already exists
         existing_user = User.query.filter(
@@ -38,18 +46,25 @@ class AuthService:
             else:
                 raise ValueError('Username already taken')
         
-        # Create new user
+        # Create new user, hashing the password on the hashing pool
         user = User(
             email=email,
             username=username,
-            password=password,
+            password=None,
             first_name=first_name,
-            last_name=last_name
+            last_name=last_name,
+            password_hash=password_hasher.hash(password)
         )
         
         try:
             db.session.add(user)
+            db.session.flush()
+            
+            # A new user has no expenses, so their (empty) rollups are complete
+            RollupService.mark_built(user.id)
+            
             db.session.commit()
+            AuthService.cache_user(user)
             
             # Generate tokens
             access_token = create_access_token(identity=str(user.id))
@@ -82,12 +97,21 @@ class AuthService:
             
         Raises:
             ValueError: If credentials are invalid
+            PasswordHashingBusy: If the hashing pool is saturated
         """
         user = User.query.filter_by(email=email, is_active=True).first()
         
-        if not user or not user.check_password(password):
+        if not user or not password_hasher.verify(user.password_hash, password):
             raise ValueError('Invalid email or password')
         
+        if password_hasher.needs_rehash(user.password_hash):
+            password_hasher.run_in_background(
+                AuthService._rehash_password,
+                current_app._get_current_object(), user.id, user.password_hash, password
+            )
+        
+        AuthService.cache_user(user)
+        
         # Generate tokens
         access_token = create_access_token(identity=str(user.id))
         refresh_token = create_refresh_token(identity=str(user.id))
@@ -100,6 +124,36 @@ class AuthService:
             'refresh_token': refresh_token
         }
     
+    @staticmethod
+    def _rehash_password(app, user_id, old_hash, password):
+        """
+        Replace an outdated password hash after a successful login.
+        
+        Runs on the hasher's background thread. The update only applies
+        if the hash is unchanged, so a concurrent password change wins; a
+        busy hashing pool skips the upgrade until the next login.
+        """
+        with app.app_context():
+            try:
+                new_hash = password_hasher.hash(password)
+                updated = User.query.filter_by(id=user_id, password_hash=old_hash).update(
+                    {'password_hash': new_hash}, synchronize_session=False
+                )
+                db.session.commit()
+                
+                if updated:
+                    # Bulk UPDATE: not seen by the ORM commit hook
+                    AuthService.invalidate_user_cache(user_id)
+                    password_hasher.record_rehash()
+                    logger.info(f"Upgraded password hash for user {user_id} to {password_hasher.method}")
+            
+            except Exception as e:
+                db.session.rollback()
+                logger.warning(f"Failed to upgrade password hash for user {user_id}: {str(e)}")
+            
+            finally:
+                db.session.remove()
+    
     @staticmethod
     def get_user_by_id(user_id):
         """
@@ -113,6 +167,61 @@ class AuthService:
         """
         return User.query.filter_by(id=user_id, is_active=True).first()
     
+    @staticmethod
+    def get_user_dict(user_id):
+        """
+        Get an active user's data from the user cache.
+        
+        Missing and inactive users are cached too (for
+        ``CACHE_USERS_NEGATIVE_TTL`` seconds), so repeated requests with
+        stale tokens don't reach the database.
+        
+        Args:
+            user_id: User ID (token identity)
+            
+        Returns:
+            dict: User dict (shared with the cache; do not modify) or None
+        """
+        key = str(user_id)
+        user_data = user_cache.get(key)
+        
+        if user_data is MISSING:
+            # Not cached if the user is updated while being loaded
+            generation = user_cache.generation()
+            started = time.time()
+            
+            user = AuthService.get_user_by_id(user_id)
+            user_data = user.to_dict() if user is not None else None
+            
+            if user_data is not None:
+                user_cache.set(key, user_data, group=key, since=started, generation=generation)
+            else:
+                user_cache.set(
+                    key, None, group=key, since=started, generation=generation,
+                    ttl=current_app.config.get('CACHE_USERS_NEGATIVE_TTL', 30)
+                )
+        
+        return user_data
+    
+    @staticmethod
+    def cache_user(user):
+        """Store a freshly loaded or committed user in the user cache."""
+        key = str(user.id)
+        if user.is_active:
+            user_cache.set(key, user.to_dict(), group=key)
+        else:
+            AuthService.invalidate_user_cache(user.id)
+    
+    @staticmethod
+    def invalidate_user_cache(user_id):
+        """
+        Drop a cached user.
+        
+        Called automatically after commits that update or delete users
+        through the ORM; bulk UPDATE/DELETE statements must call it.
+        """
+        user_cache.invalidate(str(user_id))
+    
     @staticmethod
     def refresh_token(user_id):
         """
@@ -124,12 +233,32 @@ class AuthService:
         Returns:
             dict: New access token
         """
-        user = AuthService.get_user_by_id(user_id)
+        user = AuthService.get_user_dict(user_id)
         if not user:
             raise ValueError('User not found')
         
-        access_token = create_access_token(identity=str(user.id))
+        access_token = create_access_token(identity=str(user['id']))
         
         return {
             'access_token': access_token
         }
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_changed_users(session, flush_context):
+    """Remember users updated or deleted in this transaction."""
+    changed = [obj.id for obj in list(session.dirty) + list(session.deleted) if isinstance(obj, User)]
+    if changed:
+        session.info.setdefault('changed_user_ids', set()).update(changed)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_changed_users(session):
+    """Drop cached copies of users changed by the committed transaction."""
+    for user_id in session.info.pop('changed_user_ids', ()):
+        AuthService.invalidate_user_cache(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_changed_users(session):
+    session.info.pop('changed_user_ids', None)
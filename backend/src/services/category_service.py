@@ -1,5 +1,8 @@
 from src.models.category import Category
+from src.models.expense import Expense
 from src.config.database import db
+from src.services.version_service import VersionService
+from src.utils.cache import category_cache, summary_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -8,6 +11,9 @@ logger = logging.getLogger(__name__)
 class CategoryService:
     """Service for managing expense categories."""
     
+    # Field names accepted by sparse fieldsets (?fields=)
+    FIELDS = Category.SERIALIZED_FIELDS + Category.STATS_FIELDS
+    
     @staticmethod
     def create_category(user_id, name, description=None, color='#6c757d', icon='📁'):
         """
@@ -27,13 +33,7 @@ class CategoryService:
             ValueError: If category name already exists for user
         """
         # Check if category name already exists for this user
-        existing_category = Category.query.filter_by(
-            user_id=user_id,
-            name=name,
-            is_active=True
-        ).first()
-        
-        if existing_category:
+        if CategoryService._find_by_name(user_id, name):
             raise ValueError(f'Category "{name}" already exists')
         
         # Create category
@@ -47,7 +47,9 @@ class CategoryService:
         
         try:
             db.session.add(category)
+            VersionService.bump(user_id)
             db.session.commit()
+            CategoryService.invalidate_user_cache(user_id)
             
             logger.info(f"Category created: {name} for user {user_id}")
             return category
@@ -58,23 +60,133 @@ class CategoryService:
             raise
     
     @staticmethod
-    def get_user_categories(user_id, include_stats=False):
+    def get_user_categories(user_id, include_stats=False, fields=None):
         """
         Get all categories for a user.
         
         Args:
             user_id: User ID
             include_stats: Include expense statistics
+            fields: Category fields to return (default: all); naming a
+                stats field implies include_stats
             
         Returns:
             list: List of categories
         """
-        categories = Category.query.filter_by(
-            user_id=user_id,
-            is_active=True
+        if fields is not None and Category.wants_stats(fields):
+            include_stats = True
+        
+        return CategoryService._serialize_categories(user_id, include_stats, fields)
+    
+    @staticmethod
+    def get_category_dict(category_id, user_id, fields=None):
+        """
+        Get a serialized category with its expense statistics.
+        
+        Args:
+            category_id: Category ID
+            user_id: User ID
+            fields: Category fields to return (default: all)
+            
+        Returns:
+            dict: Category dict or None
+        """
+        categories = CategoryService._serialize_categories(
+            user_id, True, fields, category_id=category_id
+        )
+        return categories[0] if categories else None
+    
+    @staticmethod
+    def _serialize_categories(user_id, include_stats=False, fields=None, category_id=None):
+        """Serialize cached active categories, adding expense stats from one grouped query."""
+        active = CategoryService.get_active_categories(user_id)
+        
+        if category_id is not None:
+            rows = [active[category_id]] if category_id in active else []
+        else:
+            rows = list(active.values())
+        
+        stats = None
+        if rows and include_stats and Category.wants_stats(fields):
+            query = db.session.query(
+                Expense.category_id,
+                db.func.count(Expense.id),
+                db.func.sum(Expense.amount)
+            ).filter(Expense.user_id == user_id).group_by(Expense.category_id)
+            
+            if category_id is not None:
+                query = query.filter(Expense.category_id == category_id)
+            
+            stats = {row_category_id: (count, total) for row_category_id, count, total in query}
+        
+        categories = []
+        for row in rows:
+            category = Category.serialize(row, fields)
+            if stats is not None:
+                count, total = stats.get(row.id, (0, 0))
+                category.update(Category.serialize_stats(count, total, fields))
+            categories.append(category)
+        
+        return categories
+    
+    @staticmethod
+    def get_active_categories(user_id):
+        """
+        Get a user's active categories from the category cache.
+        
+        The rows are loaded with one query on a miss and kept until a
+        category write invalidates them (or the TTL expires). They must
+        not be modified.
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            dict: {category_id: category row}, ordered by name
+        """
+        return category_cache.get_or_set(
+            user_id,
+            lambda: CategoryService._load_active_categories(user_id),
+            group=user_id
+        )
+    
+    @staticmethod
+    def _load_active_categories(user_id):
+        """Read a user's active categories as plain rows."""
+        rows = db.session.query(*Category.row_columns()).filter(
+            Category.user_id == user_id,
+            Category.is_active.is_(True)
         ).order_by(Category.name).all()
         
-        return [category.to_dict(include_stats=include_stats) for category in categories]
+        return {row.id: row for row in rows}
+    
+    @staticmethod
+    def _find_by_name(user_id, name):
+        """Find an active category of a user by name."""
+        for row in CategoryService.get_active_categories(user_id).values():
+            if row.name == name:
+                return row
+        return None
+    
+    @staticmethod
+    def is_user_category(category_id, user_id):
+        """
+        Check that a category exists, is active and belongs to a user.
+        
+        Args:
+            category_id: Category ID
+            user_id: User ID
+            
+        Returns:
+            bool: True if the user may use the category
+        """
+        return category_id in CategoryService.get_active_categories(user_id)
+    
+    @staticmethod
+    def invalidate_user_cache(user_id):
+        """Drop a user's cached categories and summaries after a category write."""
+        category_cache.invalidate(user_id)
+        summary_cache.invalidate(user_id)
     
     @staticmethod
     def get_category_by_id(category_id, user_id):
@@ -116,11 +228,7 @@ class CategoryService:
         
         # Check for name conflicts if name is being updated
         if 'name' in kwargs and kwargs['name'] != category.name:
-            existing_category = Category.query.filter_by(
-                user_id=user_id,
-                name=kwargs['name'],
-                is_active=True
-            ).first()
+            existing_category = CategoryService._find_by_name(user_id, kwargs['name'])
             
             if existing_category and existing_category.id != category_id:
                 raise ValueError(f'Category "{kwargs["name"]}" already exists')
@@ -131,7 +239,9 @@ class CategoryService:
                 if hasattr(category, field):
                     setattr(category, field, value)
             
+            VersionService.bump(user_id)
             db.session.commit()
+            CategoryService.invalidate_user_cache(user_id)
             
             logger.info(f"Category updated: {category.name} for user {user_id}")
             return category
@@ -161,12 +271,18 @@ class CategoryService:
             raise ValueError('Category not found')
         
         # Check if category has expenses
-        if category.expenses:
+        has_expenses = db.session.query(
+            Expense.query.filter_by(category_id=category_id).exists()
+        ).scalar()
+        
+        if has_expenses:
             raise ValueError('Cannot delete category with existing expenses')
         
         try:
             category.is_active = False
+            VersionService.bump(user_id)
             db.session.commit()
+            CategoryService.invalidate_user_cache(user_id)
             
             logger.info(f"Category deleted: {category.name} for user {user_id}")
             return True
@@ -1,8 +1,24 @@
 from src.models.expense import Expense
 from src.models.category import Category
+from src.models.tag import Tag, expense_tags
 from src.config.database import db
-from src.utils.helpers import paginate_query, build_expense_filters, generate_expense_summary
+from sqlalchemy import insert
+from sqlalchemy.orm import contains_eager, joinedload
+from src.services.category_service import CategoryService
+from src.services.rollup_service import RollupService
+from src.services.tag_service import TagService
+from src.services.version_service import VersionService
+from src.utils.helpers import (
+    paginate_query,
+    keyset_paginate_query,
+    build_expense_filters,
+    summarize_expense_query,
+    count_cache_key
+)
+from src.utils.cache import expense_count_cache, summary_cache
+from src.utils.single_flight import expense_count_flight, summary_flight
 from decimal import Decimal
+from functools import partial
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,6 +27,9 @@ logger = logging.getLogger(__name__)
 class ExpenseService:
     """Service for managing expenses."""
     
+    # Field names accepted by sparse fieldsets (?fields=)
+    FIELDS = tuple(Expense.FIELD_COLUMNS)
+    
     @staticmethod
     def create_expense(user_id, amount, description, date, category_id, 
                       notes=None, receipt_url=None, tags=None, is_recurring=False):
@@ -35,13 +54,7 @@ class ExpenseService:
             ValueError: If category not found or belongs to different user
         """
         # Verify category exists and belongs to user
-        category = Category.query.filter_by(
-            id=category_id,
-            user_id=user_id,
-            is_active=True
-        ).first()
-        
-        if not category:
+        if not CategoryService.is_user_category(category_id, user_id):
             raise ValueError('Category not found or access denied')
         
         # Create expense
@@ -58,14 +71,21 @@ class ExpenseService:
         
         # Set tags if provided
         if tags:
-            expense.set_tags(tags)
+            expense.set_tags(TagService.resolve_tags(user_id, tags))
         
         try:
             db.session.add(expense)
+            db.session.flush()  # Assign the expense ID
+            RollupService.add_expense(expense)
+            expense_id = expense.id
+            VersionService.bump(user_id)
             db.session.commit()
+            ExpenseService.invalidate_user_caches(user_id)
             
             logger.info(f"Expense created: {description} (${amount}) for user {user_id}")
-            return expense
+            
+            # Reload with its category in one query for the response
+            return ExpenseService.get_expense_by_id(expense_id, user_id)
             
         except Exception as e:
             db.session.rollback()
@@ -73,7 +93,104 @@ class ExpenseService:
             raise
     
     @staticmethod
-    def get_user_expenses(user_id, filters=None, page=1, per_page=20):
+    def create_expenses(user_id, items):
+        """
+        Create many expenses in one transaction.
+        
+        Category ownership is checked against the user's cached categories,
+        tags are resolved once for the whole batch, and rows are written
+        with multi-row INSERTs. Items whose category is not the user's are
+        reported and skipped; the rest are created.
+        
+        Args:
+            user_id: User ID
+            items: List of (index, validated expense data) tuples
+        
+        Returns:
+            dict: {index: Expense} for created items and
+            {index: error message} for rejected ones
+        """
+        results = {}
+        
+        # Verify all categories exist and belong to user
+        owned = CategoryService.get_active_categories(user_id)
+        
+        valid = []
+        for index, data in items:
+            if data['category_id'] in owned:
+                valid.append((index, data))
+            else:
+                results[index] = 'Category not found or access denied'
+        
+        if not valid:
+            return results
+        
+        try:
+            # Resolve every tag name used in the batch at once
+            tags = {
+                tag.name: tag
+                for tag in TagService.resolve_tags(
+                    user_id, [name for _, data in valid for name in (data.get('tags') or [])]
+                )
+            }
+            db.session.flush()
+            
+            rows = [
+                {
+                    'amount': Decimal(str(data['amount'])),
+                    'description': data['description'],
+                    'date': data['date'],
+                    'user_id': user_id,
+                    'category_id': data['category_id'],
+                    'notes': data.get('notes'),
+                    'receipt_url': data.get('receipt_url'),
+                    'is_recurring': data.get('is_recurring', False)
+                }
+                for _, data in valid
+            ]
+            expense_ids = db.session.scalars(
+                insert(Expense).returning(Expense.id, sort_by_parameter_order=True),
+                rows
+            ).all()
+            
+            tag_rows = [
+                {'expense_id': expense_id, 'tag_id': tags[name].id}
+                for expense_id, (_, data) in zip(expense_ids, valid)
+                for name in TagService.normalize_names(data.get('tags'))
+            ]
+            if tag_rows:
+                db.session.execute(expense_tags.insert(), tag_rows)
+            
+            RollupService.apply_rows(
+                user_id, [(row['category_id'], row['date'], row['amount']) for row in rows]
+            )
+            
+            VersionService.bump(user_id)
+            db.session.commit()
+            ExpenseService.invalidate_user_caches(user_id)
+            
+            logger.info(f"Batch created {len(expense_ids)} expenses for user {user_id}")
+        
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to create expenses: {str(e)}")
+            raise
+        
+        # Reload the created expenses with their categories in one query
+        expenses = {
+            expense.id: expense
+            for expense in Expense.query.filter(Expense.id.in_(expense_ids)).options(
+                joinedload(Expense.category)
+            )
+        }
+        for expense_id, (index, _) in zip(expense_ids, valid):
+            results[index] = expenses[expense_id]
+        
+        return results
+    
+    @staticmethod
+    def get_user_expenses(user_id, filters=None, page=1, per_page=20, with_total=True, as_rows=True,
+                          fields=None, compact=False):
         """
         Get paginated expenses for user with optional filters.
         
@@ -82,22 +199,111 @@ class ExpenseService:
             filters: Dict of filter parameters
             page: Page number
             per_page: Items per page
+            with_total: Include total item/page counts
+            as_rows: Serialize plain column rows instead of ORM objects
+                (same output, see ``_serialize_rows``)
+            fields: Expense fields to return (default: all)
+            compact: Return category_id per item and each category once in
+                a top-level ``categories`` map
             
         Returns:
             dict: Paginated expenses with metadata
         """
-        # Base query
-        query = Expense.query.filter_by(user_id=user_id).join(Category)
+        side_load = False
+        if compact:
+            fields, side_load = ExpenseService._compact_fields(fields)
+        
+        # Base query; categories are loaded from the join, not per row
+        query = Expense.query.filter_by(user_id=user_id).join(Category).options(
+            contains_eager(Expense.category)
+        )
         
         # Apply filters if provided
         if filters:
-            query = build_expense_filters(query, filters)
+            query = build_expense_filters(query, filters, user_id)
         else:
             # Default sorting by date descending
             query = query.order_by(Expense.date.desc())
         
+        total = None
+        if with_total:
+            total = ExpenseService._cached_count(
+                user_id, count_cache_key(('expenses', user_id), filters), query
+            )
+        
         # Paginate results
-        return paginate_query(query, page, per_page)
+        if as_rows:
+            result = paginate_query(
+                query.with_entities(*Expense.row_columns(fields)), page, per_page,
+                with_total=with_total, total=total,
+                serialize=lambda rows: ExpenseService._serialize_rows(rows, fields)
+            )
+        else:
+            result = paginate_query(
+                query, page, per_page, with_total=with_total, total=total,
+                serialize=lambda expenses: [expense.to_dict(fields=fields) for expense in expenses]
+            )
+        
+        return ExpenseService._side_load_categories(result) if side_load else result
+    
+    @staticmethod
+    def get_user_expenses_by_cursor(user_id, filters=None, cursor=None, per_page=20, as_rows=True,
+                                    fields=None, compact=False):
+        """
+        Get a page of expenses for user using keyset (cursor) pagination.
+        
+        Args:
+            user_id: User ID
+            filters: Dict of filter parameters
+            cursor: Cursor token from the previous page (optional)
+            per_page: Items per page
+            as_rows: Serialize plain column rows instead of ORM objects
+            fields: Expense fields to return (default: all)
+            compact: Side-load categories (see ``get_user_expenses``)
+            
+        Returns:
+            dict: Page of expenses with next cursor
+            
+        Raises:
+            ValueError: If the cursor or sort is invalid
+        """
+        filters = filters or {}
+        sort_by = filters.get('sort_by') or 'date'
+        sort_order = filters.get('sort_order') or 'desc'
+        
+        if sort_by == 'relevance':
+            raise ValueError('Relevance sorting is not supported in cursor mode')
+        
+        side_load = False
+        if compact:
+            fields, side_load = ExpenseService._compact_fields(fields)
+        
+        # Base query; categories are loaded from the join, not per row
+        query = Expense.query.filter_by(user_id=user_id).join(Category).options(
+            contains_eager(Expense.category)
+        )
+        query = build_expense_filters(query, filters, user_id)
+        
+        if as_rows:
+            # The sort key is read from the last row for the next cursor
+            query = query.with_entities(*Expense.row_columns(fields, extra=(sort_by,)))
+            serialize = partial(ExpenseService._serialize_rows, fields=fields)
+        else:
+            def serialize(expenses):
+                return [expense.to_dict(fields=fields) for expense in expenses]
+        
+        result = keyset_paginate_query(
+            query,
+            sort_column=getattr(Expense, sort_by),
+            id_column=Expense.id,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            per_page=per_page,
+            cursor=cursor,
+            serialize=serialize
+        )
+        
+        return ExpenseService._side_load_categories(result) if side_load else result
     
     @staticmethod
     def get_expense_by_id(expense_id, user_id):
@@ -114,7 +320,33 @@ class ExpenseService:
         return Expense.query.filter_by(
             id=expense_id,
             user_id=user_id
+        ).options(joinedload(Expense.category)).first()
+    
+    @staticmethod
+    def get_expense_dict(expense_id, user_id, fields=None):
+        """
+        Get a serialized expense by ID for specific user.
+        
+        Reads plain column rows (only the columns ``fields`` needs) for
+        read-only responses.
+        
+        Args:
+            expense_id: Expense ID
+            user_id: User ID
+            fields: Expense fields to return (default: all)
+            
+        Returns:
+            dict: Expense dict or None
+        """
+        row = db.session.query(*Expense.row_columns(fields)).filter(
+            Expense.id == expense_id,
+            Expense.user_id == user_id
         ).first()
+        
+        if row is None:
+            return None
+        
+        return ExpenseService._serialize_rows([row], fields)[0]
     
     @staticmethod
     def update_expense(expense_id, user_id, **kwargs):
@@ -138,19 +370,16 @@ class ExpenseService:
         
         # If category is being updated, verify it belongs to user
         if 'category_id' in kwargs:
-            category = Category.query.filter_by(
-                id=kwargs['category_id'],
-                user_id=user_id,
-                is_active=True
-            ).first()
-            
-            if not category:
+            if not CategoryService.is_user_category(kwargs['category_id'], user_id):
                 raise ValueError('Category not found or access denied')
         
+        # Remember rollup key and amount before the update
+        previous = (expense.category_id, expense.date, expense.amount)
+        
         try:
             # Handle special fields
             if 'tags' in kwargs:
-                expense.set_tags(kwargs.pop('tags'))
+                expense.set_tags(TagService.resolve_tags(user_id, kwargs.pop('tags')))
             
             # Update other fields
             for field, value in kwargs.items():
@@ -160,7 +389,16 @@ class ExpenseService:
                     else:
                         setattr(expense, field, value)
             
+            if (expense.category_id, expense.date, expense.amount) != previous:
+                RollupService.remove_expense(user_id, *previous)
+                RollupService.add_expense(expense)
+            
+            VersionService.bump(user_id)
             db.session.commit()
+            ExpenseService.invalidate_user_caches(user_id)
+            
+            # Reload with its category in one query for the response
+            expense = ExpenseService.get_expense_by_id(expense_id, user_id)
             
             logger.info(f"Expense updated: {expense.description} for user {user_id}")
             return expense
@@ -191,7 +429,10 @@ class ExpenseService:
         
         try:
             db.session.delete(expense)
+            RollupService.remove_expense(user_id, expense.category_id, expense.date, expense.amount)
+            VersionService.bump(user_id)
             db.session.commit()
+            ExpenseService.invalidate_user_caches(user_id)
             
             logger.info(f"Expense deleted: {expense.description} for user {user_id}")
             return True
@@ -202,31 +443,210 @@ class ExpenseService:
             raise
     
     @staticmethod
-    def get_expense_summary(user_id, filters=None):
+    def bulk_update_expenses(user_id, changes, ids=None, filters=None):
+        """
+        Update many expenses with one UPDATE statement.
+        
+        Expenses are selected by ``ids`` or, if not given, by ``filters``
+        (see ``build_expense_filters``), always scoped to the user.
+        
+        Args:
+            user_id: User ID
+            changes: Dict of fields to set (tags are not supported)
+            ids: List of expense IDs (optional)
+            filters: Dict of filter parameters (optional)
+            
+        Returns:
+            int: Number of expenses updated
+            
+        Raises:
+            ValueError: If category not found or belongs to different user
+        """
+        values = dict(changes)
+        
+        if 'category_id' in values:
+            if not CategoryService.is_user_category(values['category_id'], user_id):
+                raise ValueError('Category not found or access denied')
+        
+        if 'amount' in values:
+            values['amount'] = Decimal(str(values['amount']))
+        
+        query = ExpenseService._bulk_selection(user_id, ids, filters)
+        
+        try:
+            # Move the matched rollup totals before the rows change
+            if {'category_id', 'date', 'amount'} & set(values):
+                RollupService.move_totals(user_id, RollupService.month_totals(query), values)
+            
+            updated = query.update(values, synchronize_session=False)
+            VersionService.bump(user_id)
+            db.session.commit()
+            ExpenseService.invalidate_user_caches(user_id)
+            
+            logger.info(f"Bulk updated {updated} expenses for user {user_id}")
+            return updated
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to bulk update expenses: {str(e)}")
+            raise
+    
+    @staticmethod
+    def bulk_delete_expenses(user_id, ids=None, filters=None):
+        """
+        Delete many expenses with one DELETE statement.
+        
+        Expenses are selected by ``ids`` or, if not given, by ``filters``
+        (see ``build_expense_filters``), always scoped to the user.
+        
+        Args:
+            user_id: User ID
+            ids: List of expense IDs (optional)
+            filters: Dict of filter parameters (optional)
+            
+        Returns:
+            int: Number of expenses deleted
+        """
+        query = ExpenseService._bulk_selection(user_id, ids, filters)
+        
+        try:
+            RollupService.apply_totals(user_id, RollupService.month_totals(query), sign=-1)
+            
+            deleted = query.delete(synchronize_session=False)
+            
+            # Drop the deleted expenses' tag links; SQLite does not enforce
+            # ON DELETE CASCADE unless foreign keys are switched on
+            db.session.execute(expense_tags.delete().where(
+                expense_tags.c.tag_id.in_(db.select(Tag.id).where(Tag.user_id == user_id)),
+                ~db.select(Expense.id).where(Expense.id == expense_tags.c.expense_id).exists()
+            ))
+            
+            VersionService.bump(user_id)
+            db.session.commit()
+            ExpenseService.invalidate_user_caches(user_id)
+            
+            logger.info(f"Bulk deleted {deleted} expenses for user {user_id}")
+            return deleted
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to bulk delete expenses: {str(e)}")
+            raise
+    
+    @staticmethod
+    def get_expense_summary(user_id, filters=None, include_tags=False):
         """
         Get expense summary statistics.
         
+        Results are cached per user and normalized filter set until the
+        user's next expense or category write; concurrent identical
+        requests share one computation.
+        
         Args:
             user_id: User ID
             filters: Dict of filter parameters
+            include_tags: Add per-tag totals under 'tags'
             
         Returns:
-            dict: Summary statistics
+            dict: Summary statistics (shared with the cache; do not modify)
         """
+        return summary_cache.get_or_set(
+            count_cache_key(('summary', user_id, include_tags), filters),
+            lambda: ExpenseService._compute_summary(user_id, filters, include_tags),
+            group=user_id,
+            flight=summary_flight
+        )
+    
+    @staticmethod
+    def _compute_summary(user_id, filters=None, include_tags=False):
+        """Compute summary statistics from rollups or the expenses table."""
+        # Month-aligned reads are served from the rollup table
+        summary = RollupService.get_summary(user_id, filters, include_tags)
+        if summary is not None:
+            return summary
+        
         # Base query
         query = Expense.query.filter_by(user_id=user_id).join(Category)
         
         # Apply filters if provided
         if filters:
-            query = build_expense_filters(query, filters)
+            query = build_expense_filters(query, filters, user_id)
         
-        # Get all expenses for summary
-        expenses = query.all()
+        # Aggregate in the database rather than loading every expense
+        return summarize_expense_query(query, include_tags)
+    
+    # Columns written by export_expenses, in order
+    EXPORT_FIELDS = [
+        'id', 'date', 'description', 'amount', 'category', 'category_id',
+        'tags', 'notes', 'receipt_url', 'is_recurring', 'created_at'
+    ]
+    
+    @staticmethod
+    def export_expenses(user_id, filters=None, batch_size=1000):
+        """
+        Stream a user's expenses for export.
+        
+        Rows are read through a server-side cursor in batches of
+        ``batch_size`` as plain column tuples (no ORM objects), and the
+        tags for each batch are fetched with one IN query, so memory use
+        does not grow with the number of expenses.
         
-        return generate_expense_summary(expenses)
+        Args:
+            user_id: User ID
+            filters: Dict of filter parameters
+            batch_size: Rows fetched per round trip
+            
+        Yields:
+            list: Batches of expense dicts with EXPORT_FIELDS keys
+        """
+        query = Expense.query.filter_by(user_id=user_id).join(Category)
+        if filters:
+            query = build_expense_filters(query, filters, user_id)
+        else:
+            query = query.order_by(Expense.date.desc())
+        
+        query = query.with_entities(
+            Expense.id,
+            Expense.date,
+            Expense.description,
+            Expense.amount,
+            Category.name,
+            Expense.category_id,
+            Expense.notes,
+            Expense.receipt_url,
+            Expense.is_recurring,
+            Expense.created_at
+        )
+        
+        result = db.session.execute(
+            query.statement.execution_options(yield_per=batch_size)
+        )
+        
+        for rows in result.partitions():
+            # Tags for the whole batch in one query
+            tags = TagService.get_tag_names([row[0] for row in rows])
+            
+            yield [
+                {
+                    'id': expense_id,
+                    'date': expense_date.isoformat(),
+                    'description': description,
+                    'amount': float(amount),
+                    'category': category_name,
+                    'category_id': category_id,
+                    'tags': tags.get(expense_id, []),
+                    'notes': notes,
+                    'receipt_url': receipt_url,
+                    'is_recurring': is_recurring,
+                    'created_at': created_at.isoformat()
+                }
+                for (expense_id, expense_date, description, amount, category_name, category_id,
+                     notes, receipt_url, is_recurring, created_at) in rows
+            ]
     
     @staticmethod
-    def get_category_expenses(user_id, category_id, page=1, per_page=20):
+    def get_category_expenses(user_id, category_id, page=1, per_page=20, with_total=True, as_rows=True,
+                              fields=None, compact=False):
         """
         Get expenses for a specific category.
         
@@ -235,24 +655,147 @@ class ExpenseService:
             category_id: Category ID
             page: Page number
             per_page: Items per page
+            with_total: Include total item/page counts
+            as_rows: Serialize plain column rows instead of ORM objects
+            fields: Expense fields to return (default: all)
+            compact: Side-load categories (see ``get_user_expenses``)
             
         Returns:
             dict: Paginated expenses
         """
         # Verify category belongs to user
-        category = Category.query.filter_by(
-            id=category_id,
-            user_id=user_id,
-            is_active=True
-        ).first()
-        
-        if not category:
+        if not CategoryService.is_user_category(category_id, user_id):
             raise ValueError('Category not found or access denied')
         
+        side_load = False
+        if compact:
+            fields, side_load = ExpenseService._compact_fields(fields)
+        
         # Get expenses for category
         query = Expense.query.filter_by(
             user_id=user_id,
             category_id=category_id
+        ).join(Category).options(
+            contains_eager(Expense.category)
         ).order_by(Expense.date.desc())
         
-        return paginate_query(query, page, per_page)
+        total = None
+        if with_total:
+            total = ExpenseService._cached_count(
+                user_id, ('category_expenses', user_id, category_id), query
+            )
+        
+        if as_rows:
+            result = paginate_query(
+                query.with_entities(*Expense.row_columns(fields)), page, per_page,
+                with_total=with_total, total=total,
+                serialize=lambda rows: ExpenseService._serialize_rows(rows, fields)
+            )
+        else:
+            result = paginate_query(
+                query, page, per_page, with_total=with_total, total=total,
+                serialize=lambda expenses: [expense.to_dict(fields=fields) for expense in expenses]
+            )
+        
+        return ExpenseService._side_load_categories(result) if side_load else result
+    
+    @staticmethod
+    def _bulk_selection(user_id, ids=None, filters=None):
+        """Query for the user's expenses selected by ID list or filter set."""
+        query = Expense.query.filter(Expense.user_id == user_id)
+        
+        if ids is not None:
+            return query.filter(Expense.id.in_(ids))
+        
+        # Filters may join (e.g. full-text search), so select by ID subquery
+        matched = build_expense_filters(Expense.query.filter(Expense.user_id == user_id), filters or {}, user_id)
+        return query.filter(Expense.id.in_(matched.order_by(None).with_entities(Expense.id)))
+    
+    @staticmethod
+    def _serialize_rows(rows, fields=None):
+        """
+        Serialize rows selected with ``Expense.row_columns(fields)``.
+        
+        Produces the same dicts as ``Expense.to_dict`` without building ORM
+        objects: tags and the page's categories are read with one query
+        each (only if requested), and every category dict is built once.
+        """
+        if not rows:
+            return []
+        
+        wanted = fields if fields is not None else Expense.DEFAULT_FIELDS
+        
+        tags = {}
+        if 'tags' in wanted:
+            tags = TagService.get_tag_names([row.id for row in rows])
+        
+        categories = {}
+        if 'category' in wanted:
+            categories = ExpenseService._get_category_dicts({row.category_id for row in rows})
+        
+        return [
+            Expense.serialize(
+                row,
+                tags.get(row.id, []),
+                categories.get(row.category_id) if categories else None,
+                fields=fields
+            )
+            for row in rows
+        ]
+    
+    @staticmethod
+    def _get_category_dicts(category_ids):
+        """Get {category_id: category dict} for many categories with one query."""
+        if not category_ids:
+            return {}
+        
+        return {
+            row.id: Category.serialize(row)
+            for row in db.session.query(*Category.row_columns()).filter(
+                Category.id.in_(category_ids)
+            )
+        }
+    
+    @staticmethod
+    def _compact_fields(fields):
+        """
+        Replace the embedded category with category_id in a field list.
+        
+        Returns:
+            tuple: (fields, whether categories should be side-loaded)
+        """
+        fields = fields if fields is not None else Expense.DEFAULT_FIELDS
+        if 'category' not in fields:
+            return fields, False
+        
+        compact = []
+        for name in fields:
+            name = 'category_id' if name == 'category' else name
+            if name not in compact:
+                compact.append(name)
+        
+        return compact, True
+    
+    @staticmethod
+    def _side_load_categories(result):
+        """Add a ``categories`` map with each category of a compact page once."""
+        category_dicts = ExpenseService._get_category_dicts(
+            {item['category_id'] for item in result['items']}
+        )
+        result['categories'] = {
+            str(category_id): category for category_id, category in category_dicts.items()
+        }
+        return result
+    
+    @staticmethod
+    def _cached_count(user_id, key, query):
+        """Count rows of a listing query, reusing the user's cached counts."""
+        return expense_count_cache.get_or_set(
+            key, lambda: query.order_by(None).count(), group=user_id, flight=expense_count_flight
+        )
+    
+    @staticmethod
+    def invalidate_user_caches(user_id):
+        """Drop cached data derived from a user's expenses after a write."""
+        expense_count_cache.invalidate(user_id)
+        summary_cache.invalidate(user_id)
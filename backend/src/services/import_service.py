@@ -0,0 +1,258 @@
+from datetime import datetime
+from decimal import Decimal
+from marshmallow import ValidationError
+from sqlalchemy import insert, text
+from src.models.expense import Expense
+from src.models.tag import expense_tags
+from src.config.database import db
+from src.services.category_service import CategoryService
+from src.services.expense_service import ExpenseService
+from src.services.rollup_service import RollupService
+from src.services.tag_service import TagService
+from src.services.version_service import VersionService
+from src.utils.validators import expense_schema
+import csv
+import io
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ImportService:
+    """Service for importing expenses from CSV files."""
+    
+    # Columns copied into the expenses table, in COPY order
+    COPY_COLUMNS = [
+        'id', 'amount', 'description', 'date', 'notes', 'receipt_url', 'is_recurring',
+        'created_at', 'updated_at', 'user_id', 'category_id'
+    ]
+    
+    @staticmethod
+    def import_csv(user_id, stream, batch_size=2000, max_errors=1000):
+        """
+        Import expenses from a CSV stream.
+        
+        The file is read row by row. Each row must have ``date``,
+        ``description``, ``amount`` and either ``category`` (name) or
+        ``category_id``; ``notes``, ``receipt_url``, ``tags`` (comma-separated)
+        and ``is_recurring`` are optional. Category names are resolved from
+        one lookup of the user's categories, case-insensitively; names that
+        differ only in case (e.g. "Food" and "food") are ambiguous and rows
+        using them are rejected. Valid rows are written in batches of
+        ``batch_size`` (COPY on PostgreSQL, executemany elsewhere), each
+        batch in its own transaction. If a batch cannot be written, the
+        import stops: earlier batches stay committed, and the report gives
+        the first line that was not imported under ``failed``.
+        
+        Args:
+            user_id: User ID
+            stream: Binary file-like object with CSV content
+            batch_size: Rows written per transaction
+            max_errors: Maximum rejected rows listed in the report
+        
+        Returns:
+            dict: Import report with imported/rejected counts, errors and,
+            if a batch failed, ``failed``
+        
+        Raises:
+            ValueError: If the header is missing required columns
+        """
+        reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+        columns = {name.strip().lower() for name in (reader.fieldnames or [])}
+        
+        missing = {'date', 'description', 'amount'} - columns
+        if 'category' not in columns and 'category_id' not in columns:
+            missing.add('category')
+        if missing:
+            raise ValueError(f"CSV is missing required columns: {', '.join(sorted(missing))}")
+        
+        # One lookup of the user's categories for the whole import
+        categories = CategoryService.get_active_categories(user_id)
+        category_ids = set(categories)
+        category_names = {}
+        for category in categories.values():
+            name = category.name.strip().lower()
+            # None marks a name shared by several categories
+            category_names[name] = None if name in category_names else category.id
+        
+        report = {'imported': 0, 'rejected': 0, 'errors': []}
+        batch = []
+        batch_line = None
+        
+        # Line 1 is the header
+        for line, raw in enumerate(reader, start=2):
+            row = {
+                (key or '').strip().lower(): value.strip() if isinstance(value, str) else value
+                for key, value in raw.items()
+            }
+            
+            try:
+                data = ImportService._parse_row(row, category_ids, category_names)
+            except ValidationError as err:
+                report['rejected'] += 1
+                if len(report['errors']) < max_errors:
+                    report['errors'].append({'line': line, 'errors': err.messages})
+                continue
+            
+            if not batch:
+                batch_line = line
+            batch.append(data)
+            
+            if len(batch) >= batch_size:
+                if not ImportService._import_batch(user_id, batch, batch_line, report):
+                    return report
+                batch = []
+        
+        if batch:
+            if not ImportService._import_batch(user_id, batch, batch_line, report):
+                return report
+        
+        logger.info(
+            f"Imported {report['imported']} expenses for user {user_id} "
+            f"({report['rejected']} rejected)"
+        )
+        return report
+    
+    @staticmethod
+    def _parse_row(row, category_ids, category_names):
+        """Validate a CSV row with ExpenseSchema and resolve its category."""
+        data = {
+            field: row[field]
+            for field in ('amount', 'description', 'date', 'notes', 'receipt_url', 'is_recurring')
+            if row.get(field)
+        }
+        
+        if row.get('tags'):
+            data['tags'] = TagService.normalize_names(row['tags'])
+        
+        if row.get('category_id'):
+            data['category_id'] = row['category_id']
+        elif row.get('category'):
+            name = row['category'].lower()
+            if name not in category_names:
+                raise ValidationError({'category': [f"Unknown category: {row['category']}"]})
+            if category_names[name] is None:
+                raise ValidationError({
+                    'category': [f"Ambiguous category: {row['category']} matches several categories; use category_id"]
+                })
+            data['category_id'] = category_names[name]
+        
+        data = expense_schema.load(data)
+        
+        if data['category_id'] not in category_ids:
+            raise ValidationError({'category_id': ['Category not found or access denied']})
+        
+        return data
+    
+    @staticmethod
+    def _import_batch(user_id, batch, first_line, report):
+        """Write and count a batch; if it fails, record it in the report and return False."""
+        try:
+            report['imported'] += ImportService._write_batch(user_id, batch)
+            return True
+        except Exception:
+            # _write_batch rolled this batch back; earlier batches stay committed
+            report['failed'] = {
+                'line': first_line,
+                'rows': len(batch),
+                'error': 'Database error while writing rows; rows from this line on were not imported'
+            }
+            logger.error(
+                f"Import for user {user_id} stopped at line {first_line} "
+                f"after {report['imported']} imported expenses"
+            )
+            return False
+    
+    @staticmethod
+    def _write_batch(user_id, batch):
+        """Insert a batch of validated rows in one transaction."""
+        now = datetime.utcnow()
+        rows = [
+            {
+                'amount': Decimal(str(data['amount'])),
+                'description': data['description'],
+                'date': data['date'],
+                'notes': data.get('notes'),
+                'receipt_url': data.get('receipt_url'),
+                'is_recurring': data.get('is_recurring', False),
+                'created_at': now,
+                'updated_at': now,
+                'user_id': user_id,
+                'category_id': data['category_id']
+            }
+            for data in batch
+        ]
+        has_tags = any(data.get('tags') for data in batch)
+        
+        try:
+            connection = db.session.connection()
+            
+            if connection.dialect.name == 'postgresql':
+                expense_ids = ImportService._copy_rows(connection, rows)
+            elif has_tags:
+                # IDs are needed to link tags
+                expense_ids = db.session.scalars(
+                    insert(Expense).returning(Expense.id, sort_by_parameter_order=True),
+                    rows
+                ).all()
+            else:
+                db.session.execute(Expense.__table__.insert(), rows)
+                expense_ids = None
+            
+            if has_tags:
+                tags = {
+                    tag.name: tag
+                    for tag in TagService.resolve_tags(
+                        user_id, [name for data in batch for name in data.get('tags', [])]
+                    )
+                }
+                db.session.flush()
+                
+                db.session.execute(expense_tags.insert(), [
+                    {'expense_id': expense_id, 'tag_id': tags[name].id}
+                    for expense_id, data in zip(expense_ids, batch)
+                    for name in data.get('tags', [])
+                ])
+            
+            RollupService.apply_rows(
+                user_id, [(row['category_id'], row['date'], row['amount']) for row in rows]
+            )
+            
+            VersionService.bump(user_id)
+            db.session.commit()
+            ExpenseService.invalidate_user_caches(user_id)
+            return len(rows)
+        
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to import expense batch: {str(e)}")
+            raise
+    
+    @staticmethod
+    def _copy_rows(connection, rows):
+        """Write rows with PostgreSQL COPY, using pre-allocated IDs."""
+        expense_ids = connection.execute(
+            text("SELECT nextval(pg_get_serial_sequence('expenses', 'id')) FROM generate_series(1, :count)"),
+            {'count': len(rows)}
+        ).scalars().all()
+        
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for expense_id, row in zip(expense_ids, rows):
+            row['id'] = expense_id
+            writer.writerow([
+                '' if row[column] is None else row[column]
+                for column in ImportService.COPY_COLUMNS
+            ])
+        buffer.seek(0)
+        
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY expenses ({', '.join(ImportService.COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
+        
+        return expense_ids
@@ -0,0 +1,448 @@
+from calendar import monthrange
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy.dialects import postgresql, sqlite
+from src.models.expense import Expense
+from src.models.category import Category
+from src.models.expense_rollup import ExpenseRollup, ExpenseRollupState
+from src.models.user import User
+from src.config.database import db
+from src.utils.helpers import parse_date, summarize_expense_tags
+from src.services.version_service import VersionService
+from src.utils.cache import summary_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RollupService:
+    """Service for maintaining and reading monthly expense rollups."""
+
+    @staticmethod
+    def apply_delta(user_id, category_id, expense_date, count_delta, amount_delta):
+        """
+        Add a delta to the rollup row of a month in the current transaction.
+
+        Args:
+            user_id: User ID
+            category_id: Category ID
+            expense_date: Any date within the month
+            count_delta: Change in number of expenses
+            amount_delta: Change in total amount
+        """
+        month = ExpenseRollup.month_of(parse_date(expense_date))
+        amount_delta = Decimal(str(amount_delta))
+        table = ExpenseRollup.__table__
+        dialect = db.session.get_bind().dialect.name
+
+        if dialect in ('postgresql', 'sqlite'):
+            insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+            stmt = insert(table).values(
+                user_id=user_id,
+                category_id=category_id,
+                month=month,
+                expense_count=count_delta,
+                total_amount=amount_delta
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['user_id', 'category_id', 'month'],
+                set_={
+                    'expense_count': table.c.expense_count + count_delta,
+                    'total_amount': table.c.total_amount + amount_delta
+                }
+            )
+            db.session.execute(stmt)
+            return
+
+        # Generic fallback: update the row, create it if missing
+        result = db.session.execute(
+            table.update().where(
+                table.c.user_id == user_id,
+                table.c.category_id == category_id,
+                table.c.month == month
+            ).values(
+                expense_count=table.c.expense_count + count_delta,
+                total_amount=table.c.total_amount + amount_delta
+            )
+        )
+        if result.rowcount == 0:
+            db.session.execute(table.insert().values(
+                user_id=user_id,
+                category_id=category_id,
+                month=month,
+                expense_count=count_delta,
+                total_amount=amount_delta
+            ))
+
+    @staticmethod
+    def add_expense(expense):
+        """Count an expense into its month's rollup."""
+        RollupService.apply_delta(expense.user_id, expense.category_id, expense.date, 1, expense.amount)
+
+    @staticmethod
+    def remove_expense(user_id, category_id, expense_date, amount):
+        """Remove an expense's previous values from its month's rollup."""
+        RollupService.apply_delta(user_id, category_id, expense_date, -1, -Decimal(str(amount)))
+
+    @staticmethod
+    def apply_rows(user_id, rows, sign=1):
+        """
+        Add (or with ``sign=-1`` remove) many expenses, one upsert per month.
+        
+        Args:
+            user_id: User ID
+            rows: Iterable of (category_id, date, amount)
+            sign: 1 to add the expenses, -1 to remove them
+        """
+        deltas = {}
+        for category_id, expense_date, amount in rows:
+            key = (category_id, ExpenseRollup.month_of(parse_date(expense_date)))
+            count, total = deltas.get(key, (0, Decimal('0.00')))
+            deltas[key] = (count + 1, total + Decimal(str(amount)))
+        
+        RollupService.apply_totals(user_id, deltas, sign)
+    
+    @staticmethod
+    def apply_totals(user_id, totals, sign=1):
+        """
+        Add (or with ``sign=-1`` remove) pre-aggregated monthly totals.
+        
+        Args:
+            user_id: User ID
+            totals: Dict of {(category_id, month): (count, total)}
+            sign: 1 to add the totals, -1 to remove them
+        """
+        for (category_id, month), (count, total) in totals.items():
+            RollupService.apply_delta(user_id, category_id, month, sign * count, sign * total)
+    
+    @staticmethod
+    def move_totals(user_id, totals, changes):
+        """
+        Move monthly totals of bulk-updated expenses to their new values.
+        
+        Args:
+            user_id: User ID
+            totals: Dict of {(category_id, month): (count, total)} taken
+                before the update (see ``month_totals``)
+            changes: Dict of new values; ``category_id``, ``date`` and
+                ``amount`` are applied
+        """
+        month = ExpenseRollup.month_of(parse_date(changes['date'])) if changes.get('date') else None
+        amount = Decimal(str(changes['amount'])) if changes.get('amount') is not None else None
+        
+        moved = {}
+        for (category_id, old_month), (count, total) in totals.items():
+            key = (changes.get('category_id', category_id), month or old_month)
+            moved_count, moved_total = moved.get(key, (0, Decimal('0.00')))
+            moved[key] = (moved_count + count, moved_total + (amount * count if amount is not None else total))
+        
+        RollupService.apply_totals(user_id, totals, sign=-1)
+        RollupService.apply_totals(user_id, moved)
+    
+    @staticmethod
+    def month_totals(query):
+        """
+        Aggregate the expenses matched by a query per category and month.
+        
+        Args:
+            query: Expense query (ordering is ignored)
+        
+        Returns:
+            dict: {(category_id, month): (count, total)}
+        """
+        year = db.extract('year', Expense.date)
+        month = db.extract('month', Expense.date)
+        rows = query.order_by(None).with_entities(
+            Expense.category_id,
+            year,
+            month,
+            db.func.count(Expense.id),
+            db.func.sum(Expense.amount)
+        ).group_by(Expense.category_id, year, month).all()
+        
+        return {
+            (category_id, parse_date(f"{int(y):04d}-{int(m):02d}-01")): (count, Decimal(str(total)))
+            for category_id, y, m, count, total in rows
+        }
+    
+    @staticmethod
+    def is_built(user_id):
+        """Check whether a user's rollups were built and can serve summaries."""
+        return db.session.query(
+            ExpenseRollupState.query.filter_by(user_id=user_id).exists()
+        ).scalar()
+    
+    @staticmethod
+    def mark_built(user_id):
+        """
+        Mark a user's rollups as complete in the current transaction.
+        
+        Only valid for users with no expenses yet (e.g. at registration)
+        or right after their rollups were recomputed.
+        """
+        db.session.merge(ExpenseRollupState(user_id=user_id, built_at=datetime.utcnow()))
+    
+    @staticmethod
+    def month_range(filters):
+        """
+        Get the month range a filter set covers, if rollups can serve it.
+
+        Args:
+            filters: Dict of filter parameters (or None)
+
+        Returns:
+            tuple: (first_month, last_month), either may be None for an open
+            range, or None if the filters are not month-aligned
+        """
+        if not filters:
+            return (None, None)
+
+        if filters.get('search') or filters.get('tags'):
+            return None
+
+        start_date = parse_date(filters['start_date']) if filters.get('start_date') else None
+        end_date = parse_date(filters['end_date']) if filters.get('end_date') else None
+
+        if start_date and start_date.day != 1:
+            return None
+
+        if end_date and end_date.day != monthrange(end_date.year, end_date.month)[1]:
+            return None
+
+        return (
+            start_date,
+            ExpenseRollup.month_of(end_date) if end_date else None
+        )
+
+    @staticmethod
+    def get_summary(user_id, filters=None, include_tags=False):
+        """
+        Build expense summary statistics from rollup rows.
+
+        Tag totals are not kept in rollups; ``include_tags`` adds them with
+        a grouped join over the matching expenses.
+
+        Args:
+            user_id: User ID
+            filters: Month-aligned filters (see ``month_range``)
+            include_tags: Add per-tag totals under 'tags'
+
+        Returns:
+            dict: Summary statistics, or None if the filters need a full scan
+            or the user's rollups have not been built yet (see ``rebuild``)
+        """
+        months = RollupService.month_range(filters)
+        if months is None:
+            return None
+        
+        # Rollups of users with expenses from before rollups existed are
+        # incomplete until rebuilt; summaries scan the expenses meanwhile
+        if not RollupService.is_built(user_id):
+            return None
+
+        first_month, last_month = months
+        category_id = (filters or {}).get('category_id')
+
+        query = db.session.query(
+            Category.name,
+            ExpenseRollup.month,
+            ExpenseRollup.expense_count,
+            ExpenseRollup.total_amount
+        ).join(Category, Category.id == ExpenseRollup.category_id).filter(
+            ExpenseRollup.user_id == user_id,
+            ExpenseRollup.expense_count > 0
+        )
+        expense_query = Expense.query.filter(Expense.user_id == user_id)
+
+        if first_month:
+            query = query.filter(ExpenseRollup.month >= first_month)
+            expense_query = expense_query.filter(Expense.date >= first_month)
+        if last_month:
+            query = query.filter(ExpenseRollup.month <= last_month)
+            expense_query = expense_query.filter(Expense.date <= parse_date(filters['end_date']))
+        if category_id:
+            query = query.filter(ExpenseRollup.category_id == category_id)
+            expense_query = expense_query.filter(Expense.category_id == category_id)
+
+        rows = query.all()
+        if not rows:
+            summary = {
+                'total_amount': 0,
+                'total_count': 0,
+                'average_amount': 0,
+                'categories': {},
+                'monthly_totals': {},
+                'date_range': None
+            }
+            if include_tags:
+                summary['tags'] = {}
+            return summary
+
+        total_amount = Decimal('0.00')
+        total_count = 0
+        categories = {}
+        monthly_totals = {}
+
+        for name, month, count, amount in rows:
+            total_amount += amount
+            total_count += count
+
+            category_data = categories.setdefault(name, {'count': 0, 'total_amount': Decimal('0.00')})
+            category_data['count'] += count
+            category_data['total_amount'] += amount
+
+            month_key = month.strftime('%Y-%m')
+            monthly_totals[month_key] = monthly_totals.get(month_key, Decimal('0.00')) + amount
+
+        first_date, last_date = expense_query.with_entities(
+            db.func.min(Expense.date),
+            db.func.max(Expense.date)
+        ).one()
+
+        summary = {
+            'total_amount': float(total_amount),
+            'total_count': total_count,
+            'average_amount': float(total_amount / total_count),
+            'categories': {
+                name: {'count': data['count'], 'total_amount': float(data['total_amount'])}
+                for name, data in sorted(categories.items())
+            },
+            'monthly_totals': {k: float(v) for k, v in sorted(monthly_totals.items())},
+            'date_range': {
+                'start': parse_date(first_date).isoformat(),
+                'end': parse_date(last_date).isoformat()
+            }
+        }
+        if include_tags:
+            summary['tags'] = summarize_expense_tags(expense_query)
+        return summary
+
+    @staticmethod
+    def compute_rollups(user_id=None):
+        """
+        Recompute rollup values from the expenses table.
+
+        Args:
+            user_id: Restrict to one user (optional)
+
+        Returns:
+            dict: {(user_id, category_id, month): (count, total)}
+        """
+        year = db.extract('year', Expense.date)
+        month = db.extract('month', Expense.date)
+        query = db.session.query(
+            Expense.user_id,
+            Expense.category_id,
+            year,
+            month,
+            db.func.count(Expense.id),
+            db.func.sum(Expense.amount)
+        ).group_by(Expense.user_id, Expense.category_id, year, month)
+
+        if user_id is not None:
+            query = query.filter(Expense.user_id == user_id)
+
+        return {
+            (row_user_id, category_id, parse_date(f"{int(y):04d}-{int(m):02d}-01")): (count, Decimal(str(total)))
+            for row_user_id, category_id, y, m, count, total in query.all()
+        }
+
+    @staticmethod
+    def verify(user_id=None):
+        """
+        Compare stored rollups with values recomputed from expenses.
+
+        Args:
+            user_id: Restrict to one user (optional)
+
+        Returns:
+            list: Drift entries with key, stored and expected values
+        """
+        expected = RollupService.compute_rollups(user_id)
+
+        query = ExpenseRollup.query
+        if user_id is not None:
+            query = query.filter_by(user_id=user_id)
+
+        stored = {
+            (rollup.user_id, rollup.category_id, rollup.month): (rollup.expense_count, rollup.total_amount)
+            for rollup in query.all()
+            if rollup.expense_count != 0 or rollup.total_amount != 0
+        }
+
+        drift = []
+        for key in sorted(set(expected) | set(stored)):
+            if expected.get(key) != stored.get(key):
+                drift.append({
+                    'user_id': key[0],
+                    'category_id': key[1],
+                    'month': key[2].strftime('%Y-%m'),
+                    'stored': stored.get(key),
+                    'expected': expected.get(key)
+                })
+
+        return drift
+
+    @staticmethod
+    def rebuild(user_id=None):
+        """
+        Recompute all rollups from scratch.
+
+        Args:
+            user_id: Restrict to one user (optional)
+
+        Returns:
+            int: Number of rollup rows written
+        """
+        try:
+            expected = RollupService.compute_rollups(user_id)
+
+            query = ExpenseRollup.query
+            states = ExpenseRollupState.query
+            if user_id is not None:
+                query = query.filter_by(user_id=user_id)
+                states = states.filter_by(user_id=user_id)
+            query.delete(synchronize_session=False)
+            states.delete(synchronize_session=False)
+
+            if expected:
+                db.session.execute(ExpenseRollup.__table__.insert(), [
+                    {
+                        'user_id': key[0],
+                        'category_id': key[1],
+                        'month': key[2],
+                        'expense_count': count,
+                        'total_amount': total
+                    }
+                    for key, (count, total) in expected.items()
+                ])
+
+            # Rebuilt users (including those without expenses) can serve summaries
+            user_ids = [user_id] if user_id is not None else [
+                row_user_id for (row_user_id,) in db.session.query(User.id)
+            ]
+            if user_ids:
+                built_at = datetime.utcnow()
+                db.session.execute(ExpenseRollupState.__table__.insert(), [
+                    {'user_id': row_user_id, 'built_at': built_at} for row_user_id in user_ids
+                ])
+            
+            # Summaries served before the rebuild may have come from drifted rows
+            for row_user_id in user_ids:
+                VersionService.bump(row_user_id)
+            
+            db.session.commit()
+            
+            # Summaries may have been built from the drifted rows
+            if user_id is None:
+                summary_cache.invalidate_all()
+            else:
+                summary_cache.invalidate(user_id)
+
+            logger.info(f"Rebuilt {len(expected)} expense rollups")
+            return len(expected)
+
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to rebuild expense rollups: {str(e)}")
+            raise
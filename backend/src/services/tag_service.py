@@ -0,0 +1,167 @@
+from src.models.expense import Expense
+from src.models.tag import Tag, expense_tags
+from src.config.database import db
+from src.services.version_service import VersionService
+from src.utils.cache import expense_count_cache, summary_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TagService:
+    """Service for managing expense tags."""
+    
+    @staticmethod
+    def normalize_names(names):
+        """
+        Clean a list (or comma-separated string) of tag names.
+        
+        Args:
+            names: List of tag names or comma-separated string
+        
+        Returns:
+            list: Stripped, non-empty, de-duplicated names in input order
+        """
+        if not names:
+            return []
+        
+        if isinstance(names, str):
+            names = names.split(',')
+        
+        normalized = []
+        for name in names:
+            name = str(name).strip()[:50]
+            if name and name not in normalized:
+                normalized.append(name)
+        
+        return normalized
+    
+    @staticmethod
+    def resolve_tags(user_id, names):
+        """
+        Get the user's Tag objects for names, creating missing ones.
+        
+        Existing tags are looked up with one IN query; new tags are added to
+        the current session and written with the caller's transaction.
+        
+        Args:
+            user_id: User ID
+            names: List of tag names or comma-separated string
+        
+        Returns:
+            list: Tag objects in input order
+        """
+        names = TagService.normalize_names(names)
+        if not names:
+            return []
+        
+        existing = {
+            tag.name: tag
+            for tag in Tag.query.filter(Tag.user_id == user_id, Tag.name.in_(names)).all()
+        }
+        
+        tags = []
+        for name in names:
+            tag = existing.get(name)
+            if tag is None:
+                tag = Tag(name=name, user_id=user_id)
+                db.session.add(tag)
+                existing[name] = tag
+            tags.append(tag)
+        
+        return tags
+    
+    @staticmethod
+    def get_user_tags(user_id):
+        """
+        Get all tags for a user.
+        
+        Args:
+            user_id: User ID
+        
+        Returns:
+            list: List of tags ordered by name
+        """
+        return Tag.query.filter_by(user_id=user_id).order_by(Tag.name).all()
+    
+    @staticmethod
+    def get_tag_names(expense_ids):
+        """
+        Get tag names for many expenses with one query.
+        
+        Args:
+            expense_ids: List of expense IDs
+        
+        Returns:
+            dict: {expense_id: [tag names ordered by name]}
+        """
+        if not expense_ids:
+            return {}
+        
+        names = {}
+        for expense_id, name in db.session.query(
+            expense_tags.c.expense_id, Tag.name
+        ).join(Tag, Tag.id == expense_tags.c.tag_id).filter(
+            expense_tags.c.expense_id.in_(expense_ids)
+        ).order_by(Tag.name):
+            names.setdefault(expense_id, []).append(name)
+        
+        return names
+    
+    @staticmethod
+    def migrate_legacy_tags(batch_size=1000):
+        """
+        Move comma-separated ``expenses.tags`` values into the tags tables.
+        
+        Processes expenses in batches, committing after each one, and clears
+        the legacy column once an expense's tags have been moved.
+        
+        Args:
+            batch_size: Expenses per transaction
+        
+        Returns:
+            int: Number of expenses migrated
+        """
+        migrated = 0
+        
+        while True:
+            expenses = Expense.query.filter(
+                Expense.legacy_tags.isnot(None)
+            ).order_by(Expense.id).limit(batch_size).all()
+            
+            if not expenses:
+                break
+            
+            try:
+                tag_cache = {}
+                for expense in expenses:
+                    tags = []
+                    for name in TagService.normalize_names(expense.legacy_tags):
+                        key = (expense.user_id, name)
+                        if key not in tag_cache:
+                            tag_cache[key] = TagService.resolve_tags(expense.user_id, [name])[0]
+                        tag = tag_cache[key]
+                        if tag not in expense.tags and tag not in tags:
+                            tags.append(tag)
+                    
+                    expense.tags = expense.tags + tags
+                    expense.legacy_tags = None
+                
+                user_ids = {expense.user_id for expense in expenses}
+                for user_id in user_ids:
+                    VersionService.bump(user_id)
+                
+                db.session.commit()
+                
+                for user_id in user_ids:
+                    expense_count_cache.invalidate(user_id)
+                    summary_cache.invalidate(user_id)
+                migrated += len(expenses)
+                logger.info(f"Migrated tags for {migrated} expenses")
+            
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Failed to migrate legacy tags: {str(e)}")
+                raise
+        
+        return migrated
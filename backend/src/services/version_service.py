@@ -0,0 +1,57 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from src.models.data_version import DataVersion
+from src.config.database import db
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class VersionService:
+    """Service for per-user data versions, used to validate cached responses."""
+    
+    @staticmethod
+    def get_version(user_id):
+        """
+        Get the current data version of a user.
+        
+        Args:
+            user_id: User ID
+        
+        Returns:
+            int: Data version (0 if the user never wrote anything)
+        """
+        version = db.session.query(DataVersion.version).filter(
+            DataVersion.user_id == user_id
+        ).scalar()
+        return version or 0
+    
+    @staticmethod
+    def bump(user_id):
+        """
+        Increment a user's data version in the current transaction.
+        
+        Call before committing any write that changes what the user's GET
+        endpoints return, so the new version commits with the data.
+        
+        Args:
+            user_id: User ID
+        """
+        table = DataVersion.__table__
+        dialect = db.session.get_bind().dialect.name
+        
+        if dialect in ('postgresql', 'sqlite'):
+            insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+            stmt = insert(table).values(user_id=user_id, version=1)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['user_id'],
+                set_={'version': table.c.version + 1}
+            )
+            db.session.execute(stmt)
+            return
+        
+        # Generic fallback: update the row, create it if missing
+        result = db.session.execute(
+            table.update().where(table.c.user_id == user_id).values(version=table.c.version + 1)
+        )
+        if result.rowcount == 0:
+            db.session.execute(table.insert().values(user_id=user_id, version=1))
@@ -4,20 +4,28 @@ from .validators import (
     user_login_schema, 
     category_schema,
     expense_schema,
-    expense_query_schema
+    expense_query_schema,
+    expense_export_schema,
+    expense_summary_schema,
+    expense_selection_schema,
+    expense_bulk_update_schema
 )
 from .decorators import (
     validate_json,
     validate_query_params,
     auth_required,
     handle_db_errors,
-    log_api_calls
+    log_api_calls,
+    conditional_get
 )
 from .helpers import (
     format_currency,
     parse_date,
+    parse_fields,
     paginate_query,
+    keyset_paginate_query,
     generate_expense_summary,
+    summarize_expense_query,
     build_expense_filters
 )
 
@@ -27,14 +35,22 @@ __all__ = [
     'category_schema', 
     'expense_schema',
     'expense_query_schema',
+    'expense_export_schema',
+    'expense_summary_schema',
+    'expense_selection_schema',
+    'expense_bulk_update_schema',
     'validate_json',
     'validate_query_params',
     'auth_required',
     'handle_db_errors',
     'log_api_calls',
+    'conditional_get',
     'format_currency',
     'parse_date',
+    'parse_fields',
     'paginate_query',
+    'keyset_paginate_query',
     'generate_expense_summary',
+    'summarize_expense_query',
     'build_expense_filters'
 ]
@@ -0,0 +1,388 @@
+from collections import OrderedDict
+from threading import RLock
+from src.utils.cache_backends import create_cache_backend
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Sentinel for cache misses (None is a valid cached value)
+MISSING = object()
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU cache with optional TTL.
+
+    Entries can be tagged with a group (normally a user ID) so that every
+    entry belonging to that user can be invalidated at once.
+    
+    When attached to a distributed backend (see ``cache_backends``), the
+    cache is the first level of a two-level cache: local misses are looked
+    up in the backend's shared store, and invalidations are published so
+    other workers drop their copies.
+    
+    Every invalidation advances a generation counter. A value computed
+    while its group was invalidated is stale, so ``set`` skips it when
+    given the ``generation()`` read before computing.
+    """
+
+    def __init__(self, name, max_size=1024, ttl=None, enabled=True):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries = OrderedDict()  # key -> (value, expires_at, group)
+        self._groups = {}  # group -> set of keys
+        self._generation = 0
+        self._group_generations = {}  # group -> generation of its last invalidation
+        self._cleared_generation = 0  # generation of the last clear
+        self._lock = RLock()
+        self.backend = None
+        self.shared = False
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def configure(self, max_size=None, ttl=MISSING, enabled=None):
+        """Update cache limits; shrinking or disabling drops entries."""
+        with self._lock:
+            if max_size is not None:
+                self.max_size = max_size
+            if ttl is not MISSING:
+                self.ttl = ttl
+            if enabled is not None:
+                self.enabled = enabled
+
+            if not self.enabled:
+                self.clear()
+            while len(self._entries) > self.max_size:
+                self._evict_oldest()
+
+    def attach(self, backend, shared=True):
+        """
+        Connect the cache to a cache backend.
+        
+        Args:
+            backend: Backend from ``create_cache_backend`` (or None)
+            shared: Also keep entries in the backend's shared store
+        """
+        with self._lock:
+            self.backend = backend
+            self.shared = shared and backend is not None and backend.distributed
+    
+    def generation(self):
+        """Get the invalidation generation, to pass to ``set`` for a value about to be computed."""
+        with self._lock:
+            return self._generation
+    
+    def get(self, key, default=MISSING):
+        """Get a cached value, or ``default`` if missing or expired."""
+        if not self.enabled:
+            return default
+
+        with self._lock:
+            generation = self._generation
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+                self._remove(key)
+                entry = None
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        
+        shared_entry = self._get_shared(key)
+        
+        with self._lock:
+            if shared_entry is None:
+                self.misses += 1
+                return default
+
+            value, group, expires_at = shared_entry
+            if not self._invalidated_since(group, generation):
+                self._store(key, value, group, self._local_expiry(expires_at))
+            self.hits += 1
+            self.shared_hits += 1
+            return value
+
+    def set(self, key, value, group=None, ttl=MISSING, since=None, generation=None):
+        """
+        Cache a value, evicting the least recently used entries if full.
+        
+        ``generation`` and ``since`` are the ``generation()`` and
+        ``time.time()`` read before computing the value: it is not cached
+        if its group was invalidated in the meantime, in this worker
+        (generation) or by another one (since, checked by the shared store).
+        """
+        if not self.enabled:
+            return
+
+        ttl = self.ttl if ttl is MISSING else ttl
+
+        with self._lock:
+            if generation is not None and self._invalidated_since(group, generation):
+                return
+            self._store(key, value, group, time.monotonic() + ttl if ttl else None)
+
+        if self.shared:
+            try:
+                self.backend.set(
+                    self.name, key, value, group=group,
+                    expires_at=time.time() + ttl if ttl else None, since=since
+                )
+            except Exception as e:
+                logger.warning(f"Failed to store {self.name} cache entry in shared backend: {str(e)}")
+
+    def get_or_set(self, key, factory, group=None, flight=None):
+        """
+        Get a cached value, computing and caching it on a miss.
+
+        With a ``SingleFlight``, concurrent misses for the same key share
+        one computation, as long as its group was not invalidated since it
+        started: later callers then start a new one rather than wait for a
+        value read before the write.
+        """
+        value = self.get(key)
+        if value is not MISSING:
+            return value
+        
+        def compute():
+            generation = self.generation()
+            started = time.time()
+            value = factory()
+            self.set(key, value, group=group, since=started, generation=generation)
+            return value
+        
+        if flight is None:
+            return compute()
+        
+        return flight.do((self.name, key, self._group_generation(group)), compute)
+
+    def delete(self, key):
+        """Remove a single entry."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate(self, group):
+        """Remove every entry tagged with ``group``, in all workers."""
+        self.invalidate_local(group)
+        self._publish(group)
+    
+    def invalidate_local(self, group):
+        """Remove every entry tagged with ``group`` from this worker only."""
+        with self._lock:
+            self._generation += 1
+            self._group_generations[group] = self._generation
+            if len(self._group_generations) > self.max_size:
+                # Bound the bookkeeping: values being computed now are
+                # treated as if the whole cache was invalidated
+                self._group_generations.clear()
+                self._cleared_generation = self._generation
+            
+            keys = self._groups.pop(group, ())
+            for key in keys:
+                self._entries.pop(key, None)
+            if keys:
+                self.invalidations += 1
+
+    def invalidate_all(self):
+        """Remove all entries, in all workers."""
+        self.clear()
+        self._publish(None)
+    
+    def clear(self):
+        """Remove all entries from this worker."""
+        with self._lock:
+            self._generation += 1
+            self._cleared_generation = self._generation
+            self._group_generations.clear()
+            self._entries.clear()
+            self._groups.clear()
+
+    def stats(self):
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'enabled': self.enabled,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'shared': self.shared,
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+    
+    def _group_generation(self, group):
+        """Get the generation of the last invalidation covering ``group``."""
+        with self._lock:
+            return max(self._cleared_generation, self._group_generations.get(group, 0))
+    
+    def _invalidated_since(self, group, generation):
+        """Check whether ``group`` was invalidated after ``generation`` (call with the lock held)."""
+        if self._cleared_generation > generation:
+            return True
+        return group is not None and self._group_generations.get(group, 0) > generation
+    
+    def _store(self, key, value, group, expires_at):
+        if key in self._entries:
+            self._remove(key)
+        
+        self._entries[key] = (value, expires_at, group)
+        if group is not None:
+            self._groups.setdefault(group, set()).add(key)
+        
+        while len(self._entries) > self.max_size:
+            self._evict_oldest()
+    
+    def _get_shared(self, key):
+        if not self.shared:
+            return None
+        
+        try:
+            return self.backend.get(self.name, key)
+        except Exception as e:
+            logger.warning(f"Failed to read {self.name} cache entry from shared backend: {str(e)}")
+            return None
+    
+    def _publish(self, group):
+        if self.backend is None or not self.backend.distributed:
+            return
+        
+        try:
+            self.backend.publish(self.name, group)
+        except Exception as e:
+            logger.error(f"Failed to publish {self.name} cache invalidation: {str(e)}")
+    
+    @staticmethod
+    def _local_expiry(expires_at):
+        """Convert a shared (wall clock) expiry time to a local monotonic one."""
+        if expires_at is None:
+            return None
+        return time.monotonic() + max(expires_at - time.time(), 0)
+
+    def _remove(self, key):
+        _, _, group = self._entries.pop(key)
+        if group is not None:
+            keys = self._groups.get(group)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._groups[group]
+
+    def _evict_oldest(self):
+        key = next(iter(self._entries))
+        self._remove(key)
+        self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f'<LRUCache {self.name}: {len(self._entries)}/{self.max_size}>'
+
+
+# Application caches
+expense_count_cache = LRUCache('expense_counts', max_size=4096, ttl=300)
+category_cache = LRUCache('categories', max_size=1024, ttl=600)
+summary_cache = LRUCache('summaries', max_size=1024, ttl=300)
+user_cache = LRUCache('users', max_size=4096, ttl=300)
+
+caches = {
+    'expense_counts': expense_count_cache,
+    'categories': category_cache,
+    'summaries': summary_cache,
+    'users': user_cache,
+}
+
+
+# Backend shared by all caches (set by init_caches)
+_backend = None
+
+
+def init_caches(app):
+    """
+    Configure application caches from app config.
+
+    Each cache reads ``CACHE_<NAME>_SIZE``, ``CACHE_<NAME>_TTL``,
+    ``CACHE_<NAME>_ENABLED`` and ``CACHE_<NAME>_SHARED``; ``CACHE_ENABLED``
+    turns all of them off. ``CACHE_BACKEND`` selects the backend; with a
+    distributed one, each request first applies the invalidations other
+    workers published (at most every ``CACHE_SYNC_INTERVAL`` seconds).
+    """
+    global _backend
+    
+    enabled = app.config.get('CACHE_ENABLED', True)
+    
+    if _backend is not None:
+        _backend.close()
+    _backend = create_cache_backend(app)
+
+    for name, cache in caches.items():
+        prefix = f'CACHE_{name.upper()}'
+        cache.configure(
+            max_size=app.config.get(f'{prefix}_SIZE', cache.max_size),
+            ttl=app.config.get(f'{prefix}_TTL', cache.ttl),
+            enabled=enabled and app.config.get(f'{prefix}_ENABLED', True)
+        )
+        cache.attach(_backend, shared=app.config.get(f'{prefix}_SHARED', True))
+        cache.clear()
+
+    if _backend.distributed:
+        interval = app.config.get('CACHE_SYNC_INTERVAL', 0)
+        next_sync = [0.0]
+        
+        @app.before_request
+        def sync_cache_invalidations():
+            now = time.monotonic()
+            if now >= next_sync[0]:
+                next_sync[0] = now + interval
+                sync_caches()
+    
+    logger.info(
+        f"Configured caches: {', '.join(caches)} "
+        f"(enabled={enabled}, backend={_backend.name})"
+    )
+
+
+def sync_caches():
+    """
+    Apply cache invalidations published by other workers.
+    
+    Returns:
+        int: Number of events applied
+    """
+    if _backend is None or not _backend.distributed:
+        return 0
+    
+    try:
+        events = _backend.poll()
+    except Exception as e:
+        logger.warning(f"Failed to poll cache invalidations: {str(e)}")
+        return 0
+    
+    for name, group in events:
+        cache = caches.get(name)
+        if cache is None:
+            continue
+        if group is None:
+            cache.clear()
+        else:
+            cache.invalidate_local(group)
+    
+    return len(events)
+
+
+def get_cache_stats():
+    """Get statistics for all application caches."""
+    return {name: cache.stats() for name, cache in caches.items()}
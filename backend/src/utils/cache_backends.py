@@ -0,0 +1,278 @@
+from threading import Lock
+import json
+import os
+import pickle
+import sqlite3
+import time
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LocalCacheBackend:
+    """
+    Backend for a single process: no shared store, no invalidation events.
+    
+    This is the default; the in-process LRU caches work on their own.
+    """
+    
+    name = 'local'
+    distributed = False
+    
+    def get(self, cache_name, key):
+        """Get a shared entry as (value, group, expires_at), or None."""
+        return None
+    
+    def set(self, cache_name, key, value, group=None, expires_at=None, since=None):
+        """Store a shared entry."""
+    
+    def publish(self, cache_name, group):
+        """Drop shared entries of a group and tell other workers to drop theirs."""
+    
+    def poll(self):
+        """Get invalidation events published by other workers since the last poll."""
+        return []
+    
+    def close(self):
+        """Release resources."""
+
+
+class SQLiteCacheBackend(LocalCacheBackend):
+    """
+    Shared cache store and invalidation bus in a local SQLite file.
+    
+    Lets several worker processes on one machine share cache entries and
+    invalidation events without an external service. Entries are pickled,
+    so the file and its directory must be owned by the application's user
+    and not writable by anyone else; the backend refuses them otherwise
+    (see ``check_permissions``). Each published
+    invalidation is a row in ``cache_events``; workers poll for rows newer
+    than the last one they saw. Events and expired entries older than
+    ``retention`` seconds are pruned. The connection is opened lazily in
+    each process, so the backend survives forking workers after app
+    creation.
+    """
+    
+    name = 'sqlite'
+    distributed = True
+    
+    # Publishes between pruning runs
+    PRUNE_EVERY = 1000
+    
+    def __init__(self, path, retention=3600):
+        self.path = path
+        self.retention = retention
+        self._lock = Lock()
+        self._publishes = 0
+        self._pid = None
+        self._connection = None
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        
+        # Create the file private to this user before SQLite creates it
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+        self.check_permissions(directory, path)
+        
+        with self._lock:
+            self._connect()
+    
+    @staticmethod
+    def check_permissions(*paths):
+        """
+        Refuse paths another user could write to.
+        
+        Anyone able to write the cache file, or to replace it or its WAL
+        files in the directory, could run code in every worker through a
+        crafted pickle.
+        
+        Raises:
+            PermissionError: If a path is not owned by this process's user
+                or is group- or world-writable
+        """
+        if not hasattr(os, 'getuid'):
+            return
+        
+        for path in paths:
+            info = os.stat(path)
+            if info.st_uid != os.getuid():
+                raise PermissionError(f"Cache path {path} is not owned by the application's user")
+            if info.st_mode & 0o022:
+                raise PermissionError(f"Cache path {path} is writable by other users")
+    
+    def _connect(self):
+        """Open this process's connection and create the tables if needed."""
+        self._pid = os.getpid()
+        self.origin = uuid.uuid4().hex
+        self._connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS cache_entries ('
+            'cache TEXT NOT NULL, key TEXT NOT NULL, grp TEXT, value BLOB NOT NULL, '
+            'expires_at REAL, PRIMARY KEY (cache, key))'
+        )
+        self._connection.execute('CREATE INDEX IF NOT EXISTS ix_cache_entries_grp ON cache_entries (cache, grp)')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS cache_events ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, origin TEXT NOT NULL, cache TEXT NOT NULL, '
+            'grp TEXT, created_at REAL NOT NULL)'
+        )
+        self._connection.execute(
+            'CREATE INDEX IF NOT EXISTS ix_cache_events_grp ON cache_events (cache, grp, created_at)'
+        )
+        
+        # Only events published after this worker started matter
+        self._last_event_id = self._connection.execute(
+            'SELECT COALESCE(MAX(id), 0) FROM cache_events'
+        ).fetchone()[0]
+    
+    def _db(self):
+        """Get the connection, reopening it in a forked process (call with the lock held)."""
+        if self._pid != os.getpid():
+            self._connect()
+        return self._connection
+    
+    @staticmethod
+    def _encode_group(group):
+        return None if group is None else json.dumps(group)
+    
+    def get(self, cache_name, key):
+        with self._lock:
+            row = self._db().execute(
+                'SELECT value, grp, expires_at FROM cache_entries WHERE cache = ? AND key = ?',
+                (cache_name, repr(key))
+            ).fetchone()
+        
+        if row is None or (row[2] is not None and row[2] <= time.time()):
+            return None
+        
+        return pickle.loads(row[0]), (None if row[1] is None else json.loads(row[1])), row[2]
+    
+    def set(self, cache_name, key, value, group=None, expires_at=None, since=None):
+        """
+        Store a shared entry.
+        
+        With ``since`` (a ``time.time()`` taken before the value was
+        computed), the entry is skipped if its group was invalidated in the
+        meantime, so a value read before another worker's write cannot
+        overwrite the invalidation.
+        """
+        grp = self._encode_group(group)
+        params = (cache_name, repr(key), grp, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires_at)
+        
+        with self._lock:
+            connection = self._db()
+            if since is None or group is None:
+                connection.execute(
+                    'INSERT OR REPLACE INTO cache_entries (cache, key, grp, value, expires_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    params
+                )
+            else:
+                connection.execute(
+                    'INSERT OR REPLACE INTO cache_entries (cache, key, grp, value, expires_at) '
+                    'SELECT ?, ?, ?, ?, ? WHERE NOT EXISTS ('
+                    'SELECT 1 FROM cache_events WHERE cache = ? AND (grp = ? OR grp IS NULL) AND created_at >= ?)',
+                    params + (cache_name, grp, since)
+                )
+    
+    def publish(self, cache_name, group):
+        """Drop shared entries of a group (all entries if None) and record the event."""
+        grp = self._encode_group(group)
+        now = time.time()
+        
+        with self._lock:
+            connection = self._db()
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                if group is None:
+                    connection.execute('DELETE FROM cache_entries WHERE cache = ?', (cache_name,))
+                else:
+                    connection.execute(
+                        'DELETE FROM cache_entries WHERE cache = ? AND grp = ?', (cache_name, grp)
+                    )
+                connection.execute(
+                    'INSERT INTO cache_events (origin, cache, grp, created_at) VALUES (?, ?, ?, ?)',
+                    (self.origin, cache_name, grp, now)
+                )
+                connection.execute('COMMIT')
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+            
+            self._publishes += 1
+            if self._publishes % self.PRUNE_EVERY == 0:
+                self._prune(connection, now)
+    
+    def poll(self):
+        """
+        Get events published by other workers since the last poll.
+        
+        Returns:
+            list: (cache name, group) tuples; group None means the whole cache
+        """
+        with self._lock:
+            rows = self._db().execute(
+                'SELECT id, origin, cache, grp FROM cache_events WHERE id > ? ORDER BY id',
+                (self._last_event_id,)
+            ).fetchall()
+            if rows:
+                self._last_event_id = rows[-1][0]
+        
+        return [
+            (cache_name, None if grp is None else json.loads(grp))
+            for _, origin, cache_name, grp in rows
+            if origin != self.origin
+        ]
+    
+    def _prune(self, connection, now):
+        cutoff = now - self.retention
+        connection.execute('DELETE FROM cache_events WHERE created_at < ?', (cutoff,))
+        connection.execute(
+            'DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at < ?', (now,)
+        )
+    
+    def close(self):
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+            self._pid = None
+    
+    def __repr__(self):
+        return f'<SQLiteCacheBackend {self.path}>'
+
+
+CACHE_BACKENDS = {
+    'local': LocalCacheBackend,
+    'sqlite': SQLiteCacheBackend,
+}
+
+
+def create_cache_backend(app):
+    """
+    Create the cache backend selected by ``CACHE_BACKEND``.
+    
+    Args:
+        app: Flask application
+    
+    Returns:
+        LocalCacheBackend: Backend instance
+    
+    Raises:
+        ValueError: If the backend name is unknown
+        PermissionError: If the SQLite cache path is writable by other users
+    """
+    name = (app.config.get('CACHE_BACKEND') or 'local').lower()
+    
+    if name not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown cache backend: {name}")
+    
+    if name == 'sqlite':
+        return SQLiteCacheBackend(
+            app.config.get('CACHE_SQLITE_PATH') or os.path.join(app.instance_path, 'cache.sqlite3'),
+            retention=app.config.get('CACHE_EVENT_RETENTION', 3600)
+        )
+    
+    return CACHE_BACKENDS[name]()
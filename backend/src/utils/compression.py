@@ -0,0 +1,138 @@
+from flask import request
+import zlib
+import logging
+
+try:
+    import brotli
+except ImportError:  # Optional; responses fall back to gzip without it
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Content types worth compressing
+DEFAULT_MIMETYPES = (
+    'application/json',
+    'application/x-ndjson',
+    'text/csv',
+    'text/html',
+    'text/plain',
+)
+
+
+class GzipCompressor:
+    """Incremental gzip compressor."""
+    
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    
+    def compress(self, data):
+        """Compress a chunk and flush it so the client can decode it now."""
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self):
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    """Incremental brotli compressor."""
+    
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+    
+    def compress(self, data):
+        """Compress a chunk and flush it so the client can decode it now."""
+        return self._compressor.process(data) + self._compressor.flush()
+    
+    def finish(self):
+        return self._compressor.finish()
+
+
+def choose_encoding(accept_encodings):
+    """
+    Pick a content encoding the client accepts.
+    
+    Args:
+        accept_encodings: Parsed Accept-Encoding header
+    
+    Returns:
+        str: 'br', 'gzip' or None
+    """
+    gzip_quality = accept_encodings.quality('gzip')
+    
+    if brotli is not None:
+        br_quality = accept_encodings.quality('br')
+        if br_quality and br_quality >= gzip_quality:
+            return 'br'
+    
+    return 'gzip' if gzip_quality else None
+
+
+def make_compressor(app, encoding):
+    """Create a compressor for an encoding using the app's levels."""
+    if encoding == 'br':
+        return BrotliCompressor(app.config.get('COMPRESSION_BROTLI_QUALITY', 4))
+    return GzipCompressor(app.config.get('COMPRESSION_LEVEL', 6))
+
+
+def compress_stream(chunks, compressor):
+    """Compress a response body iterable chunk by chunk."""
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if chunk:
+                yield compressor.compress(chunk)
+        yield compressor.finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def init_compression(app):
+    """
+    Compress responses negotiated via Accept-Encoding.
+    
+    Uses brotli when installed and preferred by the client, gzip
+    otherwise. Buffered responses are compressed once they reach
+    ``COMPRESSION_MIN_SIZE`` bytes; streamed responses (e.g. exports) are
+    compressed chunk by chunk as they are sent, without buffering.
+    """
+    if not app.config.get('COMPRESSION_ENABLED', True):
+        logger.info("Response compression disabled")
+        return
+    
+    mimetypes = set(app.config.get('COMPRESSION_MIMETYPES', DEFAULT_MIMETYPES))
+    min_size = app.config.get('COMPRESSION_MIN_SIZE', 1024)
+    
+    @app.after_request
+    def compress_response(response):
+        if (
+            response.mimetype not in mimetypes
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+        ):
+            return response
+        
+        response.vary.add('Accept-Encoding')
+        
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+        
+        if response.is_streamed:
+            response.response = compress_stream(response.response, make_compressor(app, encoding))
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            
+            compressor = make_compressor(app, encoding)
+            response.set_data(compressor.compress(data) + compressor.finish())
+        
+        response.headers['Content-Encoding'] = encoding
+        return response
+    
+    logger.info(f"Response compression enabled (brotli={'yes' if brotli is not None else 'no'})")
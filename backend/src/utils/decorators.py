@@ -1,7 +1,8 @@
 from functools import wraps
-from flask import request, jsonify, current_app
+from flask import request, jsonify, current_app, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from marshmallow import ValidationError
+import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
@@ -156,3 +157,38 @@ def log_api_calls(f):
             raise
     
     return decorated_function
+
+
+def conditional_get(f):
+    """
+    Decorator adding ETag/If-None-Match support to GET endpoints.
+    
+    The ETag is derived from the user's data version plus the path and
+    query parameters, so a matching If-None-Match is answered with 304
+    after a single version lookup, without running the view. Must be
+    applied below ``auth_required``.
+    """
+    
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        from src.services.version_service import VersionService
+        
+        user_id = kwargs['current_user_id']
+        version = VersionService.get_version(user_id)
+        params = '&'.join(f'{key}={value}' for key, value in sorted(request.args.items(multi=True)))
+        etag = hashlib.sha1(f'{user_id}:{version}:{request.path}?{params}'.encode()).hexdigest()
+        
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        
+        # Weak: compressed and uncompressed bodies share the tag
+        response.set_etag(etag, weak=True)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+    
+    return decorated_function
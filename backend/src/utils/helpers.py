@@ -1,7 +1,12 @@
 from datetime import datetime, date
 from decimal import Decimal
+from math import ceil
 from flask_sqlalchemy import BaseQuery
 from src.config.database import db
+from src.utils.search import apply_expense_search
+import base64
+import binascii
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -236,7 +241,8 @@ def sanitize_filename(filename):
     return sanitized
 
 
-def paginate_query(query, page, per_page, max_per_page=100):
+def paginate_query(query, page, per_page, max_per_page=100, with_total=True, total=None,
+                   serialize=None):
     """
     Paginate a SQLAlchemy query.
     
@@ -245,32 +251,226 @@ def paginate_query(query, page, per_page, max_per_page=100):
         page: Page number (1-based)
         per_page: Items per page
         max_per_page: Maximum items per page
+        with_total: Count matching rows for total_items/total_pages
+        total: Known total (e.g. from a cache), skips the count query
+        serialize: Function turning the page's rows into a list of dicts
+            (default: each row's ``to_dict()``)
     
     Returns:
         dict: Pagination result with items and metadata
     """
     # Validate parameters
     page = max(1, page)
-    per_page = min(per_page, max_per_page)
+    per_page = min(max(1, per_page), max_per_page)
     
-    # Execute pagination
-    paginated = query.paginate(
-        page=page,
-        per_page=per_page,
-        error_out=False
-    )
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(per_page + 1).offset((page - 1) * per_page).all()
+    has_next = len(rows) > per_page
+    
+    total_pages = None
+    if with_total:
+        if total is None:
+            total = query.order_by(None).count()
+        total_pages = int(ceil(total / per_page)) if total else 0
+    else:
+        total = None
+    
+    rows = rows[:per_page]
     
     return {
-        'items': [item.to_dict() for item in paginated.items],
+        'items': serialize(rows) if serialize else [item.to_dict() for item in rows],
         'pagination': {
-            'current_page': paginated.page,
-            'total_pages': paginated.pages,
-            'total_items': paginated.total,
-            'per_page': paginated.per_page,
-            'has_next': paginated.has_next,
-            'has_prev': paginated.has_prev,
-            'next_page': paginated.next_num if paginated.has_next else None,
-            'prev_page': paginated.prev_num if paginated.has_prev else None
+            'current_page': page,
+            'total_pages': total_pages,
+            'total_items': total,
+            'per_page': per_page,
+            'has_next': has_next,
+            'has_prev': page > 1,
+            'next_page': page + 1 if has_next else None,
+            'prev_page': page - 1 if page > 1 else None
+        }
+    }
+
+
+def parse_fields(value, allowed):
+    """
+    Parse a comma-separated ``fields`` (sparse fieldset) parameter.
+    
+    Args:
+        value: Raw parameter value (or None)
+        allowed: Field names that can be requested
+    
+    Returns:
+        list: Requested names in order without duplicates, or None if no
+        fields were requested
+    
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    if not value:
+        return None
+    
+    names = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    if not names:
+        return None
+    
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(allowed)})"
+        )
+    
+    return names
+
+
+def count_cache_key(scope, filters=None):
+    """
+    Build a cache key for a filtered count or summary.
+    
+    Sorting and pagination parameters don't change the result, so they
+    are left out of the key.
+    
+    Args:
+        scope: Tuple identifying the listing (e.g. ('expenses', user_id))
+        filters: Dict of filter parameters
+    
+    Returns:
+        tuple: Hashable cache key
+    """
+    ignored = {'sort_by', 'sort_order', 'page', 'per_page', 'with_total', 'pagination', 'cursor'}
+    normalized = tuple(sorted(
+        (name, str(value)) for name, value in (filters or {}).items()
+        if name not in ignored and value not in (None, '')
+    ))
+    return scope + (normalized,)
+
+
+def encode_cursor(sort_by, sort_order, sort_value, last_id):
+    """
+    Encode the position after a row as an opaque pagination cursor.
+    
+    Args:
+        sort_by: Name of the sort field
+        sort_order: Sort order (asc, desc)
+        sort_value: Sort field value of the last row
+        last_id: ID of the last row
+    
+    Returns:
+        str: URL-safe cursor token
+    """
+    if isinstance(sort_value, (date, datetime)):
+        sort_value = sort_value.isoformat()
+    elif isinstance(sort_value, Decimal):
+        sort_value = str(sort_value)
+    
+    payload = json.dumps([sort_by, sort_order, sort_value, last_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort_by, sort_order, sort_column):
+    """
+    Decode a pagination cursor for the given sort.
+    
+    Args:
+        cursor: Cursor token from ``encode_cursor``
+        sort_by: Name of the requested sort field
+        sort_order: Requested sort order (asc, desc)
+        sort_column: Column the query is sorted by
+    
+    Returns:
+        tuple: (sort_value, last_id) typed for the sort column
+    
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_sort_by, cursor_sort_order, sort_value, last_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode('ascii'))
+        )
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError('Invalid cursor')
+    
+    if cursor_sort_by != sort_by or cursor_sort_order != sort_order or not isinstance(last_id, int):
+        raise ValueError('Cursor does not match the requested sort order')
+    
+    python_type = sort_column.type.python_type
+    try:
+        if python_type is datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        elif python_type is date:
+            sort_value = parse_date(sort_value)
+        elif python_type is Decimal:
+            sort_value = Decimal(sort_value)
+        else:
+            sort_value = python_type(sort_value)
+    except (ValueError, TypeError, ArithmeticError):
+        raise ValueError('Invalid cursor')
+    
+    return sort_value, last_id
+
+
+def keyset_paginate_query(query, sort_column, id_column, sort_by, sort_order, per_page,
+                          cursor=None, max_per_page=100, serialize=None):
+    """
+    Paginate a SQLAlchemy query by keyset (seek) instead of OFFSET.
+    
+    Rows are ordered by (sort column, id) and each page starts strictly after
+    the row encoded in the cursor, so every page costs the same regardless of
+    depth and no COUNT query is issued.
+    
+    Args:
+        query: SQLAlchemy query object
+        sort_column: Column to sort by
+        id_column: Unique column used as tie-breaker
+        sort_by: Name of the sort field (encoded in the cursor)
+        sort_order: Sort order (asc, desc)
+        per_page: Items per page
+        cursor: Cursor token from a previous page (optional)
+        max_per_page: Maximum items per page
+        serialize: Function turning the page's rows into a list of dicts
+            (default: each row's ``to_dict()``)
+    
+    Returns:
+        dict: Page of items with cursor metadata
+    
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    per_page = min(max(1, per_page), max_per_page)
+    descending = sort_order == 'desc'
+    
+    query = query.order_by(None)
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor, sort_by, sort_order, sort_column)
+        position = db.tuple_(sort_column, id_column)
+        query = query.filter(
+            position < (sort_value, last_id) if descending else position > (sort_value, last_id)
+        )
+    
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+    
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(per_page + 1).all()
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+    
+    next_cursor = None
+    if has_next:
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            sort_by, sort_order, getattr(last, sort_column.key), getattr(last, id_column.key)
+        )
+    
+    return {
+        'items': serialize(rows) if serialize else [item.to_dict() for item in rows],
+        'pagination': {
+            'per_page': per_page,
+            'has_next': has_next,
+            'next_cursor': next_cursor
         }
     }
 
@@ -317,13 +517,124 @@ def generate_expense_summary(expenses):
     }
 
 
-def build_expense_filters(query, filters):
+def summarize_expense_query(query, include_tags=False):
+    """
+    Generate summary statistics for a filtered expense query in the database.
+
+    Produces the same shape as ``generate_expense_summary`` (plus monthly
+    totals, the date range and, with ``include_tags``, tag totals) using
+    aggregate queries, so no expense rows are loaded into Python.
+
+    Args:
+        query: Expense query joined to Category with filters applied
+        include_tags: Add per-tag totals under 'tags'
+
+    Returns:
+        dict: Summary statistics
+    """
+    from src.models.expense import Expense
+    from src.models.category import Category
+
+    # Sorting is irrelevant for aggregates and breaks GROUP BY on PostgreSQL
+    base = query.order_by(None)
+
+    total_count, total_amount, first_date, last_date = base.with_entities(
+        db.func.count(Expense.id),
+        db.func.sum(Expense.amount),
+        db.func.min(Expense.date),
+        db.func.max(Expense.date)
+    ).one()
+
+    if not total_count:
+        summary = {
+            'total_amount': 0,
+            'total_count': 0,
+            'average_amount': 0,
+            'categories': {},
+            'monthly_totals': {},
+            'date_range': None
+        }
+        if include_tags:
+            summary['tags'] = {}
+        return summary
+
+    # Category breakdown
+    category_rows = base.with_entities(
+        Category.name,
+        db.func.count(Expense.id),
+        db.func.sum(Expense.amount)
+    ).group_by(Category.name).all()
+
+    categories = {
+        name: {'count': count, 'total_amount': float(amount)}
+        for name, count, amount in category_rows
+    }
+
+    # Monthly totals
+    year = db.extract('year', Expense.date)
+    month = db.extract('month', Expense.date)
+    monthly_rows = base.with_entities(
+        year, month, db.func.sum(Expense.amount)
+    ).group_by(year, month).order_by(year, month).all()
+
+    monthly_totals = {
+        f"{int(y):04d}-{int(m):02d}": float(amount)
+        for y, m, amount in monthly_rows
+    }
+
+    summary = {
+        'total_amount': float(total_amount),
+        'total_count': total_count,
+        'average_amount': float(Decimal(total_amount) / total_count),
+        'categories': categories,
+        'monthly_totals': monthly_totals,
+        'date_range': {
+            'start': parse_date(first_date).isoformat(),
+            'end': parse_date(last_date).isoformat()
+        }
+    }
+    if include_tags:
+        summary['tags'] = summarize_expense_tags(base)
+    return summary
+
+
+def summarize_expense_tags(query):
+    """
+    Get per-tag expense counts and totals for a filtered expense query.
+    
+    Args:
+        query: Expense query with filters applied
+    
+    Returns:
+        dict: {tag name: {'count': int, 'total_amount': float}}
+    """
+    from src.models.expense import Expense
+    from src.models.tag import Tag, expense_tags
+    
+    rows = query.order_by(None).join(
+        expense_tags, expense_tags.c.expense_id == Expense.id
+    ).join(
+        Tag, Tag.id == expense_tags.c.tag_id
+    ).with_entities(
+        Tag.name,
+        db.func.count(Expense.id),
+        db.func.sum(Expense.amount)
+    ).group_by(Tag.name).all()
+    
+    return {
+        name: {'count': count, 'total_amount': float(amount)}
+        for name, count, amount in rows
+    }
+
+
+def build_expense_filters(query, filters, user_id=None):
     """
     Build expense query filters.
     
     Args:
         query: Base SQLAlchemy query
         filters: Dict of filter parameters
+        user_id: Owner of the expenses, to match only their tags
     
     Returns:
         SQLAlchemy query with filters applied
@@ -341,21 +652,42 @@ def build_expense_filters(query, filters):
     if filters.get('category_id'):
         query = query.filter(Expense.category_id == filters['category_id'])
     
+    # Tag filter: expenses with any (or all) of the comma-separated tags
+    if filters.get('tags'):
+        from src.models.tag import Tag, expense_tags
+        
+        names = list(dict.fromkeys(name.strip() for name in filters['tags'].split(',') if name.strip()))
+        tagged = db.select(expense_tags.c.expense_id).join(
+            Tag, Tag.id == expense_tags.c.tag_id
+        ).where(Tag.name.in_(names))
+        if user_id is not None:
+            tagged = tagged.where(Tag.user_id == user_id)
+        
+        if filters.get('tags_match') == 'all':
+            tagged = tagged.group_by(expense_tags.c.expense_id).having(
+                db.func.count(expense_tags.c.tag_id) == len(names)
+            )
+        
+        query = query.filter(Expense.id.in_(tagged))
+    
     # Search filter (description and notes)
+    relevance = None
     if filters.get('search'):
-        search_term = f"%{filters['search']}%"
-        query = query.filter(
-            db.or_(
-                Expense.description.ilike(search_term),
-                Expense.notes.ilike(search_term)
-            )
-        )
+        query, relevance = apply_expense_search(query, filters['search'], filters.get('search_mode'))
     
     # Sorting
     sort_by = filters.get('sort_by', 'date')
     sort_order = filters.get('sort_order', 'desc')
     
-    sort_column = getattr(Expense, sort_by, Expense.date)
+    if sort_by == 'relevance':
+        # Best matches first by default; fall back to date without full-text search
+        if relevance is not None:
+            sort_column = relevance
+        else:
+            sort_column = Expense.date
+    else:
+        sort_column = getattr(Expense, sort_by, Expense.date)
+    
     if sort_order == 'desc':
         query = query.order_by(sort_column.desc())
     else:
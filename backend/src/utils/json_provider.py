@@ -0,0 +1,118 @@
+from datetime import date
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider
+import logging
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used without it
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _default(obj):
+    """Serialize values the JSON encoders do not handle themselves."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    
+    if isinstance(obj, date):
+        return obj.isoformat()
+    
+    return DefaultJSONProvider.default(obj)
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider using the stdlib encoder.
+    
+    Same as Flask's default, except dates are written as ISO 8601 strings
+    (matching ``to_dict``) rather than HTTP dates, so both providers
+    produce the same values.
+    """
+    
+    default = staticmethod(_default)
+
+
+class OrjsonJSONProvider(StdlibJSONProvider):
+    """
+    JSON provider using orjson.
+    
+    Responses are encoded straight to bytes. Keys are sorted like the
+    stdlib provider; non-ASCII text is written as UTF-8 instead of
+    escape sequences. Calls with encoder options orjson does not support
+    fall back to the stdlib encoder.
+    """
+    
+    def _options(self, sort_keys=None, indent=None):
+        option = orjson.OPT_NON_STR_KEYS
+        if (self.sort_keys if sort_keys is None else sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+    
+    def dumps(self, obj, **kwargs):
+        if set(kwargs) - {'sort_keys', 'indent', 'separators'}:
+            return super().dumps(obj, **kwargs)
+        
+        option = self._options(kwargs.get('sort_keys'), kwargs.get('indent'))
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        
+        return self._app.response_class(
+            orjson.dumps(
+                obj,
+                default=self.default,
+                option=self._options(indent=indent) | orjson.OPT_APPEND_NEWLINE
+            ),
+            mimetype=self.mimetype
+        )
+
+
+JSON_PROVIDERS = {
+    'stdlib': StdlibJSONProvider,
+    'orjson': OrjsonJSONProvider,
+}
+
+
+def get_json_provider_class(name='auto'):
+    """
+    Get the JSON provider class for a ``JSON_PROVIDER`` setting.
+    
+    Args:
+        name: 'auto' (fastest installed), 'orjson' or 'stdlib'
+    
+    Returns:
+        type: JSON provider class
+    
+    Raises:
+        ValueError: If the provider name is unknown
+    """
+    name = (name or 'auto').lower()
+    
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'stdlib'
+    elif name == 'orjson' and orjson is None:
+        logger.warning("orjson is not installed; using the stdlib JSON provider")
+        name = 'stdlib'
+    
+    if name not in JSON_PROVIDERS:
+        raise ValueError(f"Unknown JSON provider: {name}")
+    
+    return JSON_PROVIDERS[name]
+
+
+def init_json(app):
+    """Install the JSON provider selected by ``JSON_PROVIDER``."""
+    provider_class = get_json_provider_class(app.config.get('JSON_PROVIDER', 'auto'))
+    app.json = provider_class(app)
+    logger.info(f"Using {provider_class.__name__} for JSON")
@@ -0,0 +1,254 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from werkzeug.security import generate_password_hash, check_password_hash
+import multiprocessing
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the hashing pool is saturated or failed (answered with 503)."""
+
+
+def build_hash_method(method='pbkdf2:sha256', iterations=None):
+    """
+    Build a fully specified werkzeug hash method string.
+    
+    Stored hashes start with the method string they were made with, so a
+    fully specified method can be compared with them to find outdated
+    hashes.
+    
+    Args:
+        method: 'pbkdf2[:hash[:iterations]]' or 'scrypt[:n:r:p]'
+        iterations: PBKDF2 iterations (overrides the method's; ignored
+            for scrypt, whose cost is set by n)
+    
+    Returns:
+        str: Method string, e.g. 'pbkdf2:sha256:600000'
+    
+    Raises:
+        ValueError: If the method is not supported
+    """
+    parts = (method or 'pbkdf2').split(':')
+    
+    if parts[0] == 'pbkdf2':
+        hash_name = parts[1] if len(parts) > 1 else 'sha256'
+        iterations = iterations or (int(parts[2]) if len(parts) > 2 else 600000)
+        return f'pbkdf2:{hash_name}:{int(iterations)}'
+    
+    if parts[0] == 'scrypt':
+        n, r, p = (parts[1:] + ['32768', '8', '1'][len(parts) - 1:])[:3]
+        return f'scrypt:{int(n)}:{int(r)}:{int(p)}'
+    
+    raise ValueError(f"Unsupported password hash method: {method}")
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification on a bounded process pool.
+    
+    Hashing is CPU-bound; doing it in request threads lets a login burst
+    starve every other request. Jobs go to ``workers`` processes, and at
+    most ``max_pending`` jobs may be queued or running at once: beyond
+    that, and when a job waits longer than ``timeout`` seconds, callers
+    get ``PasswordHashingBusy`` instead of piling up. With ``workers=0``
+    hashing runs inline in the calling thread. New hashes use ``method``
+    (see ``build_hash_method``).
+    
+    The pool is started lazily in the process that uses it, so it is safe
+    to create before forking web workers. Its processes are started with
+    forkserver (spawn where unavailable) rather than forked from a web
+    worker with its threads and open connections. Each web worker has its
+    own pool: size ``workers`` so that web workers x pool workers does not
+    exceed the CPUs. A pool whose process died is replaced on the next
+    job; the jobs it was running fail with ``PasswordHashingBusy``.
+    """
+    
+    def __init__(self, workers=2, max_pending=8, timeout=10, method='pbkdf2:sha256:600000'):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.method = method
+        self._executor = None
+        self._background = None
+        self._background_pid = None
+        self._background_busy = False
+        self._pid = None
+        self._pending = 0
+        self._lock = Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.background_skipped = 0
+    
+    def hash(self, password):
+        """Hash a password with the configured method."""
+        return self._run(generate_password_hash, password, self.method)
+    
+    def verify(self, password_hash, password):
+        """Check a password against a hash."""
+        return self._run(check_password_hash, password_hash, password)
+    
+    def needs_rehash(self, password_hash):
+        """Check whether a hash was made with a different method or cost."""
+        return password_hash.split('$', 1)[0] != self.method
+    
+    def run_in_background(self, fn, *args):
+        """
+        Run ``fn`` on the background thread (e.g. to rehash after login) if it is idle.
+        
+        Only one background job exists at a time, and none starts while
+        the pool is at least half full, so background hashing holds at
+        most one pool slot and its arguments (such as a plaintext password)
+        never wait in a queue. Skipped work is dropped; a rehash is retried
+        on the user's next login.
+        
+        Returns:
+            Future, or None if the job was skipped
+        """
+        with self._lock:
+            if self._background_pid != os.getpid():
+                # The thread does not survive forking
+                self._background = None
+                self._background_busy = False
+            
+            pool_busy = self.workers and self._pending >= max(self.max_pending // 2, 1)
+            if self._background_busy or pool_busy:
+                self.background_skipped += 1
+                return None
+            
+            if self._background is None:
+                self._background = ThreadPoolExecutor(max_workers=1, thread_name_prefix='password-rehash')
+                self._background_pid = os.getpid()
+            self._background_busy = True
+            future = self._background.submit(fn, *args)
+        
+        future.add_done_callback(self._background_done)
+        return future
+    
+    def record_rehash(self):
+        """Count an upgraded password hash."""
+        with self._lock:
+            self.rehashed += 1
+    
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHashingBusy('Password hashing queue is full')
+            
+            executor = self._get_executor()
+            try:
+                future = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                self._executor = None
+                self.rejected += 1
+                logger.error("Password hashing pool broke; it will be restarted")
+                raise PasswordHashingBusy('Password hashing pool failed')
+            self._pending += 1
+        
+        future.add_done_callback(self._job_done)
+        
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHashingBusy('Password hashing timed out')
+        except BrokenProcessPool:
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+                self.rejected += 1
+            logger.error("Password hashing pool broke; it will be restarted")
+            raise PasswordHashingBusy('Password hashing pool failed')
+    
+    def _background_done(self, future):
+        with self._lock:
+            self._background_busy = False
+    
+    def _job_done(self, future):
+        with self._lock:
+            self._pending = max(self._pending - 1, 0)
+            self.completed += 1
+    
+    def _get_executor(self):
+        """Get this process's pool, starting it if needed (call with the lock held)."""
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=self._mp_context())
+            self._pid = os.getpid()
+            self._pending = 0
+        return self._executor
+    
+    @staticmethod
+    def _mp_context():
+        if 'forkserver' not in multiprocessing.get_all_start_methods():
+            return multiprocessing.get_context('spawn')
+        
+        context = multiprocessing.get_context('forkserver')
+        # The server only needs werkzeug, not the app's __main__ module
+        context.set_forkserver_preload(['werkzeug.security'])
+        return context
+    
+    def shutdown(self):
+        """Stop the pool's processes and the background thread."""
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            
+            if self._background is not None and self._background_pid == os.getpid():
+                self._background.shutdown(wait=False)
+            self._background = None
+            self._background_busy = False
+    
+    def stats(self):
+        """Get pool statistics."""
+        with self._lock:
+            return {
+                'method': self.method,
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'pending': self._pending,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'rehashed': self.rehashed,
+                'background_skipped': self.background_skipped
+            }
+    
+    def __repr__(self):
+        return f'<PasswordHasher workers={self.workers} pending={self._pending}/{self.max_pending}>'
+
+
+# Hasher used by AuthService (configured by init_password_hashing)
+password_hasher = PasswordHasher(workers=0)
+
+
+def init_password_hashing(app):
+    """
+    Configure the password hashing pool from app config.
+    
+    Reads ``PASSWORD_HASH_WORKERS`` (0 hashes inline),
+    ``PASSWORD_HASH_MAX_PENDING``, ``PASSWORD_HASH_TIMEOUT`` and the hash
+    cost, ``PASSWORD_HASH_METHOD`` and ``PASSWORD_HASH_ITERATIONS``.
+    """
+    password_hasher.shutdown()
+    password_hasher.method = build_hash_method(
+        app.config.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256'),
+        app.config.get('PASSWORD_HASH_ITERATIONS')
+    )
+    password_hasher.workers = app.config.get('PASSWORD_HASH_WORKERS', 2)
+    password_hasher.max_pending = app.config.get('PASSWORD_HASH_MAX_PENDING', 4 * password_hasher.workers)
+    password_hasher.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 10)
+    
+    logger.info(
+        f"Password hashing: {password_hasher.method}, {password_hasher.workers or 'inline'} workers, "
+        f"max {password_hasher.max_pending} pending"
+    )
@@ -0,0 +1,175 @@
+from flask import current_app
+from sqlalchemy import inspect, text
+from src.config.database import db
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Full-text objects per dialect. PostgreSQL keeps a generated tsvector
+# column with a GIN index; SQLite keeps an external-content FTS5 table
+# in sync with triggers. Both are maintained by the database on every
+# INSERT/UPDATE/DELETE, including bulk statements.
+SEARCH_DDL = {
+    'postgresql': [
+        """
+        ALTER TABLE expenses ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            to_tsvector('simple', coalesce(description, '') || ' ' || coalesce(notes, ''))
+        ) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_expenses_search ON expenses USING GIN (search_vector)",
+    ],
+    'sqlite': [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS expenses_fts USING fts5(
+            description, notes, content='expenses', content_rowid='id'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS expenses_fts_insert AFTER INSERT ON expenses BEGIN
+            INSERT INTO expenses_fts(rowid, description, notes)
+            VALUES (new.id, new.description, new.notes);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS expenses_fts_delete AFTER DELETE ON expenses BEGIN
+            INSERT INTO expenses_fts(expenses_fts, rowid, description, notes)
+            VALUES ('delete', old.id, old.description, old.notes);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS expenses_fts_update AFTER UPDATE OF description, notes ON expenses BEGIN
+            INSERT INTO expenses_fts(expenses_fts, rowid, description, notes)
+            VALUES ('delete', old.id, old.description, old.notes);
+            INSERT INTO expenses_fts(rowid, description, notes)
+            VALUES (new.id, new.description, new.notes);
+        END
+        """,
+    ],
+}
+
+# Cache of full-text availability per database URL
+_fulltext_available = {}
+
+
+def create_search_index(target, connection, **kwargs):
+    """
+    Create the full-text search objects for the expenses table.
+
+    Used as an ``after_create`` listener on the expenses table and by the
+    ``flask search init`` command for existing databases.
+
+    Args:
+        target: Table being created (unused)
+        connection: Database connection
+    """
+    statements = SEARCH_DDL.get(connection.dialect.name)
+    if not statements:
+        return
+
+    # In a savepoint: on PostgreSQL a failed statement would otherwise
+    # abort the surrounding create_all transaction
+    try:
+        with connection.begin_nested():
+            for statement in statements:
+                connection.execute(text(statement))
+    except Exception as e:
+        # e.g. SQLite built without FTS5: searches fall back to substring
+        logger.warning(f"Full-text search index not created: {str(e)}")
+        return
+
+    _fulltext_available.pop(str(connection.engine.url), None)
+
+
+def rebuild_search_index():
+    """
+    Create missing full-text objects and re-index existing expenses.
+
+    Returns:
+        bool: True if full-text search is available afterwards
+    """
+    connection = db.session.connection()
+    create_search_index(None, connection)
+
+    if connection.dialect.name == 'sqlite' and fulltext_available():
+        connection.execute(text("INSERT INTO expenses_fts(expenses_fts) VALUES ('rebuild')"))
+
+    db.session.commit()
+    return fulltext_available()
+
+
+def fulltext_available():
+    """Check whether the database has the full-text search objects."""
+    engine = db.engine
+    key = str(engine.url)
+
+    if key not in _fulltext_available:
+        inspector = inspect(engine)
+        if engine.dialect.name == 'postgresql':
+            columns = {column['name'] for column in inspector.get_columns('expenses')}
+            available = 'search_vector' in columns
+        elif engine.dialect.name == 'sqlite':
+            available = inspector.has_table('expenses_fts')
+        else:
+            available = False
+        _fulltext_available[key] = available
+
+    return _fulltext_available[key]
+
+
+def search_terms(term):
+    """Split a search string into word tokens."""
+    return re.findall(r'\w+', term or '', re.UNICODE)
+
+
+def apply_expense_search(query, term, mode=None):
+    """
+    Filter an expense query by a search term.
+
+    Full-text mode matches every word of the term as a prefix of a word in
+    the description or notes and can rank results. Substring mode is the
+    original ILIKE '%term%' match and is used when full-text search is
+    disabled, unavailable, or the term has no words.
+
+    Args:
+        query: Expense query
+        term: Search string
+        mode: 'fulltext' or 'substring' (default: SEARCH_BACKEND config)
+
+    Returns:
+        tuple: (filtered query, relevance expression or None); higher
+        relevance means a better match
+    """
+    from src.models.expense import Expense
+
+    mode = mode or current_app.config.get('SEARCH_BACKEND', 'substring')
+    words = search_terms(term)
+
+    if mode != 'fulltext' or not words or not fulltext_available():
+        search_term = f"%{term}%"
+        query = query.filter(
+            db.or_(
+                Expense.description.ilike(search_term),
+                Expense.notes.ilike(search_term)
+            )
+        )
+        return query, None
+
+    if db.engine.dialect.name == 'postgresql':
+        search_vector = db.literal_column('expenses.search_vector')
+        ts_query = db.func.to_tsquery('simple', ' & '.join(f"{word}:*" for word in words))
+        query = query.filter(search_vector.op('@@')(ts_query))
+        return query, db.func.ts_rank(search_vector, ts_query)
+
+    # SQLite FTS5: rank is bm25, where lower is better
+    match = ' AND '.join('"{}"*'.format(word.replace('"', '')) for word in words)
+    matches = db.select(
+        db.literal_column('rowid').label('expense_id'),
+        db.literal_column('rank').label('rank')
+    ).select_from(db.table('expenses_fts')).where(
+        db.literal_column('expenses_fts').op('MATCH')(match)
+    ).subquery('search_matches')
+
+    query = query.join(matches, matches.c.expense_id == Expense.id)
+    return query, -matches.c.rank
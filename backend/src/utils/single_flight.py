@@ -0,0 +1,126 @@
+from threading import Event, Lock
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """An in-flight computation and its outcome."""
+    
+    def __init__(self):
+        self.done = Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent computations within a process.
+    
+    The first caller for a key runs the computation; callers arriving with
+    the same key while it runs wait for it and get the same result (or
+    exception) instead of repeating the work. Nothing is kept once the
+    computation finishes; pair it with a cache for reuse over time.
+    """
+    
+    def __init__(self, name, enabled=True):
+        self.name = name
+        self.enabled = enabled
+        self._calls = {}
+        self._lock = Lock()
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+    
+    def do(self, key, fn):
+        """
+        Run ``fn`` for ``key``, or wait for the run already in flight.
+        
+        Args:
+            key: Hashable key identifying the computation
+            fn: Callable computing the result
+        
+        Returns:
+            The result of ``fn``, shared by all concurrent callers
+        """
+        if not self.enabled:
+            with self._lock:
+                self.calls += 1
+                self.executions += 1
+            return fn()
+        
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            if call.waiters:
+                logger.debug(f"{self.name}: shared one computation with {call.waiters} waiting callers")
+    
+    def stats(self):
+        """Get coalescing statistics."""
+        with self._lock:
+            return {
+                'name': self.name,
+                'enabled': self.enabled,
+                'in_flight': len(self._calls),
+                'calls': self.calls,
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'errors': self.errors
+            }
+    
+    def __repr__(self):
+        return f'<SingleFlight {self.name}: {len(self._calls)} in flight>'
+
+
+# Expensive ExpenseService reads
+summary_flight = SingleFlight('summaries')
+expense_count_flight = SingleFlight('expense_counts')
+
+flights = {
+    'summaries': summary_flight,
+    'expense_counts': expense_count_flight,
+}
+
+
+def init_single_flight(app):
+    """Enable or disable request coalescing from ``SINGLE_FLIGHT_ENABLED``."""
+    enabled = app.config.get('SINGLE_FLIGHT_ENABLED', True)
+    
+    for flight in flights.values():
+        flight.enabled = enabled
+    
+    logger.info(f"Request coalescing {'enabled' if enabled else 'disabled'}: {', '.join(flights)}")
+
+
+def get_single_flight_stats():
+    """Get statistics for all coalesced computations; ``coalesced`` counts saved computations."""
+    return {name: flight.stats() for name, flight in flights.items()}
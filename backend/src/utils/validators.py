@@ -1,4 +1,4 @@
-from marshmallow import Schema, fields, validate, validates, ValidationError
+from marshmallow import Schema, fields, validate, validates, validates_schema, ValidationError
 from decimal import Decimal
 import re
 
@@ -110,6 +110,7 @@ class ExpenseSchema(Schema):
     )
     notes = fields.Str(missing=None, validate=validate.Length(max=1000))
     receipt_url = fields.Str(missing=None)  # Simplified from Url field
+    tags = fields.List(fields.Str(validate=validate.Length(min=1, max=50)))
     is_recurring = fields.Bool(missing=False)
 
 
@@ -122,14 +123,92 @@ class ExpenseQuerySchema(Schema):
     start_date = fields.Date(missing=None)
     end_date = fields.Date(missing=None)
     search = fields.Str(missing=None, validate=validate.Length(max=100))
+    tags = fields.Str(missing=None, validate=validate.Length(max=500))  # Comma-separated
+    tags_match = fields.Str(
+        missing='any',
+        validate=validate.OneOf(['any', 'all'])
+    )
+    search_mode = fields.Str(
+        missing=None,
+        validate=validate.OneOf(['fulltext', 'substring'])
+    )
     sort_by = fields.Str(
         missing='date',
-        validate=validate.OneOf(['date', 'amount', 'description', 'created_at'])
+        validate=validate.OneOf(['date', 'amount', 'description', 'created_at', 'relevance'])
     )
     sort_order = fields.Str(
         missing='desc',
         validate=validate.OneOf(['asc', 'desc'])
     )
+    with_total = fields.Bool(missing=True)
+    pagination = fields.Str(
+        missing='page',
+        validate=validate.OneOf(['page', 'cursor'])
+    )
+    cursor = fields.Str(missing=None, validate=validate.Length(max=500))
+    sparse_fields = fields.Str(
+        data_key='fields',
+        missing=None,
+        validate=validate.Length(max=500)
+    )  # Comma-separated field names
+    compact = fields.Bool(missing=False)  # Side-load categories
+
+
+class ExpenseExportSchema(ExpenseQuerySchema):
+    """Schema for expense export query parameters."""
+    
+    class Meta:
+        exclude = ('sparse_fields', 'compact')
+    
+    format = fields.Str(
+        missing='csv',
+        validate=validate.OneOf(['csv', 'ndjson'])
+    )
+
+
+class ExpenseSummarySchema(ExpenseQuerySchema):
+    """Schema for expense summary query parameters."""
+    
+    include_tags = fields.Bool(missing=False)  # Per-tag totals (joins every expense to its tags)
+
+
+class ExpenseSelectionSchema(Schema):
+    """Schema for selecting expenses by ID list or filter set."""
+    
+    # Filters accepted in "filters" (see build_expense_filters)
+    FILTER_FIELDS = ('category_id', 'start_date', 'end_date', 'search', 'search_mode', 'tags', 'tags_match')
+    
+    ids = fields.List(
+        fields.Int(validate=validate.Range(min=1)),
+        validate=validate.Length(min=1, max=10000)
+    )
+    filters = fields.Nested(ExpenseQuerySchema(only=FILTER_FIELDS))
+    
+    @validates_schema
+    def validate_selection(self, data, **kwargs):
+        if ('ids' in data) == ('filters' in data):
+            raise ValidationError('Provide either ids or filters.')
+        
+        # An empty filter set would match every expense
+        if 'filters' in data and not any(
+            data['filters'].get(field) for field in ('category_id', 'start_date', 'end_date', 'search', 'tags')
+        ):
+            raise ValidationError('At least one filter is required.', 'filters')
+
+
+class ExpenseBulkUpdateSchema(ExpenseSelectionSchema):
+    """Schema for bulk expense updates."""
+    
+    changes = fields.Nested(
+        ExpenseSchema(partial=True, exclude=('tags',)),
+        required=True,
+        error_messages={'required': 'Changes are required.'}
+    )
+    
+    @validates('changes')
+    def validate_changes(self, value):
+        if not value:
+            raise ValidationError('At least one field must be changed.')
 
 
 # Schema instances for reuse
@@ -138,3 +217,7 @@ user_login_schema = UserLoginSchema()
 category_schema = CategorySchema()
 expense_schema = ExpenseSchema()
 expense_query_schema = ExpenseQuerySchema()
+expense_export_schema = ExpenseExportSchema()
+expense_summary_schema = ExpenseSummarySchema()
+expense_selection_schema = ExpenseSelectionSchema()
+expense_bulk_update_schema = ExpenseBulkUpdateSchema()
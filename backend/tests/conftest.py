@@ -0,0 +1,92 @@
+import os
+
+os.environ['FLASK_ENV'] = 'testing'
+
+import pytest  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from src.app import create_app  # noqa: E402
+from src.config.database import db  # noqa: E402
+from src.utils.cache import caches  # noqa: E402
+
+
+class QueryCounter:
+    """Count the SQL statements run on an engine while active."""
+    
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+    
+    def _count(self, *args):
+        self.count += 1
+    
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, 'before_cursor_execute', self._count)
+        return self
+    
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self._count)
+
+
+def clear_caches():
+    """Empty the process-wide caches so requests start cold."""
+    for cache in caches.values():
+        cache.clear()
+
+
+@pytest.fixture
+def app():
+    """Application on a fresh in-memory SQLite database."""
+    clear_caches()
+    app = create_app('testing')
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    
+    clear_caches()
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Authorization headers of a newly registered user."""
+    response = client.post('/api/v1/auth/register', json={
+        'email': 'alice@example.com',
+        'username': 'alice',
+        'password': 'Passw0rd!',
+        'first_name': 'Alice',
+        'last_name': 'Example'
+    })
+    assert response.status_code == 201, response.get_json()
+    return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+
+@pytest.fixture
+def category_ids(client, auth_headers):
+    """IDs of two categories owned by the test user."""
+    ids = []
+    for name in ('Food', 'Travel'):
+        response = client.post('/api/v1/categories', json={'name': name}, headers=auth_headers)
+        assert response.status_code == 201, response.get_json()
+        ids.append(response.get_json()['category']['id'])
+    return ids
+
+
+@pytest.fixture
+def expense_ids(client, auth_headers, category_ids):
+    """IDs of 120 tagged expenses, split between the test categories."""
+    items = [
+        {
+            'amount': 10 + index,
+            'description': f'Expense {index}',
+            'date': f'2024-{1 + index % 12:02d}-{1 + index % 28:02d}',
+            'category_id': category_ids[index % len(category_ids)],
+            'tags': ['work', f'tag-{index % 5}']
+        }
+        for index in range(120)
+    ]
+    response = client.post('/api/v1/expenses/batch', json={'expenses': items}, headers=auth_headers)
+    assert response.status_code == 201, response.get_json()
+    return [result['expense']['id'] for result in response.get_json()['results']]
@@ -0,0 +1,55 @@
+from unittest import mock
+
+from src.config.database import db
+from src.models.user import User
+from src.services.auth_service import AuthService
+from src.utils.cache import user_cache, MISSING
+from tests.conftest import QueryCounter
+
+
+def test_me_is_served_from_the_user_cache(client, auth_headers):
+    assert client.get('/api/v1/auth/me', headers=auth_headers).status_code == 200
+    
+    with QueryCounter(db.engine) as counter:
+        response = client.get('/api/v1/auth/me', headers=auth_headers)
+    
+    assert response.status_code == 200
+    assert response.get_json()['user']['username'] == 'alice'
+    assert counter.count == 0
+
+
+def test_user_updates_invalidate_the_cache(client, auth_headers):
+    client.get('/api/v1/auth/me', headers=auth_headers)
+    
+    user = User.query.filter_by(username='alice').one()
+    user.first_name = 'Alicia'
+    db.session.commit()
+    
+    response = client.get('/api/v1/auth/me', headers=auth_headers)
+    assert response.get_json()['user']['first_name'] == 'Alicia'
+
+
+def test_update_during_load_is_not_cached(app, auth_headers):
+    user_id = User.query.filter_by(username='alice').one().id
+    user_cache.clear()
+    load = AuthService.get_user_by_id
+    
+    def load_then_update(user_id):
+        user = load(user_id)
+        # Another request commits a change to the user meanwhile
+        AuthService.invalidate_user_cache(user_id)
+        return user
+    
+    with mock.patch.object(AuthService, 'get_user_by_id', side_effect=load_then_update):
+        assert AuthService.get_user_dict(user_id)['username'] == 'alice'
+    
+    assert user_cache.get(str(user_id)) is MISSING
+
+
+def test_inactive_users_are_cached_as_missing(client, auth_headers):
+    user = User.query.filter_by(username='alice').one()
+    user.is_active = False
+    db.session.commit()
+    
+    assert client.get('/api/v1/auth/me', headers=auth_headers).status_code == 404
+    assert user_cache.get(str(user.id)) is None
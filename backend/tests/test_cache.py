@@ -0,0 +1,153 @@
+import time
+
+from src.utils.cache import LRUCache, MISSING
+from src.utils.single_flight import SingleFlight
+
+
+def test_get_set_and_lru_eviction():
+    cache = LRUCache('test', max_size=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    
+    assert cache.get('a') == 1
+    assert cache.get('b') is MISSING
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_none_is_a_cached_value():
+    cache = LRUCache('test')
+    cache.set('a', None)
+    
+    assert cache.get('a') is None
+    assert cache.get('b') is MISSING
+
+
+def test_entries_expire_after_ttl():
+    cache = LRUCache('test', ttl=0.01)
+    cache.set('a', 1)
+    time.sleep(0.02)
+    
+    assert cache.get('a') is MISSING
+
+
+def test_invalidate_drops_only_the_group():
+    cache = LRUCache('test')
+    cache.set('a', 1, group=1)
+    cache.set('b', 2, group=1)
+    cache.set('c', 3, group=2)
+    
+    cache.invalidate(1)
+    
+    assert cache.get('a') is MISSING
+    assert cache.get('b') is MISSING
+    assert cache.get('c') == 3
+
+
+def test_disabled_cache_stores_nothing():
+    cache = LRUCache('test', enabled=False)
+    cache.set('a', 1)
+    
+    assert cache.get('a') is MISSING
+    assert cache.get_or_set('a', lambda: 2) == 2
+    assert len(cache) == 0
+
+
+def test_get_or_set_computes_once():
+    cache = LRUCache('test')
+    calls = []
+    
+    def factory():
+        calls.append(1)
+        return 'value'
+    
+    assert cache.get_or_set('a', factory, group=1) == 'value'
+    assert cache.get_or_set('a', factory, group=1) == 'value'
+    assert len(calls) == 1
+
+
+def test_invalidation_during_compute_is_not_lost():
+    cache = LRUCache('test')
+    
+    def factory():
+        # A write commits and invalidates while the value is being read
+        cache.invalidate(1)
+        return 'stale-summary'
+    
+    assert cache.get_or_set('summary', factory, group=1) == 'stale-summary'
+    assert cache.get('summary') is MISSING
+    assert cache.get_or_set('summary', lambda: 'fresh-summary', group=1) == 'fresh-summary'
+    assert cache.get('summary') == 'fresh-summary'
+
+
+def test_clear_during_compute_is_not_lost():
+    cache = LRUCache('test')
+    
+    def factory():
+        cache.clear()
+        return 'stale'
+    
+    cache.get_or_set('a', factory, group=1)
+    
+    assert cache.get('a') is MISSING
+
+
+def test_other_group_invalidation_does_not_skip_store():
+    cache = LRUCache('test')
+    
+    def factory():
+        cache.invalidate(2)
+        return 'value'
+    
+    cache.get_or_set('a', factory, group=1)
+    
+    assert cache.get('a') == 'value'
+
+
+def test_set_skips_values_older_than_an_invalidation():
+    cache = LRUCache('test')
+    generation = cache.generation()
+    cache.invalidate('1')
+    
+    cache.set('user', {'id': 1}, group='1', generation=generation)
+    assert cache.get('user') is MISSING
+    
+    cache.set('user', {'id': 1}, group='1', generation=cache.generation())
+    assert cache.get('user') == {'id': 1}
+
+
+def test_invalidation_bookkeeping_is_bounded():
+    cache = LRUCache('test', max_size=4)
+    generation = cache.generation()
+    
+    for group in range(10):
+        cache.invalidate(group)
+    
+    assert len(cache._group_generations) <= 4
+    # Values computed before the bookkeeping was reset are still rejected
+    cache.set('a', 1, group=0, generation=generation)
+    assert cache.get('a') is MISSING
+
+
+def test_single_flight_waiters_share_the_guarded_result():
+    cache = LRUCache('test')
+    flight = SingleFlight('test')
+    
+    def factory():
+        cache.invalidate(1)
+        return 'stale'
+    
+    assert cache.get_or_set('a', factory, group=1, flight=flight) == 'stale'
+    assert cache.get('a') is MISSING
+
+
+def test_cache_stats_endpoint_is_off_by_default(app, client):
+    assert client.get('/health/caches').status_code == 404
+    
+    app.config['CACHE_STATS_ENDPOINT'] = True
+    response = client.get('/health/caches')
+    
+    assert response.status_code == 200
+    assert {'caches', 'single_flight'} <= set(response.get_json())
@@ -0,0 +1,120 @@
+import os
+import time
+
+import pytest
+from flask import Flask
+
+from src.utils.cache_backends import SQLiteCacheBackend, create_cache_backend
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    """Cache file in a directory private to the test user."""
+    os.chmod(tmp_path, 0o700)
+    return str(tmp_path / 'cache.sqlite3')
+
+
+@pytest.fixture
+def workers(cache_path):
+    """Two backends on one file, as two worker processes would have."""
+    first = SQLiteCacheBackend(cache_path)
+    second = SQLiteCacheBackend(cache_path)
+    yield first, second
+    first.close()
+    second.close()
+
+
+def test_entries_are_shared(workers):
+    first, second = workers
+    first.set('summaries', ('summary', 1), {'total': 10}, group=1, expires_at=time.time() + 60)
+    
+    value, group, _ = second.get('summaries', ('summary', 1))
+    assert value == {'total': 10}
+    assert group == 1
+
+
+def test_expired_entries_are_ignored(workers):
+    first, second = workers
+    first.set('summaries', 'key', 'value', expires_at=time.time() - 1)
+    
+    assert second.get('summaries', 'key') is None
+
+
+def test_publish_reaches_other_workers_only(workers):
+    first, second = workers
+    first.set('summaries', 'key', 'value', group=1)
+    
+    first.publish('summaries', 1)
+    
+    assert second.poll() == [('summaries', 1)]
+    assert second.poll() == []
+    assert first.poll() == []
+    assert second.get('summaries', 'key') is None
+
+
+def test_publish_all_drops_every_entry(workers):
+    first, second = workers
+    first.set('summaries', 'a', 1, group=1)
+    first.set('summaries', 'b', 2, group=2)
+    
+    second.publish('summaries', None)
+    
+    assert first.poll() == [('summaries', None)]
+    assert first.get('summaries', 'a') is None
+    assert first.get('summaries', 'b') is None
+
+
+def test_since_guard_skips_values_read_before_an_invalidation(workers):
+    first, second = workers
+    started = time.time()
+    second.publish('summaries', 1)
+    
+    first.set('summaries', 'key', 'stale', group=1, since=started)
+    assert second.get('summaries', 'key') is None
+    
+    first.set('summaries', 'key', 'fresh', group=1, since=time.time())
+    assert second.get('summaries', 'key')[0] == 'fresh'
+
+
+def test_since_guard_ignores_other_groups(workers):
+    first, second = workers
+    started = time.time()
+    second.publish('summaries', 2)
+    
+    first.set('summaries', 'key', 'value', group=1, since=started)
+    
+    assert second.get('summaries', 'key')[0] == 'value'
+
+
+def test_new_file_is_private(cache_path):
+    SQLiteCacheBackend(cache_path).close()
+    
+    assert os.stat(cache_path).st_mode & 0o077 == 0
+
+
+def test_refuses_file_writable_by_others(cache_path):
+    open(cache_path, 'w').close()
+    os.chmod(cache_path, 0o666)
+    
+    with pytest.raises(PermissionError):
+        SQLiteCacheBackend(cache_path)
+
+
+def test_refuses_directory_writable_by_others(tmp_path):
+    os.chmod(tmp_path, 0o777)
+    
+    with pytest.raises(PermissionError):
+        SQLiteCacheBackend(str(tmp_path / 'cache.sqlite3'))
+
+
+def test_default_path_is_in_the_instance_folder(tmp_path):
+    instance_path = tmp_path / 'instance'
+    app = Flask(__name__, instance_path=str(instance_path))
+    app.config.update(CACHE_BACKEND='sqlite', CACHE_SQLITE_PATH=None)
+    
+    backend = create_cache_backend(app)
+    try:
+        assert backend.path == str(instance_path / 'cache.sqlite3')
+        assert os.stat(instance_path).st_mode & 0o077 == 0
+    finally:
+        backend.close()
@@ -0,0 +1,83 @@
+from src.config.database import db
+from src.services.category_service import CategoryService
+from tests.conftest import QueryCounter
+
+
+def test_category_list_is_served_from_the_cache(client, auth_headers, category_ids):
+    client.get('/api/v1/categories', headers=auth_headers)
+    
+    with QueryCounter(db.engine) as counter:
+        response = client.get('/api/v1/categories', headers=auth_headers)
+    
+    assert response.status_code == 200
+    assert [category['name'] for category in response.get_json()['categories']] == ['Food', 'Travel']
+    assert counter.count == 1  # Data version for the ETag only
+
+
+def test_category_writes_invalidate_the_cache(client, auth_headers, category_ids):
+    client.get('/api/v1/categories', headers=auth_headers)
+    
+    response = client.put(
+        f'/api/v1/categories/{category_ids[0]}', json={'name': 'Groceries'}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    
+    response = client.get('/api/v1/categories', headers=auth_headers)
+    assert [category['name'] for category in response.get_json()['categories']] == ['Groceries', 'Travel']
+
+
+def test_deleted_categories_cannot_be_used(client, auth_headers, category_ids):
+    user_id = 1
+    assert CategoryService.is_user_category(category_ids[0], user_id)
+    
+    response = client.delete(f'/api/v1/categories/{category_ids[0]}', headers=auth_headers)
+    assert response.status_code == 200
+    
+    assert not CategoryService.is_user_category(category_ids[0], user_id)
+    response = client.post('/api/v1/expenses', json={
+        'amount': 5,
+        'description': 'Lunch',
+        'date': '2024-01-05',
+        'category_id': category_ids[0]
+    }, headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_other_users_categories_are_rejected(client, auth_headers, category_ids):
+    response = client.post('/api/v1/auth/register', json={
+        'email': 'bob@example.com',
+        'username': 'bob',
+        'password': 'Passw0rd!',
+        'first_name': 'Bob',
+        'last_name': 'Example'
+    })
+    headers = {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+    
+    response = client.post('/api/v1/expenses', json={
+        'amount': 5,
+        'description': 'Lunch',
+        'date': '2024-01-05',
+        'category_id': category_ids[0]
+    }, headers=headers)
+    assert response.status_code == 404
+
+
+def test_requested_stats_fields_imply_include_stats(client, auth_headers, category_ids):
+    client.post('/api/v1/expenses', json={
+        'amount': 12.5, 'description': 'Lunch', 'date': '2024-01-05', 'category_id': category_ids[0]
+    }, headers=auth_headers)
+    
+    response = client.get(
+        '/api/v1/categories', query_string={'fields': 'name,expense_count,total_amount'}, headers=auth_headers
+    )
+    
+    assert response.status_code == 200
+    categories = {category['name']: category for category in response.get_json()['categories']}
+    assert categories['Food'] == {'name': 'Food', 'expense_count': 1, 'total_amount': 12.5}
+    assert categories['Travel']['expense_count'] == 0
+    
+    response = client.get('/api/v1/categories', query_string={'fields': 'name'}, headers=auth_headers)
+    assert all('expense_count' not in category for category in response.get_json()['categories'])
+    
+    response = client.get('/api/v1/categories', headers=auth_headers)
+    assert all('expense_count' not in category for category in response.get_json()['categories'])
@@ -0,0 +1,137 @@
+import io
+
+import pytest
+
+from src.models.user import User
+from src.services.rollup_service import RollupService
+
+LIST_PATH = '/api/v1/expenses'
+
+
+def get_etag(client, headers, path=LIST_PATH):
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200
+    assert response.headers['ETag']
+    return response.headers['ETag']
+
+
+def assert_not_modified(client, headers, etag, path=LIST_PATH):
+    response = client.get(path, headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+
+def assert_modified(client, headers, etag, path=LIST_PATH):
+    response = client.get(path, headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+@pytest.mark.parametrize('path', [LIST_PATH, '/api/v1/expenses/summary', '/api/v1/categories'])
+def test_matching_etag_is_not_modified(client, auth_headers, expense_ids, path):
+    etag = get_etag(client, auth_headers, path)
+    
+    assert_not_modified(client, auth_headers, etag, path)
+
+
+def test_etag_depends_on_query(client, auth_headers, expense_ids):
+    etag = get_etag(client, auth_headers)
+    
+    response = client.get(LIST_PATH, query_string={'page': 2}, headers={**auth_headers, 'If-None-Match': etag})
+    
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def create_expense(client, headers, expense_ids, category_ids):
+    return client.post('/api/v1/expenses', json={
+        'amount': 5, 'description': 'Coffee', 'date': '2024-02-02', 'category_id': category_ids[0]
+    }, headers=headers)
+
+
+def update_expense(client, headers, expense_ids, category_ids):
+    return client.put(f'/api/v1/expenses/{expense_ids[0]}', json={
+        'amount': 6, 'description': 'Changed', 'date': '2024-02-02', 'category_id': category_ids[1]
+    }, headers=headers)
+
+
+def delete_expense(client, headers, expense_ids, category_ids):
+    return client.delete(f'/api/v1/expenses/{expense_ids[0]}', headers=headers)
+
+
+def create_batch(client, headers, expense_ids, category_ids):
+    return client.post('/api/v1/expenses/batch', json={'expenses': [
+        {'amount': 5, 'description': 'Coffee', 'date': '2024-02-02', 'category_id': category_ids[0]}
+    ]}, headers=headers)
+
+
+def update_bulk(client, headers, expense_ids, category_ids):
+    return client.patch('/api/v1/expenses/batch', json={
+        'ids': expense_ids[:5], 'changes': {'amount': 1}
+    }, headers=headers)
+
+
+def delete_bulk(client, headers, expense_ids, category_ids):
+    return client.delete('/api/v1/expenses/batch', json={'ids': expense_ids[:5]}, headers=headers)
+
+
+def import_csv(client, headers, expense_ids, category_ids):
+    content = b'date,description,amount,category\n2024-02-02,Coffee,5,Food\n'
+    return client.post(
+        '/api/v1/expenses/import',
+        data={'file': (io.BytesIO(content), 'expenses.csv')},
+        content_type='multipart/form-data',
+        headers=headers
+    )
+
+
+@pytest.mark.parametrize('write', [
+    create_expense, update_expense, delete_expense, create_batch, update_bulk, delete_bulk, import_csv
+])
+def test_writes_change_the_etag(client, auth_headers, expense_ids, category_ids, write):
+    etag = get_etag(client, auth_headers)
+    summary_etag = get_etag(client, auth_headers, '/api/v1/expenses/summary')
+    
+    response = write(client, auth_headers, expense_ids, category_ids)
+    
+    assert response.status_code in (200, 201), response.get_json()
+    assert_modified(client, auth_headers, etag)
+    assert_modified(client, auth_headers, summary_etag, '/api/v1/expenses/summary')
+
+
+def test_failed_write_keeps_the_etag(client, auth_headers, expense_ids):
+    etag = get_etag(client, auth_headers)
+    
+    response = client.patch('/api/v1/expenses/batch', json={
+        'ids': expense_ids[:5], 'changes': {'category_id': 9999}
+    }, headers=auth_headers)
+    
+    assert response.status_code == 404
+    assert_not_modified(client, auth_headers, etag)
+
+
+@pytest.mark.parametrize('scope', ['user', 'all'])
+def test_rollup_rebuild_changes_the_etag(client, auth_headers, expense_ids, scope):
+    user_id = User.query.filter_by(username='alice').one().id
+    etag = get_etag(client, auth_headers, '/api/v1/expenses/summary')
+    
+    RollupService.rebuild(user_id if scope == 'user' else None)
+    
+    assert_modified(client, auth_headers, etag, '/api/v1/expenses/summary')
+
+
+def test_rollup_rebuild_of_one_user_keeps_other_etags(client, auth_headers, expense_ids):
+    response = client.post('/api/v1/auth/register', json={
+        'email': 'bob@example.com',
+        'username': 'bob',
+        'password': 'Passw0rd!',
+        'first_name': 'Bob',
+        'last_name': 'Example'
+    })
+    bob_id = response.get_json()['user']['id']
+    etag = get_etag(client, auth_headers, '/api/v1/expenses/summary')
+    
+    RollupService.rebuild(bob_id)
+    
+    assert_not_modified(client, auth_headers, etag, '/api/v1/expenses/summary')
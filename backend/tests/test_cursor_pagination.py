@@ -0,0 +1,100 @@
+import base64
+import json
+
+import pytest
+
+from src.models.expense import Expense
+
+SORTS = ['date', 'amount', 'description', 'created_at']
+
+
+@pytest.fixture
+def tied_expense_ids(client, auth_headers, category_ids):
+    """IDs of 37 expenses with only three distinct values per sort field."""
+    items = [
+        {
+            'amount': (5, 10, 15)[index % 3],
+            'description': ('Alpha', 'Beta', 'Gamma')[index % 3],
+            'date': ('2024-01-01', '2024-02-01', '2024-03-01')[index % 3],
+            'category_id': category_ids[0]
+        }
+        for index in range(37)
+    ]
+    response = client.post('/api/v1/expenses/batch', json={'expenses': items}, headers=auth_headers)
+    assert response.status_code == 201
+    return [result['expense']['id'] for result in response.get_json()['results']]
+
+
+def walk(client, headers, sort_by, sort_order, per_page=5):
+    """Follow next_cursor through every page; return the item IDs in order."""
+    ids = []
+    cursor = None
+    for _ in range(100):
+        query = {'pagination': 'cursor', 'sort_by': sort_by, 'sort_order': sort_order, 'per_page': per_page}
+        if cursor:
+            query['cursor'] = cursor
+        response = client.get('/api/v1/expenses', query_string=query, headers=headers)
+        assert response.status_code == 200, response.get_json()
+        
+        page = response.get_json()
+        ids.extend(item['id'] for item in page['items'])
+        cursor = page['pagination']['next_cursor']
+        if not page['pagination']['has_next']:
+            assert cursor is None
+            return ids
+    pytest.fail('Cursor pagination did not terminate')
+
+
+@pytest.mark.parametrize('sort_order', ['asc', 'desc'])
+@pytest.mark.parametrize('sort_by', SORTS)
+def test_walks_every_row_once_in_order(client, auth_headers, tied_expense_ids, sort_by, sort_order):
+    ids = walk(client, auth_headers, sort_by, sort_order)
+    
+    expenses = Expense.query.filter(Expense.id.in_(tied_expense_ids)).all()
+    expected = [
+        expense.id for expense in sorted(
+            expenses,
+            key=lambda expense: (getattr(expense, sort_by), expense.id),
+            reverse=sort_order == 'desc'
+        )
+    ]
+    assert len(ids) == len(set(ids))
+    assert ids == expected
+
+
+def next_cursor(client, headers, sort_by='amount', sort_order='asc'):
+    response = client.get('/api/v1/expenses', query_string={
+        'pagination': 'cursor', 'sort_by': sort_by, 'sort_order': sort_order, 'per_page': 5
+    }, headers=headers)
+    return response.get_json()['pagination']['next_cursor']
+
+
+def test_tampered_cursor_is_rejected(client, auth_headers, tied_expense_ids):
+    cursor = next_cursor(client, auth_headers)
+    
+    for tampered in ('not-a-cursor', cursor[:-3], cursor[::-1]):
+        response = client.get('/api/v1/expenses', query_string={
+            'pagination': 'cursor', 'sort_by': 'amount', 'sort_order': 'asc', 'cursor': tampered
+        }, headers=auth_headers)
+        assert response.status_code == 400
+
+
+def test_cursor_with_bad_values_is_rejected(client, auth_headers, tied_expense_ids):
+    payload = json.dumps(['amount', 'asc', 'lots', 1]).encode('utf-8')
+    cursor = base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+    
+    response = client.get('/api/v1/expenses', query_string={
+        'pagination': 'cursor', 'sort_by': 'amount', 'sort_order': 'asc', 'cursor': cursor
+    }, headers=auth_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('sort_by, sort_order', [('date', 'asc'), ('amount', 'desc')])
+def test_cursor_for_another_sort_is_rejected(client, auth_headers, tied_expense_ids, sort_by, sort_order):
+    cursor = next_cursor(client, auth_headers, 'amount', 'asc')
+    
+    response = client.get('/api/v1/expenses', query_string={
+        'pagination': 'cursor', 'sort_by': sort_by, 'sort_order': sort_order, 'cursor': cursor
+    }, headers=auth_headers)
+    assert response.status_code == 400
+    assert 'sort order' in response.get_json()['error']
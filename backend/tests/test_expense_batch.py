@@ -0,0 +1,149 @@
+import pytest
+
+from src.config.database import db
+from src.models.expense import Expense
+from src.models.tag import expense_tags
+from src.models.user import User
+from src.services.rollup_service import RollupService
+from src.services.version_service import VersionService
+from tests.test_rollups import assert_rollups_match
+
+
+def test_batch_create_reports_each_item(client, auth_headers, category_ids):
+    response = client.post('/api/v1/expenses/batch', json={'expenses': [
+        {'amount': 5, 'description': 'Lunch', 'date': '2024-01-05', 'category_id': category_ids[0]},
+        'not an expense',
+        {'amount': 5, 'date': '2024-01-05', 'category_id': category_ids[0]},
+        [1, 2],
+    ]}, headers=auth_headers)
+    
+    assert response.status_code == 207
+    results = response.get_json()['results']
+    assert [result['status'] for result in results] == ['created', 'failed', 'failed', 'failed']
+    assert results[1]['errors'] == {'_schema': ['Item must be an object']}
+    assert 'description' in results[2]['errors']
+    assert results[3]['errors'] == {'_schema': ['Item must be an object']}
+
+
+def test_batch_create_with_only_invalid_items_is_rejected(client, auth_headers):
+    response = client.post('/api/v1/expenses/batch', json={'expenses': [None, 3]}, headers=auth_headers)
+    
+    assert response.status_code == 400
+    assert response.get_json()['created'] == 0
+
+
+@pytest.fixture
+def user_id(auth_headers):
+    return User.query.filter_by(username='alice').one().id
+
+
+@pytest.mark.parametrize('method', ['patch', 'delete'])
+@pytest.mark.parametrize('selection', [{}, {'filters': {}}, {'filters': {'tags_match': 'all'}}])
+def test_bulk_write_requires_a_selection(client, auth_headers, user_id, expense_ids, method, selection):
+    version = VersionService.get_version(user_id)
+    body = dict(selection, changes={'notes': 'Everything'}) if method == 'patch' else selection
+    
+    response = getattr(client, method)('/api/v1/expenses/batch', json=body, headers=auth_headers)
+    
+    assert response.status_code == 400
+    assert Expense.query.filter_by(user_id=user_id).count() == len(expense_ids)
+    assert Expense.query.filter(Expense.notes.isnot(None)).count() == 0
+    assert VersionService.get_version(user_id) == version
+
+
+@pytest.mark.parametrize('changes', [
+    {'category_id': 'other'},
+    {'date': '2023-12-31'},
+    {'amount': 1.25},
+    {'category_id': 'other', 'date': '2022-06-15', 'amount': 7},
+])
+def test_bulk_update_moves_rollups(client, auth_headers, user_id, expense_ids, category_ids, changes):
+    if changes.get('category_id') == 'other':
+        changes = dict(changes, category_id=category_ids[1])
+    version = VersionService.get_version(user_id)
+    
+    response = client.patch('/api/v1/expenses/batch', json={
+        'filters': {'category_id': category_ids[0], 'start_date': '2024-03-01'},
+        'changes': changes
+    }, headers=auth_headers)
+    
+    assert response.status_code == 200
+    selected = [
+        expense_ids[index] for index in range(len(expense_ids))
+        if index % 2 == 0 and 1 + index % 12 >= 3
+    ]
+    assert response.get_json()['updated'] == len(selected)
+    for expense in Expense.query.filter(Expense.id.in_(selected)):
+        assert expense.category_id == changes.get('category_id', category_ids[0])
+        if 'date' in changes:
+            assert expense.date.isoformat() == changes['date']
+        if 'amount' in changes:
+            assert float(expense.amount) == changes['amount']
+    assert_rollups_match(user_id, {'category_id': category_ids[1]})
+    assert VersionService.get_version(user_id) == version + 1
+
+
+def test_bulk_update_by_ids(client, auth_headers, user_id, expense_ids, category_ids):
+    response = client.patch('/api/v1/expenses/batch', json={
+        'ids': expense_ids[:10],
+        'changes': {'date': '2023-12-01', 'amount': 5}
+    }, headers=auth_headers)
+    
+    assert response.status_code == 200
+    assert response.get_json()['updated'] == 10
+    december = RollupService.get_summary(user_id, {'start_date': '2023-12-01', 'end_date': '2023-12-31'})
+    assert december['total_count'] == 10
+    assert december['total_amount'] == 50
+    assert_rollups_match(user_id)
+
+
+def test_bulk_update_rejects_foreign_category(client, auth_headers, user_id, expense_ids):
+    version = VersionService.get_version(user_id)
+    
+    response = client.patch('/api/v1/expenses/batch', json={
+        'ids': expense_ids[:10],
+        'changes': {'category_id': 9999}
+    }, headers=auth_headers)
+    
+    assert response.status_code == 404
+    assert VersionService.get_version(user_id) == version
+    assert_rollups_match(user_id)
+
+
+def test_bulk_delete_by_filter(client, auth_headers, user_id, expense_ids):
+    version = VersionService.get_version(user_id)
+    
+    response = client.delete('/api/v1/expenses/batch', json={'filters': {'tags': 'tag-0'}}, headers=auth_headers)
+    
+    assert response.status_code == 200
+    deleted = [expense_ids[index] for index in range(len(expense_ids)) if index % 5 == 0]
+    assert response.get_json()['deleted'] == len(deleted)
+    assert Expense.query.filter(Expense.id.in_(deleted)).count() == 0
+    assert Expense.query.filter_by(user_id=user_id).count() == len(expense_ids) - len(deleted)
+    
+    # Tag links of the deleted expenses are gone, the others are kept
+    links = db.session.execute(db.select(expense_tags.c.expense_id)).scalars().all()
+    assert not set(links) & set(deleted)
+    assert len(links) == 2 * (len(expense_ids) - len(deleted))
+    
+    assert_rollups_match(user_id)
+    assert RollupService.get_summary(user_id)['total_count'] == len(expense_ids) - len(deleted)
+    assert VersionService.get_version(user_id) == version + 1
+
+
+def test_bulk_delete_by_ids_ignores_other_users(client, auth_headers, user_id, expense_ids):
+    response = client.post('/api/v1/auth/register', json={
+        'email': 'bob@example.com',
+        'username': 'bob',
+        'password': 'Passw0rd!',
+        'first_name': 'Bob',
+        'last_name': 'Example'
+    })
+    bob_headers = {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+    
+    response = client.delete('/api/v1/expenses/batch', json={'ids': expense_ids[:10]}, headers=bob_headers)
+    
+    assert response.status_code == 200
+    assert response.get_json()['deleted'] == 0
+    assert Expense.query.filter_by(user_id=user_id).count() == len(expense_ids)
+    assert_rollups_match(user_id)
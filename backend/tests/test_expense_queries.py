@@ -0,0 +1,45 @@
+from src.config.database import db
+from tests.conftest import QueryCounter, clear_caches
+
+
+def count_queries(client, path, headers):
+    """Count the queries of a cold GET request."""
+    clear_caches()
+    with QueryCounter(db.engine) as counter:
+        response = client.get(path, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return counter.count
+
+
+def test_list_queries_do_not_grow_with_page_size(client, auth_headers, expense_ids):
+    small = count_queries(client, '/api/v1/expenses?per_page=5', auth_headers)
+    large = count_queries(client, '/api/v1/expenses?per_page=50', auth_headers)
+    
+    assert small == large
+
+
+def test_category_list_queries_do_not_grow_with_page_size(client, auth_headers, category_ids, expense_ids):
+    path = f'/api/v1/expenses/categories/{category_ids[0]}'
+    
+    small = count_queries(client, f'{path}?per_page=5', auth_headers)
+    large = count_queries(client, f'{path}?per_page=50', auth_headers)
+    
+    assert small == large
+
+
+def test_detail_queries_match_across_expenses(client, auth_headers, expense_ids):
+    counts = {
+        count_queries(client, f'/api/v1/expenses/{expense_id}', auth_headers)
+        for expense_id in expense_ids[:10]
+    }
+    
+    assert len(counts) == 1
+
+
+def test_list_includes_categories_and_tags(client, auth_headers, expense_ids):
+    response = client.get('/api/v1/expenses?per_page=50', headers=auth_headers)
+    
+    expenses = response.get_json()['items']
+    assert len(expenses) == 50
+    assert all(expense['category']['name'] in ('Food', 'Travel') for expense in expenses)
+    assert all('work' in expense['tags'] for expense in expenses)
@@ -0,0 +1,112 @@
+import io
+
+import pytest
+
+from src.models.expense import Expense
+from src.models.tag import Tag
+from src.models.user import User
+from src.services.import_service import ImportService
+from src.services.rollup_service import RollupService
+
+HEADER = 'date,description,amount,category,tags\n'
+
+
+@pytest.fixture
+def user_id(auth_headers):
+    return User.query.filter_by(username='alice').one().id
+
+
+def post_csv(client, headers, content):
+    return client.post(
+        '/api/v1/expenses/import',
+        data={'file': (io.BytesIO(content.encode('utf-8')), 'expenses.csv')},
+        content_type='multipart/form-data',
+        headers=headers
+    )
+
+
+def test_import_reports_rejected_rows_by_line(client, auth_headers, category_ids, user_id):
+    response = post_csv(client, auth_headers, HEADER + (
+        '2024-01-05,Lunch,12.50,Food,\n'
+        '2024-01-06,,8,Food,\n'
+        'not a date,Taxi,20,Travel,\n'
+        '2024-01-07,Train,abc,Travel,\n'
+        '2024-01-08,Hotel,90,travel,\n'
+    ))
+    
+    assert response.status_code == 207
+    report = response.get_json()
+    assert report['imported'] == 2
+    assert report['rejected'] == 3
+    errors = {error['line']: error['errors'] for error in report['errors']}
+    assert sorted(errors) == [3, 4, 5]
+    assert 'description' in errors[3]
+    assert 'date' in errors[4]
+    assert 'amount' in errors[5]
+    assert 'failed' not in report
+    
+    descriptions = {expense.description for expense in Expense.query.filter_by(user_id=user_id)}
+    assert descriptions == {'Lunch', 'Hotel'}
+    assert RollupService.verify(user_id) == []
+
+
+def test_import_rejects_unknown_and_ambiguous_categories(client, auth_headers, category_ids, user_id):
+    response = client.post('/api/v1/categories', json={'name': 'food'}, headers=auth_headers)
+    assert response.status_code == 201, response.get_json()
+    
+    response = post_csv(client, auth_headers, HEADER + (
+        '2024-01-05,Lunch,12.50,FOOD,\n'
+        '2024-01-06,Gift,30,Presents,\n'
+        '2024-01-07,Taxi,20,Travel,\n'
+    ))
+    
+    assert response.status_code == 207
+    report = response.get_json()
+    assert report['imported'] == 1
+    errors = {error['line']: error['errors'] for error in report['errors']}
+    assert 'Ambiguous category' in errors[2]['category'][0]
+    assert 'Unknown category' in errors[3]['category'][0]
+
+
+def test_import_links_tags(client, auth_headers, category_ids, user_id):
+    response = post_csv(client, auth_headers, HEADER + (
+        '2024-01-05,Lunch,12.50,Food,"work, Team"\n'
+        '2024-01-06,Taxi,20,Travel,work\n'
+        '2024-01-07,Coffee,3,Food,\n'
+    ))
+    
+    assert response.status_code == 201
+    expenses = {expense.description: expense for expense in Expense.query.filter_by(user_id=user_id)}
+    assert sorted(tag.name for tag in expenses['Lunch'].tags) == ['Team', 'work']
+    assert [tag.name for tag in expenses['Taxi'].tags] == ['work']
+    assert expenses['Coffee'].tags == []
+    assert Tag.query.filter_by(user_id=user_id).count() == 2
+
+
+def test_failed_batch_keeps_earlier_batches(app, client, auth_headers, category_ids, user_id, monkeypatch):
+    app.config['IMPORT_BATCH_SIZE'] = 2
+    write_batch = ImportService._write_batch
+    calls = []
+    
+    def failing_write_batch(user_id, batch):
+        calls.append(len(batch))
+        if len(calls) == 2:
+            raise RuntimeError('disk full')
+        return write_batch(user_id, batch)
+    
+    monkeypatch.setattr(ImportService, '_write_batch', staticmethod(failing_write_batch))
+    
+    response = post_csv(client, auth_headers, HEADER + ''.join(
+        f'2024-01-{day:02d},Expense {day},{day},Food,\n' for day in range(1, 6)
+    ))
+    
+    assert response.status_code == 500
+    report = response.get_json()
+    assert report['imported'] == 2
+    assert report['failed']['line'] == 4
+    assert report['failed']['rows'] == 2
+    assert calls == [2, 2]
+    
+    descriptions = sorted(expense.description for expense in Expense.query.filter_by(user_id=user_id))
+    assert descriptions == ['Expense 1', 'Expense 2']
+    assert RollupService.verify(user_id) == []
@@ -0,0 +1,150 @@
+import os
+import time
+from threading import Event
+from unittest import mock
+
+import pytest
+
+from src.config.database import db
+from src.models.user import User
+from src.services.auth_service import AuthService
+from src.utils.cache import user_cache, MISSING
+from src.utils.password_hashing import PasswordHasher, PasswordHashingBusy, build_hash_method, password_hasher
+
+METHOD = 'pbkdf2:sha256:1000'
+
+
+@pytest.fixture
+def pool():
+    hasher = PasswordHasher(workers=1, max_pending=4, timeout=30, method=METHOD)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_build_hash_method():
+    assert build_hash_method('pbkdf2:sha256', 1000) == METHOD
+    assert build_hash_method('scrypt') == 'scrypt:32768:8:1'
+    with pytest.raises(ValueError):
+        build_hash_method('md5')
+
+
+def test_inline_hash_and_verify():
+    hasher = PasswordHasher(workers=0, method=METHOD)
+    password_hash = hasher.hash('secret')
+    
+    assert hasher.verify(password_hash, 'secret')
+    assert not hasher.verify(password_hash, 'wrong')
+    assert not hasher.needs_rehash(password_hash)
+    assert PasswordHasher(workers=0, method='pbkdf2:sha256:2000').needs_rehash(password_hash)
+
+
+def test_pool_hash_and_verify(pool):
+    password_hash = pool.hash('secret')
+    
+    assert password_hash.startswith(METHOD + '$')
+    assert pool.verify(password_hash, 'secret')
+    assert pool.stats()['completed'] == 2
+
+
+def test_full_queue_is_rejected():
+    hasher = PasswordHasher(workers=1, max_pending=0, method=METHOD)
+    
+    with pytest.raises(PasswordHashingBusy):
+        hasher.hash('secret')
+    assert hasher.stats()['rejected'] == 1
+
+
+def test_broken_pool_is_busy_and_restarted(pool):
+    # A worker process dying breaks the pool
+    with pytest.raises(PasswordHashingBusy):
+        pool._run(os._exit, 1)
+    
+    assert pool.verify(pool.hash('secret'), 'secret')
+
+
+def test_login_answers_503_when_hashing_is_busy(client, auth_headers):
+    with mock.patch.object(password_hasher, 'verify', side_effect=PasswordHashingBusy('busy')):
+        response = client.post('/api/v1/auth/login', json={
+            'email': 'alice@example.com',
+            'password': 'Passw0rd!'
+        })
+    
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_register_answers_503_when_hashing_is_busy(client):
+    with mock.patch.object(password_hasher, 'hash', side_effect=PasswordHashingBusy('busy')):
+        response = client.post('/api/v1/auth/register', json={
+            'email': 'bob@example.com',
+            'username': 'bob',
+            'password': 'Passw0rd!',
+            'first_name': 'Bob',
+            'last_name': 'Example'
+        })
+    
+    assert response.status_code == 503
+
+
+def test_background_runs_one_job_at_a_time():
+    hasher = PasswordHasher(workers=0, method=METHOD)
+    started, release = Event(), Event()
+    
+    def job():
+        started.set()
+        release.wait(5)
+    
+    first = hasher.run_in_background(job)
+    started.wait(5)
+    
+    assert hasher.run_in_background(job) is None
+    
+    release.set()
+    first.result(5)
+    assert hasher.run_in_background(lambda: None).result(5) is None
+    assert hasher.stats()['background_skipped'] == 1
+    hasher.shutdown()
+
+
+def test_background_skips_when_pool_is_half_full():
+    hasher = PasswordHasher(workers=1, max_pending=4, method=METHOD)
+    hasher._pending = 2
+    
+    assert hasher.run_in_background(lambda: None) is None
+    assert hasher.stats()['background_skipped'] == 1
+
+
+def test_login_upgrades_outdated_hash(app, client, auth_headers):
+    old_hash = User.query.filter_by(username='alice').one().password_hash
+    rehashed = password_hasher.stats()['rehashed']
+    
+    with mock.patch.object(password_hasher, 'method', METHOD):
+        response = client.post('/api/v1/auth/login', json={
+            'email': 'alice@example.com',
+            'password': 'Passw0rd!'
+        })
+        assert response.status_code == 200
+        
+        deadline = time.monotonic() + 5
+        while password_hasher.stats()['rehashed'] == rehashed and time.monotonic() < deadline:
+            time.sleep(0.01)
+    
+    db.session.expire_all()
+    new_hash = User.query.filter_by(username='alice').one().password_hash
+    assert new_hash != old_hash
+    assert new_hash.startswith(METHOD + '$')
+
+
+def test_rehash_invalidates_the_cached_user(app, client, auth_headers):
+    user = User.query.filter_by(username='alice').one()
+    key = str(user.id)
+    
+    client.get('/api/v1/auth/me', headers=auth_headers)
+    assert user_cache.get(key) is not MISSING
+    
+    # A hash that changed meanwhile is left alone, and so is the cache
+    AuthService._rehash_password(app, user.id, 'outdated', 'Passw0rd!')
+    assert user_cache.get(key) is not MISSING
+    
+    AuthService._rehash_password(app, user.id, user.password_hash, 'Passw0rd!')
+    assert user_cache.get(key) is MISSING
@@ -0,0 +1,111 @@
+import pytest
+
+from src.config.database import db
+from src.models.category import Category
+from src.models.expense import Expense
+from src.models.expense_rollup import ExpenseRollup, ExpenseRollupState
+from src.models.user import User
+from src.services.rollup_service import RollupService
+from src.utils.helpers import build_expense_filters, summarize_expense_query
+
+# Month-aligned filter sets (served from rollups) and partial-month ones
+ALIGNED_FILTERS = [
+    None,
+    {'start_date': '2024-03-01', 'end_date': '2024-05-31'},
+    {'start_date': '2024-02-01'},
+    {'end_date': '2024-02-29'},
+]
+PARTIAL_FILTERS = [
+    {'start_date': '2024-03-15', 'end_date': '2024-05-31'},
+    {'start_date': '2024-03-01', 'end_date': '2024-05-30'},
+]
+
+
+@pytest.fixture
+def user_id(auth_headers):
+    return User.query.filter_by(username='alice').one().id
+
+
+def raw_summary(user_id, filters=None):
+    """Summary aggregated from the expenses table."""
+    query = Expense.query.filter_by(user_id=user_id).join(Category)
+    if filters:
+        query = build_expense_filters(query, filters, user_id)
+    return summarize_expense_query(query)
+
+
+def assert_rollups_match(user_id, filters=None):
+    """Check stored rollups and rollup-backed summaries against the expenses."""
+    assert RollupService.verify(user_id) == []
+    for aligned in ALIGNED_FILTERS + ([filters] if filters else []):
+        assert RollupService.get_summary(user_id, aligned) == raw_summary(user_id, aligned)
+
+
+def test_create_updates_rollups(user_id, expense_ids, category_ids):
+    assert ExpenseRollup.query.filter_by(user_id=user_id).count() > 0
+    assert_rollups_match(user_id, {
+        'start_date': '2024-01-01', 'end_date': '2024-01-31', 'category_id': category_ids[0]
+    })
+
+
+def test_update_moves_rollups(client, auth_headers, user_id, expense_ids, category_ids):
+    response = client.put(f'/api/v1/expenses/{expense_ids[0]}', json={
+        'description': 'Moved',
+        'category_id': category_ids[1],
+        'date': '2023-12-31',
+        'amount': 99.5
+    }, headers=auth_headers)
+    assert response.status_code == 200
+    
+    assert_rollups_match(user_id)
+    december = RollupService.get_summary(user_id, {'start_date': '2023-12-01', 'end_date': '2023-12-31'})
+    assert december['total_count'] == 1
+    assert december['total_amount'] == 99.5
+
+
+def test_delete_removes_from_rollups(client, auth_headers, user_id, expense_ids):
+    for expense_id in expense_ids[:15]:
+        assert client.delete(f'/api/v1/expenses/{expense_id}', headers=auth_headers).status_code == 200
+    
+    assert_rollups_match(user_id)
+    assert RollupService.get_summary(user_id)['total_count'] == len(expense_ids) - 15
+
+
+def test_partial_months_are_scanned(client, auth_headers, user_id, expense_ids):
+    for filters in PARTIAL_FILTERS:
+        assert RollupService.month_range(filters) is None
+        assert RollupService.get_summary(user_id, filters) is None
+        
+        response = client.get('/api/v1/expenses/summary', query_string=filters, headers=auth_headers)
+        assert response.get_json()['summary'] == raw_summary(user_id, filters)
+
+
+def test_search_and_tag_filters_are_scanned(user_id, expense_ids):
+    assert RollupService.get_summary(user_id, {'search': 'Expense 1'}) is None
+    assert RollupService.get_summary(user_id, {'tags': 'work'}) is None
+
+
+def test_rebuild_repairs_drift(user_id, expense_ids):
+    ExpenseRollup.query.filter_by(user_id=user_id).update(
+        {'total_amount': 0}, synchronize_session=False
+    )
+    db.session.commit()
+    assert RollupService.verify(user_id)
+    
+    RollupService.rebuild(user_id)
+    
+    assert_rollups_match(user_id)
+
+
+def test_unbuilt_users_are_scanned_until_rebuilt(user_id, expense_ids):
+    ExpenseRollup.query.delete()
+    ExpenseRollupState.query.delete()
+    db.session.commit()
+    
+    assert not RollupService.is_built(user_id)
+    assert RollupService.get_summary(user_id) is None
+    
+    RollupService.rebuild()
+    
+    assert RollupService.is_built(user_id)
+    assert_rollups_match(user_id)
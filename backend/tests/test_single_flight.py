@@ -0,0 +1,167 @@
+from threading import Event, Thread
+import time
+
+import pytest
+
+from src.services.expense_service import ExpenseService
+from src.utils.cache import LRUCache
+from src.utils.single_flight import SingleFlight, expense_count_flight
+
+
+def run_concurrently(flight, key, fn, callers):
+    """Call ``flight.do`` from several threads; return their results."""
+    results = [None] * callers
+    
+    def call(index):
+        try:
+            results[index] = flight.do(key, fn)
+        except Exception as e:
+            results[index] = e
+    
+    threads = [Thread(target=call, args=(index,)) for index in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def wait_for_callers(flight, callers):
+    """Wait until ``callers`` calls reached the flight."""
+    deadline = time.monotonic() + 5
+    while flight.stats()['calls'] < callers and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_concurrent_callers_share_one_computation():
+    flight = SingleFlight('test')
+    release = Event()
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return 'result'
+    
+    threads, results = run_concurrently(flight, 'key', compute, 5)
+    # Let every caller reach the flight before the computation finishes
+    wait_for_callers(flight, 5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert results == ['result'] * 5
+    assert len(calls) == 1
+    assert flight.stats()['coalesced'] == 4
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_errors_are_shared_and_not_kept():
+    flight = SingleFlight('test')
+    release = Event()
+    
+    def fail():
+        release.wait(5)
+        raise RuntimeError('boom')
+    
+    threads, results = run_concurrently(flight, 'key', fail, 3)
+    wait_for_callers(flight, 3)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.stats()['errors'] == 1
+    assert flight.do('key', lambda: 'retried') == 'retried'
+
+
+def test_different_keys_are_not_coalesced():
+    flight = SingleFlight('test')
+    
+    assert flight.do('a', lambda: 1) == 1
+    assert flight.do('b', lambda: 2) == 2
+    assert flight.stats()['executions'] == 2
+
+
+def test_disabled_flight_runs_every_call():
+    flight = SingleFlight('test', enabled=False)
+    
+    with pytest.raises(ValueError):
+        flight.do('key', lambda: int('x'))
+    assert flight.do('key', lambda: 1) == 1
+    assert flight.stats()['coalesced'] == 0
+
+
+def test_callers_after_an_invalidation_do_not_join_older_computations():
+    cache = LRUCache('test')
+    flight = SingleFlight('test')
+    started = Event()
+    release = Event()
+    results = {}
+    
+    def read_before_write():
+        started.set()
+        release.wait(5)
+        return 'stale'
+    
+    leader = Thread(target=lambda: results.update(
+        leader=cache.get_or_set('summary', read_before_write, group=1, flight=flight)
+    ))
+    leader.start()
+    assert started.wait(5)
+    
+    # A write commits while the leader is still computing
+    cache.invalidate(1)
+    fresh = cache.get_or_set('summary', lambda: 'fresh', group=1, flight=flight)
+    
+    release.set()
+    leader.join(5)
+    assert fresh == 'fresh'
+    assert results['leader'] == 'stale'
+    assert cache.get('summary') == 'fresh'
+
+
+def test_other_group_invalidation_still_joins():
+    cache = LRUCache('test')
+    flight = SingleFlight('test')
+    release = Event()
+    calls = []
+    results = []
+    
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return 'value'
+    
+    def call():
+        results.append(cache.get_or_set('summary', compute, group=1, flight=flight))
+    
+    leader = Thread(target=call)
+    leader.start()
+    wait_for_callers(flight, 1)
+    
+    # Another user's write does not affect this computation
+    cache.invalidate(2)
+    follower = Thread(target=call)
+    follower.start()
+    wait_for_callers(flight, 2)
+    
+    release.set()
+    leader.join(5)
+    follower.join(5)
+    assert results == ['value', 'value']
+    assert len(calls) == 1
+
+
+def test_expense_counts_go_through_the_flight(client, auth_headers, expense_ids):
+    executions = expense_count_flight.stats()['executions']
+    
+    response = client.get('/api/v1/expenses?per_page=5', headers=auth_headers)
+    
+    assert response.get_json()['pagination']['total_items'] == len(expense_ids)
+    assert expense_count_flight.stats()['executions'] == executions + 1
+
+
+def test_summary_is_consistent_with_expenses(app, auth_headers, expense_ids):
+    summary = ExpenseService.get_expense_summary(1)
+    
+    assert summary['total_count'] == len(expense_ids)
+    assert summary['total_amount'] == sum(10 + index for index in range(len(expense_ids)))